@@ -0,0 +1,7 @@
+-- Per-row fingerprint of the source fields, written by the Python ingest scripts
+-- (draftroom.sqlutil.content_hash). A sync only needs (slug, content_hash) pairs
+-- to decide which players to rewrite; the index covers exactly that query.
+
+ALTER TABLE players ADD COLUMN content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_players_slug_content_hash ON players(slug, content_hash);
@@ -0,0 +1,5 @@
+-- fix-all-logos.py applies the school -> logo mapping as one join-based UPDATE
+-- (players.school = mapping.school); this index turns each mapped school into
+-- a seek instead of a scan of the whole players table.
+
+CREATE INDEX IF NOT EXISTS idx_players_school ON players(school);
@@ -0,0 +1,10 @@
+-- Materialized Big Board vote count. /api/player-vote adjusts it in the same
+-- batch as the player_votes insert/delete, so GET /api/players is a plain
+-- SELECT ordered by idx_players_rank instead of a GROUP BY over every vote.
+-- scripts/reconcile-community-scores.py recomputes it from player_votes.
+
+ALTER TABLE players ADD COLUMN community_score INTEGER NOT NULL DEFAULT 0;
+
+UPDATE players SET community_score = (
+  SELECT COUNT(*) FROM player_votes pv WHERE pv.player_id = players.id
+);
@@ -0,0 +1,12 @@
+-- Big Board cache version. The worker caches GET /api/players per version
+-- (Cache API + in-isolate memory); every importer in scripts/ and
+-- /api/admin/update-ranks bump it after writing players so the next request
+-- refetches the board instead of waiting out the cache.
+
+CREATE TABLE IF NOT EXISTS board_version (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  version INTEGER NOT NULL DEFAULT 1,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO board_version (id, version) VALUES (1, 1);
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Apply a generated .sql file to D1 in resumable chunks
+Without --remote the local D1 SQLite file stands in for production
+"""
+
+import argparse
+
+from draftroom import applier, d1, metrics
+from draftroom.metrics import RUN
+
+PROJECT_DIR = "/Users/max/projects/draftroom"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, resumable D1 apply")
+    parser.add_argument("sql_file", help="e.g. data/import-json-prospects.sql")
+    parser.add_argument("--project-dir", default=PROJECT_DIR)
+    parser.add_argument("--remote", action="store_true",
+                        help="apply to production via wrangler instead of the local SQLite file")
+    parser.add_argument("--db", default=None, help="explicit path to the local D1 SQLite file")
+    parser.add_argument("--workers", type=int, default=applier.APPLY_WORKERS,
+                        help="concurrent chunks within an UPSERT group")
+    parser.add_argument("--chunk-bytes", type=int, default=applier.CHUNK_BYTES)
+    parser.add_argument("--chunk-statements", type=int, default=applier.CHUNK_STATEMENTS)
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the checkpoint and apply every chunk again")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args, "apply-sql")
+    try:
+        return apply_sql(args)
+    finally:
+        metrics.finish()
+
+
+def apply_sql(args) -> int:
+    try:
+        db_path = None if args.remote else str(args.db or d1.find_local_db(args.project_dir))
+        runner = applier.ChunkedApply(args.sql_file, args.project_dir, remote=args.remote,
+                                      db_path=db_path, workers=args.workers,
+                                      chunk_bytes=args.chunk_bytes,
+                                      chunk_statements=args.chunk_statements)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.restart:
+        for path in (runner.journal.snapshot_path, runner.journal.journal_path):
+            if path.exists():
+                path.unlink()
+
+    target = "production" if args.remote else db_path
+    print(f"🚀 Applying {args.sql_file} to {target}...")
+    try:
+        with RUN.stage("apply"), metrics.profiled(args.profile):
+            result = runner.run()
+        if result['chunks']:  # an empty file changed nothing
+            d1.bump_board_version(args.project_dir, args.remote, db_path)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        print(f"   {runner.statements} statements applied this run; "
+              f"rerun the same command to resume at the failed chunk")
+        return 1
+
+    print(f"\n✅ Applied {result['statements']} statements in {result['chunks'] - result['skipped']} "
+          f"chunks ({result['skipped']} resumed) in {result['seconds']:.1f}s "
+          f"— {result['stmt_per_sec']:.0f} statements/s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ingest path on synthetic prospects
+Each case runs in its own process against a stub CDN and a throwaway local
+D1 SQLite file; wall time, peak RSS and statements/s go to a results file
+that is compared against a saved baseline. The enrich and extract cases
+replay a synthetic fixture archive (or a recorded one, via --fixtures).
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from draftroom import d1, fixtures, logos, pipeline, synthetic
+from draftroom.extract import ESPN, TANKATHON
+from draftroom.slugs import SlugIndex
+from draftroom.sqlutil import inches_to_height
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = SCRIPTS_DIR.parent / "data" / "bench"
+SIZES = [1000, 10000, 100000]
+CASES = ['slug', 'height', 'sql-render', 'logos', 'import-json', 'delta-upsert', 'import-csv',
+         'extract', 'enrich']
+EXTRACTORS = {'www.tankathon.com': TANKATHON, 'www.espn.com': ESPN}
+REGRESSION_THRESHOLD = 0.20  # fractional slowdown (or RSS growth) that fails the comparison
+MIN_WALL_S = 0.05  # shorter cases are timer noise and never count as regressions
+
+
+class Counted:
+    """Wraps LocalD1.apply to count statements written during a case"""
+
+    def __init__(self):
+        self.statements = 0
+        self._apply = d1.LocalD1.apply
+
+    def __enter__(self):
+        counter = self
+
+        def apply(db, batches, **kwargs):
+            result = counter._apply(db, batches, **kwargs)
+            counter.statements += result['statements']
+            return result
+
+        d1.LocalD1.apply = apply
+        return self
+
+    def __exit__(self, *exc):
+        d1.LocalD1.apply = self._apply
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def load_script(name: str):
+    """Import a hyphenated script from scripts/ as a module"""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), SCRIPTS_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_case(case: str, size: int, workdir: str, cdn_url: str, probe_rate: float,
+             archive_path: str = None, replay_latency: float = 0.0) -> dict:
+    """Run one case in this process and return its measurements"""
+    json_path = f"{workdir}/prospects-{size}.json"
+    csv_path = f"{workdir}/prospects-{size}.csv"
+    archive_path = archive_path or f"{workdir}/fixtures-{size}.sqlite"
+    project = f"{workdir}/project-{case}-{size}"
+    db_path = synthetic.stub_project(project)
+
+    # Point the pipeline at the stub CDN; probes are only paced as fast as the stub can take
+    logos.LOGO_CDN = f"{cdn_url}/ncaa"
+    pipeline.LogoResolver = functools.partial(logos.LogoResolver, rate=probe_rate, burst=16)
+
+    ops = size
+    names = [(p['name'], p['team_name'], p['position']) for p in synthetic.prospects(size)] if case == 'slug' else []
+    heights = [p['height'] for p in synthetic.prospects(size)] if case == 'height' else []
+    pages = []
+    if case == 'extract':
+        archive = fixtures.FixtureArchive(archive_path)
+        pages = [(EXTRACTORS[urllib.parse.urlsplit(f.url).netloc], f.body) for f in archive
+                 if f.method == 'GET' and f.status == 200 and urllib.parse.urlsplit(f.url).netloc in EXTRACTORS]
+        archive.close()
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    with Counted() as counted, quiet:
+        if case == 'delta-upsert':
+            pipeline.run('import', json_path, project, db_path=db_path)
+            counted.statements = 0
+        start = time.perf_counter()
+        if case == 'slug':
+            slugs = SlugIndex(names)
+            for name, school, position in names:
+                slugs.assign(name, school, position)
+        elif case == 'height':
+            for height in heights:
+                inches_to_height(height)
+        elif case == 'sql-render':
+            records = pipeline.fingerprint(dict(r, school_logo=None) for r in
+                                           pipeline.normalize(synthetic.prospects(size)))
+            ops = d1.write_sql_file(pipeline.emit(records, 'import'), f"{project}/data/bench.sql")
+            counted.statements = ops
+        elif case == 'logos':
+            with logos.LogoResolver(rate=probe_rate, burst=16) as resolver:
+                resolver.resolve_many(p['team_name'] for p in synthetic.prospects(size))
+            ops = resolver.probes
+        elif case == 'import-json':
+            pipeline.run('import', json_path, project, db_path=db_path)
+        elif case == 'delta-upsert':
+            pipeline.run('upsert', json_path, project, db_path=db_path, delta=True)
+        elif case == 'import-csv':
+            script = load_script('import-prospects.py')
+            script.INPUT_CSV = csv_path
+            script.PROJECT_DIR = project
+            sys.argv = ['import-prospects.py', '--db', db_path]
+            script.main()
+        elif case == 'extract':
+            for extractor, body in pages:
+                extractor.read(io.BytesIO(body))
+            ops = len(pages)
+        elif case == 'enrich':
+            script = load_script('enrich-prospects.py')
+            sys.argv = ['enrich-prospects.py', '--input', csv_path, '--output', f"{project}/data/enriched.csv",
+                        '--progress', f"{project}/data/enrichment-progress.json", '--workers', '16',
+                        '--fixtures', archive_path, '--fixture-mode', 'replay',
+                        '--replay-latency', str(replay_latency)]
+            script.main()
+        else:
+            raise ValueError(f"unknown case {case}")
+        wall = time.perf_counter() - start
+
+    return {
+        'wall_s': round(wall, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'statements': counted.statements,
+        'stmts_per_s': round(counted.statements / wall, 1) if wall else 0.0,
+        'ops_per_s': round(ops / wall, 1) if wall else 0.0,
+    }
+
+
+def run_all(sizes, cases, cdn_latency: float, probe_rate: float, archive_path: str = None,
+            replay_latency: float = 0.0) -> dict:
+    """Generate inputs, start the stub CDN and run every case in a fresh process"""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="draftroom-bench-") as workdir, \
+            synthetic.StubCDN(latency=cdn_latency) as cdn:
+        for size in sizes:
+            print(f"\n📦 {size:,} prospects")
+            synthetic.write_sportradar_json(f"{workdir}/prospects-{size}.json", size)
+            synthetic.write_enriched_csv(f"{workdir}/prospects-{size}.csv", size)
+            if {'enrich', 'extract'} & set(cases):
+                synthetic.write_fixture_archive(f"{workdir}/fixtures-{size}.sqlite", size)
+            for case in cases:
+                argv = [sys.executable, __file__, '--child', case, '--sizes', str(size),
+                        '--workdir', workdir, '--cdn-url', cdn.url, '--probe-rate', str(probe_rate),
+                        '--replay-latency', str(replay_latency)]
+                if archive_path and case == 'extract':
+                    argv += ['--fixtures', archive_path]
+                child = subprocess.run(argv, capture_output=True, text=True)
+                if child.returncode != 0:
+                    print(f"  ✗ {case}: failed\n{child.stderr}")
+                    continue
+                measured = json.loads(child.stdout.strip().splitlines()[-1])
+                results[f"{case}@{size}"] = measured
+                print(f"  {case:<13} {measured['wall_s']:>9.3f}s  {measured['peak_rss_mb']:>7.1f} MB  "
+                      f"{measured['stmts_per_s']:>10.0f} stmt/s  {measured['ops_per_s']:>11.0f} ops/s")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Print deltas against the baseline, return the number of regressions"""
+    regressions = 0
+    print(f"\n📊 Against baseline ({baseline.get('created', '?')}):")
+    for key, current in results.items():
+        before = baseline.get('results', {}).get(key)
+        if not before:
+            print(f"  {key:<22} (new)")
+            continue
+        flags = []
+        for metric in ('wall_s', 'peak_rss_mb'):
+            if metric == 'wall_s' and before[metric] < MIN_WALL_S:
+                continue
+            if before[metric] and current[metric] / before[metric] > 1 + threshold:
+                flags.append(metric)
+        wall = (current['wall_s'] / before['wall_s'] - 1) * 100 if before['wall_s'] else 0
+        rss = (current['peak_rss_mb'] / before['peak_rss_mb'] - 1) * 100 if before['peak_rss_mb'] else 0
+        print(f"  {key:<22} wall {wall:+6.1f}%  rss {rss:+6.1f}%  {'❌ ' + ', '.join(flags) if flags else '✓'}")
+        regressions += bool(flags)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ingest scripts on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES)
+    parser.add_argument("--cases", nargs='+', default=CASES, choices=CASES)
+    parser.add_argument("--out", default=str(RESULTS_DIR / "results.json"))
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--cdn-latency", type=float, default=0.005, help="stub CDN delay per HEAD (s)")
+    parser.add_argument("--probe-rate", type=float, default=1000.0, help="logo probes/s against the stub")
+    parser.add_argument("--fixtures", default=None, metavar="PATH",
+                        help="recorded fixture archive for the extract case (default: synthetic pages)")
+    parser.add_argument("--replay-latency", type=float, default=0.0,
+                        help="simulated latency per replayed request in the enrich case (s)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--cdn-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.sizes[0], args.workdir, args.cdn_url, args.probe_rate,
+                                  args.fixtures, args.replay_latency)))
+        return 0
+
+    print("⏱️  DraftRoom ingest benchmark")
+    print("=" * 60)
+    results = run_all(args.sizes, args.cases, args.cdn_latency, args.probe_rate,
+                      args.fixtures, args.replay_latency)
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.out}")
+
+    regressions = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved as baseline {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} regression(s) beyond {args.threshold:.0%}")
+    else:
+        print("💡 No baseline yet; rerun with --save-baseline to record one")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    exit(main())
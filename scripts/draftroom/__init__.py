@@ -0,0 +1,4 @@
+"""
+Shared building blocks for the DraftRoom data scripts
+The scripts in scripts/ are thin entry points over these modules
+"""
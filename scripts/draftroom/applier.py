@@ -0,0 +1,313 @@
+"""
+Chunked, resumable apply of a generated .sql file
+
+The file is read a block at a time and cut into size-bounded chunks, each
+applied as one request (`wrangler d1 execute --file` remotely, one
+transaction against the local SQLite file) as soon as it is cut. Finished
+chunks are checkpointed in a ProgressJournal next to the .sql file, so a
+rerun after a failure resumes at the chunk that failed instead of replaying
+everything.
+
+Consecutive statements with the same shape form a group and groups run in
+file order. Chunks inside an UPSERT group touch distinct keys and are
+submitted concurrently, up to `workers` at a time; everything else is
+applied chunk by chunk.
+PRAGMA statements are carried into every later chunk, since each chunk is a
+separate connection/request.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from draftroom import wrangler
+from draftroom.journal import ProgressJournal
+
+CHUNK_BYTES = 512 * 1024  # stays well under D1's per-request body limit
+CHUNK_STATEMENTS = 500
+APPLY_WORKERS = 4
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def iter_statements(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Split SQL text arriving in pieces (blocks of a file) on ';', ignoring
+    semicolons inside quotes and -- comments. Only the statement being
+    scanned is held in memory.
+    """
+    buf = ''
+    start = 0
+    i = 0
+    quote = None
+    pieces = iter(pieces)
+    final = False
+    while not final:
+        piece = next(pieces, None)
+        if piece is None:
+            final = True
+        else:
+            buf += piece
+        n = len(buf)
+        while i < n:
+            c = buf[i]
+            if quote:
+                if c == quote:
+                    if i + 1 == n and not final:
+                        break  # could be a doubled quote split across pieces
+                    if i + 1 < n and buf[i + 1] == c:  # doubled quote escape
+                        i += 2
+                        continue
+                    quote = None
+                i += 1
+                continue
+            if c in ("'", '"'):
+                quote = c
+            elif c == '-':
+                if i + 1 == n and not final:
+                    break
+                if buf.startswith('--', i):
+                    end = buf.find('\n', i)
+                    if end < 0 and not final:
+                        break
+                    if buf[start:i].strip() == '':
+                        start = n if end < 0 else end + 1  # drop leading comment lines
+                    i = n if end < 0 else end
+                    continue
+            elif c == ';':
+                stmt = buf[start:i].strip()
+                if stmt:
+                    yield stmt
+                start = i + 1
+            i += 1
+        buf, i, start = buf[start:], i - start, 0
+    stmt = buf.strip()
+    if stmt:
+        yield stmt
+
+
+def split_statements(text: str) -> Iterator[str]:
+    """Split SQL text on ';', ignoring semicolons inside quotes and -- comments"""
+    return iter_statements([text])
+
+
+def read_statements(path: str, block: int = 1 << 16) -> Iterator[str]:
+    """Statements of a .sql file, read a block at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_statements(iter(lambda: f.read(block), ''))
+
+
+def shape(stmt: str) -> str:
+    """Statement with literals removed; multi-row UPSERTs collapse to their target"""
+    head = stmt[:400]
+    if head[:6].upper() == 'INSERT':
+        head = re.split(r'\sVALUES\s', head, maxsplit=1, flags=re.IGNORECASE)[0]
+    return LITERAL.sub('?', head)
+
+
+def is_parallel(stmt: str) -> bool:
+    """Multi-row UPSERTs on a unique key commute, so their chunks can run concurrently"""
+    return stmt[:6].upper() == 'INSERT' and ' ON CONFLICT' in stmt.upper()
+
+
+class Chunk:
+    """Statements applied together as one request"""
+
+    def __init__(self, index: int, group: int, parallel: bool, preamble: List[str]):
+        self.index = index
+        self.group = group
+        self.parallel = parallel
+        self.preamble = preamble
+        self.statements: List[str] = []
+        self.size = 0
+
+    def sql(self) -> str:
+        return ''.join(s + ';\n' for s in self.preamble + self.statements)
+
+
+def iter_chunks(statements: Iterable[str], chunk_bytes: int = CHUNK_BYTES,
+                chunk_statements: int = CHUNK_STATEMENTS) -> Iterator[Chunk]:
+    """Cut statements into chunks as they stream past; UPSERT chunks never span two groups"""
+    pragmas: Dict[str, str] = {}
+    current = None
+    last_shape = None
+    group = -1
+    index = 0
+    for stmt in statements:
+        if stmt[:6].upper() == 'PRAGMA':
+            name = stmt[6:].split('=')[0].strip().lower()
+            pragmas[name] = stmt
+            if current is not None:
+                yield current  # later chunks must carry the new setting
+                current = None
+            continue
+        stmt_shape = shape(stmt)
+        if stmt_shape != last_shape:
+            group += 1
+            last_shape = stmt_shape
+            # Sequential statements can share a chunk; an UPSERT group gets its own
+            if current is not None and (current.parallel or is_parallel(stmt)):
+                yield current
+                current = None
+        size = len(stmt) + 2
+        if current is not None and (len(current.statements) >= chunk_statements
+                                    or current.size + size > chunk_bytes):
+            yield current
+            current = None
+        if current is None:
+            current = Chunk(index, group, is_parallel(stmt), list(pragmas.values()))
+            index += 1
+        current.statements.append(stmt)
+        current.size += size
+    if current is not None:
+        yield current
+
+
+def plan(statements: Iterable[str], chunk_bytes: int = CHUNK_BYTES,
+         chunk_statements: int = CHUNK_STATEMENTS) -> List[Chunk]:
+    """Every chunk of `statements` (see iter_chunks)"""
+    return list(iter_chunks(statements, chunk_bytes, chunk_statements))
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ChunkedApply:
+    """
+    Apply a .sql file chunk by chunk, remotely through wrangler or to a local
+    SQLite file (`db_path`) as a stand-in.
+    """
+
+    def __init__(self, sql_file: str, project_dir: str, remote: bool = False,
+                 db_path: Optional[str] = None, workers: int = APPLY_WORKERS,
+                 chunk_bytes: int = CHUNK_BYTES, chunk_statements: int = CHUNK_STATEMENTS):
+        if not remote and db_path is None:
+            raise ValueError("a local apply needs the SQLite db_path")
+        self.sql_file = sql_file
+        self.project_dir = project_dir
+        self.remote = remote
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.chunk_bytes = chunk_bytes
+        self.chunk_statements = chunk_statements
+        self.journal = ProgressJournal(f"{sql_file}.progress.json")
+        self.chunk_dir = Path(f"{sql_file}.chunks")
+        self.prefix = ''
+        self.statements = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    def _checkpoint_prefix(self) -> str:
+        # Chunk indices are only meaningful for the same file cut the same way
+        return f"{file_digest(self.sql_file)[:16]}:{self.chunk_bytes}:{self.chunk_statements}:"
+
+    def _apply_chunk(self, chunk: Chunk) -> float:
+        """Apply one chunk atomically, return its duration"""
+        start = time.perf_counter()
+        if self.remote:
+            self.chunk_dir.mkdir(parents=True, exist_ok=True)
+            path = self.chunk_dir / f"{chunk.index:05d}.sql"
+            path.write_text(chunk.sql())
+            result = wrangler.execute_file(str(path.resolve()), self.project_dir, remote=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"chunk {chunk.index} failed:\n{result.stderr}")
+            path.unlink()
+        else:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=60)
+            try:
+                for stmt in chunk.preamble:
+                    conn.execute(stmt)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for stmt in chunk.statements:
+                        conn.execute(stmt)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                raise RuntimeError(f"chunk {chunk.index} failed: {e}") from e
+            finally:
+                conn.close()
+        return time.perf_counter() - start
+
+    def _done(self, chunk: Chunk, seconds: float):
+        self.journal.append(self.prefix + str(chunk.index),
+                            {"statements": len(chunk.statements), "seconds": round(seconds, 3)})
+        self.statements += len(chunk.statements)
+        rate = len(chunk.statements) / seconds if seconds else 0
+        print(f"  chunk {chunk.index + 1}: {len(chunk.statements)} statements "
+              f"in {seconds:.2f}s ({rate:.0f} stmt/s)")
+
+    def _settle(self, in_flight: Dict[Future, Chunk], return_when: str = ALL_COMPLETED):
+        """Checkpoint finished chunks; on a failure let the others finish first, then raise it"""
+        if not in_flight:
+            return
+        finished, _ = wait(in_flight, return_when=return_when)
+        if any(f.exception() for f in finished):
+            finished, _ = wait(in_flight)
+        errors = []
+        for future in finished:
+            chunk = in_flight.pop(future)
+            if future.exception():
+                errors.append(future.exception())
+            else:
+                self._done(chunk, future.result())
+        if errors:
+            raise errors[0]
+
+    def run(self) -> Dict[str, float]:
+        """
+        Apply every chunk not yet checkpointed; raises RuntimeError on the first failure.
+
+        The file is read as it is applied: at most `workers` chunks of an
+        UPSERT group (or one sequential chunk) are held in memory.
+        """
+        self.prefix = self._checkpoint_prefix()
+        done = {k for k in self.journal.load() if k.startswith(self.prefix)}
+        if done:
+            print(f"↩️  Resuming: {len(done)} chunks already applied")
+        chunks = 0
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                in_flight: Dict[Future, Chunk] = {}
+                group = None
+                for chunk in iter_chunks(read_statements(self.sql_file), self.chunk_bytes,
+                                         self.chunk_statements):
+                    chunks += 1
+                    if self.prefix + str(chunk.index) in done:
+                        self.skipped += 1
+                        continue
+                    if chunk.group != group or not chunk.parallel:
+                        self._settle(in_flight)  # groups run in file order
+                        group = chunk.group
+                    if not chunk.parallel:
+                        self._done(chunk, self._apply_chunk(chunk))
+                        continue
+                    if len(in_flight) >= self.workers:
+                        self._settle(in_flight, FIRST_COMPLETED)
+                    in_flight[pool.submit(self._apply_chunk, chunk)] = chunk
+                self._settle(in_flight)
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.journal.close()
+
+        # Everything applied: a rerun of the same file starts from scratch
+        for path in (self.journal.snapshot_path, self.journal.journal_path):
+            if path.exists():
+                path.unlink()
+        if self.chunk_dir.exists() and not any(self.chunk_dir.iterdir()):
+            self.chunk_dir.rmdir()
+        return {"chunks": chunks, "skipped": self.skipped,
+                "statements": self.statements, "seconds": self.seconds,
+                "stmt_per_sec": self.statements / self.seconds if self.seconds else 0.0}
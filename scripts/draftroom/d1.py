@@ -0,0 +1,246 @@
+"""
+Writer backends for the D1 database
+
+Locally we open the SQLite file that `wrangler dev` / `wrangler d1 --local`
+use and apply parameterized batches in a single transaction. `--remote`
+renders the same batches to a .sql file and applies it through wrangler in
+resumable chunks (see applier.py).
+"""
+
+import hashlib
+import hmac
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from draftroom import wrangler
+from draftroom.applier import ChunkedApply
+from draftroom.metrics import RUN
+from draftroom.sqlutil import sql_value
+
+LOCAL_STATE = ".wrangler/state/v3/d1"
+D1_OBJECT = "miniflare-D1DatabaseObject"  # miniflare's durable object namespace for D1
+D1_MAX_PARAMS = 100  # bound parameters per query
+D1_MAX_SQL_BYTES = 100_000  # length of a single SQL statement
+# The worker caches the Big Board per version (migrations/0009); bump it after
+# writing players so the next GET /api/players refetches
+BUMP_BOARD_VERSION = ("UPDATE board_version SET version = version + 1, "
+                      "updated_at = CURRENT_TIMESTAMP WHERE id = 1")
+
+# (sql with ? placeholders, parameter rows)
+Batch = Tuple[str, Iterable[Sequence]]
+
+
+def configured_database_id(project_dir: str, binding: str = "DB") -> Optional[str]:
+    """database_id of the top-level [[d1_databases]] entry for `binding` in wrangler.toml"""
+    path = Path(project_dir, "wrangler.toml")
+    if not path.exists():
+        return None
+    entries = []
+    table = None
+    for line in path.read_text().splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line.startswith('['):
+            table = line
+            if table == '[[d1_databases]]':
+                entries.append({})
+        elif '=' in line and table == '[[d1_databases]]':
+            key, _, value = line.partition('=')
+            entries[-1][key.strip()] = value.strip().strip('"\'')
+    return next((e.get('database_id') for e in entries if e.get('binding') == binding), None)
+
+
+def local_db_name(database_id: str) -> str:
+    """The SQLite file name miniflare gives a database: its durable object id, derived from the database_id"""
+    key = hashlib.sha256(D1_OBJECT.encode()).digest()
+    name = hmac.new(key, database_id.encode(), hashlib.sha256).digest()[:16]
+    check = hmac.new(key, name, hashlib.sha256).digest()[:16]
+    return (name + check).hex() + ".sqlite"
+
+
+def find_local_db(project_dir: str) -> Path:
+    """
+    Locate the miniflare SQLite file backing the local D1 database.
+
+    That is the file for the top-level database_id in wrangler.toml (the one
+    `npm run db:migrate` applies to); wrangler.toml also declares an
+    [env.local] database, so with several files and none of them that one,
+    refuse to guess and ask for --db.
+    """
+    candidates = [p for p in Path(project_dir, LOCAL_STATE).glob("**/*.sqlite")
+                  if p.name != "metadata.sqlite"]
+    if not candidates:
+        raise FileNotFoundError(
+            f"No local D1 database under {project_dir}/{LOCAL_STATE} "
+            f"(run `npm run db:migrate` first)")
+    database_id = configured_database_id(project_dir)
+    if database_id:
+        name = local_db_name(database_id)
+        for path in candidates:
+            if path.name == name:
+                return path
+    if len(candidates) == 1:
+        return candidates[0]
+    raise FileNotFoundError(
+        f"{len(candidates)} local D1 databases under {project_dir}/{LOCAL_STATE} and none is "
+        f"database_id {database_id} from wrangler.toml; pass --db with the one to write to")
+
+
+def render(sql: str, params: Sequence) -> str:
+    """Inline parameters into a statement for a text .sql file"""
+    parts = sql.split('?')
+    if len(parts) - 1 != len(params):
+        raise ValueError(f"expected {len(parts) - 1} parameters, got {len(params)}: {sql}")
+    out = [parts[0]]
+    for value, part in zip(params, parts[1:]):
+        out.append(sql_value(value))
+        out.append(part)
+    return ''.join(out) + ';'
+
+
+def upsert_sql(table: str, columns: Sequence[str], key: str, n_rows: int) -> str:
+    """Multi-row INSERT that updates in place when `key` already exists (row ids are kept)"""
+    row = '(' + ', '.join('?' for _ in columns) + ')'
+    updates = ', '.join(f"{c}=excluded.{c}" for c in columns if c != key)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * n_rows)} "
+            f"ON CONFLICT({key}) DO UPDATE SET {updates}")
+
+
+def upsert_batches(table: str, columns: Sequence[str], key: str, rows: Iterable[Sequence],
+                   max_params: int = D1_MAX_PARAMS,
+                   max_sql_bytes: int = D1_MAX_SQL_BYTES) -> Iterator[Batch]:
+    """
+    Chunk rows into single multi-row UPSERT statements.
+
+    Each chunk stays under D1's bound-parameter limit and, once rendered with
+    inlined literals for a --remote .sql file, under its statement size limit.
+    """
+    per_chunk = max(1, max_params // len(columns))
+    budget = max_sql_bytes - len(upsert_sql(table, columns, key, 0))
+    chunk: List[Sequence] = []
+    size = 0
+    for row in rows:
+        row_bytes = sum(len(sql_value(v)) + 2 for v in row) + 4
+        if chunk and (len(chunk) >= per_chunk or size + row_bytes > budget):
+            yield upsert_sql(table, columns, key, len(chunk)), [tuple(v for r in chunk for v in r)]
+            chunk, size = [], 0
+        chunk.append(row)
+        size += row_bytes
+    if chunk:
+        yield upsert_sql(table, columns, key, len(chunk)), [tuple(v for r in chunk for v in r)]
+
+
+class LocalD1:
+    """Direct connection to the local D1 SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+
+    @classmethod
+    def open(cls, project_dir: str, path: Optional[str] = None) -> "LocalD1":
+        return cls(path or find_local_db(project_dir))
+
+    def apply(self, batches: Iterable[Batch], bump_board: bool = False) -> Dict[str, int]:
+        """
+        Run every batch inside one transaction; roll back on any error.
+
+        With `bump_board` the board version is bumped in the same transaction
+        if any row changed (not counted in the result).
+        """
+        statements = 0
+        changed = 0
+        self.conn.execute("BEGIN")
+        try:
+            for sql, rows in batches:
+                before = self.conn.total_changes
+                rows = list(rows)
+                if len(rows) == 1:
+                    self.conn.execute(sql, rows[0])
+                else:
+                    self.conn.executemany(sql, rows)
+                statements += len(rows)
+                changed += self.conn.total_changes - before
+            if bump_board and changed:
+                self.conn.execute(BUMP_BOARD_VERSION)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        RUN.count('d1.statements', statements)
+        RUN.count('d1.rows_changed', changed)
+        return {"statements": statements, "rows_changed": changed}
+
+    def scalar(self, sql: str, params: Sequence = ()):
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def count(self, table: str) -> int:
+        return self.scalar(f"SELECT COUNT(*) FROM {table}")
+
+    def close(self):
+        self.conn.close()
+
+
+def write_sql_file(batches: Iterable[Batch], sql_file: str) -> int:
+    """Render batches to a .sql file, return the statement count"""
+    Path(sql_file).parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(sql_file, 'w') as f:
+        for sql, rows in batches:
+            lines = [render(sql, params) for params in rows]
+            if lines:
+                f.write('\n'.join(lines) + '\n')
+                count += len(lines)
+    RUN.count('sql_file.statements', count)
+    return count
+
+
+def _then_bump(batches: Iterable[Batch]) -> Iterator[Batch]:
+    """The batches, followed by the board bump if any of them had rows to write"""
+    wrote = False
+    for sql, rows in batches:
+        rows = list(rows)
+        wrote = wrote or bool(rows)
+        yield sql, rows
+    if wrote:
+        yield BUMP_BOARD_VERSION, [()]
+
+
+def bump_board_version(project_dir: str, remote: bool = False, db_path: Optional[str] = None):
+    """Invalidate the worker's Big Board cache after writes that didn't go through apply()"""
+    if not remote:
+        db = LocalD1.open(project_dir, db_path)
+        try:
+            db.conn.execute(BUMP_BOARD_VERSION)
+        finally:
+            db.close()
+        return
+    if wrangler.query(BUMP_BOARD_VERSION, project_dir, remote=True) is None:
+        raise RuntimeError("could not bump board_version on remote D1")
+
+
+def apply(batches: Iterable[Batch], project_dir: str, remote: bool = False,
+          sql_file: Optional[str] = None, db_path: Optional[str] = None,
+          bump_board: bool = True) -> Dict[str, int]:
+    """
+    Apply batches to the local database, or to production with `remote=True`.
+
+    Remote applies go through ChunkedApply; rerunning after a RuntimeError
+    resumes at the chunk that failed. Unless `bump_board` is False the board
+    version is bumped last, so the worker only refetches once every batch
+    has landed; a run that changed nothing (locally) or wrote nothing
+    (remote, e.g. a delta with no changes) leaves it alone.
+    """
+    if not remote:
+        db = LocalD1.open(project_dir, db_path)
+        try:
+            return db.apply(batches, bump_board=bump_board)
+        finally:
+            db.close()
+
+    if bump_board:
+        batches = _then_bump(batches)
+    count = write_sql_file(batches, sql_file)
+    result = ChunkedApply(sql_file, project_dir, remote=True).run()
+    print(f"✓ {result['chunks']} chunks, {result['stmt_per_sec']:.0f} statements/s")
+    return {"statements": count, "rows_changed": -1}
@@ -0,0 +1,127 @@
+"""
+Delta sync: diff the incoming feed against the current players table
+
+Only new players, the columns that actually changed, and (optionally)
+players missing from the feed are written, so an in-season update touches
+tens of rows instead of the whole board.
+
+Rows are matched on content_hash first. Locally the full rows are free to
+read, so changed players get a per-field UPDATE; against --remote only the
+identity columns SlugIndex needs and content_hash are fetched, and changed
+players are rewritten whole. The same snapshot feeds slug assignment, so a
+delta run reads the players table once.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from draftroom import d1, wrangler
+from draftroom.d1 import Batch
+from draftroom.slugs import IDENTITY_COLUMNS
+
+SNAPSHOT_COLUMNS = ('slug', 'name', 'position', 'school', 'height', 'weight', 'rank', 'school_logo',
+                    'content_hash')
+COMPARE_COLUMNS = SNAPSHOT_COLUMNS[1:-1]
+WRITE_COLUMNS = COMPARE_COLUMNS + ('content_hash',)
+REMOTE_SNAPSHOT_COLUMNS = IDENTITY_COLUMNS + ('content_hash',)
+
+
+def load_snapshot(project_dir: str, remote: bool = False,
+                  db_path: Optional[str] = None) -> Dict[str, Dict]:
+    """slug -> current row (remote: identity columns and content_hash only)"""
+    if not remote:
+        sql = f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM players"
+        db = d1.LocalD1.open(project_dir, db_path)
+        try:
+            rows = [dict(zip(SNAPSHOT_COLUMNS, r)) for r in db.conn.execute(sql)]
+        finally:
+            db.close()
+    else:
+        results = wrangler.query(f"SELECT {', '.join(REMOTE_SNAPSHOT_COLUMNS)} FROM players",
+                                 project_dir, remote=True)
+        if results is None:
+            raise RuntimeError("could not read players snapshot from remote D1")
+        rows = results[0]['results']
+    return {row['slug']: row for row in rows}
+
+
+def _same(a, b) -> bool:
+    """Compare DB and feed values loosely (weight is TEXT in D1, int in the feed)"""
+    a = None if a == '' else a
+    b = None if b == '' else b
+    if a is None or b is None:
+        return a is b
+    return str(a) == str(b)
+
+
+class Delta:
+    """Classifies incoming records against a snapshot and builds the write batches"""
+
+    def __init__(self, snapshot: Dict[str, Dict]):
+        self.snapshot = snapshot
+        self.inserts: List[Dict] = []
+        self.updates: Dict[Tuple[str, ...], List[Dict]] = defaultdict(list)
+        self.changed: List[Tuple[str, Tuple[str, ...]]] = []
+        self.field_counts = Counter()
+        self.unchanged = 0
+        self.seen = set()
+        self.deletes: List[str] = []
+
+    def observe(self, records: Iterable[Dict]):
+        """Diff every incoming record (consumes the stream)"""
+        for record in records:
+            slug = record['slug']
+            self.seen.add(slug)
+            current = self.snapshot.get(slug)
+            if current is None:
+                self.inserts.append(record)
+                continue
+            if current.get('content_hash') == record['content_hash']:
+                self.unchanged += 1
+                continue
+            if all(c in current for c in COMPARE_COLUMNS):
+                fields = tuple(c for c in COMPARE_COLUMNS if not _same(current.get(c), record.get(c)))
+            else:
+                fields = COMPARE_COLUMNS  # hash-only snapshot: rewrite the whole row
+            if fields:
+                self.changed.append((slug, fields))
+                self.field_counts.update(fields)
+            else:
+                self.unchanged += 1  # same data, only the stored hash was missing or stale
+            self.updates[fields + ('content_hash',)].append(record)
+
+    def batches(self, records: Iterable[Dict], delete_missing: bool = False) -> Iterator[Batch]:
+        """Diff `records`, then yield inserts, per-field updates and optional deletes"""
+        self.observe(records)
+        columns = ('slug',) + WRITE_COLUMNS
+        yield from d1.upsert_batches('players', columns, 'slug',
+                                     (tuple(r[c] for c in columns) for r in self.inserts))
+        # Players that changed the same set of fields share one parameterized UPDATE
+        for fields, records in self.updates.items():
+            sql = f"UPDATE players SET {', '.join(f'{c}=?' for c in fields)} WHERE slug=?"
+            yield sql, [tuple(r[c] for c in fields) + (r['slug'],) for r in records]
+        if delete_missing:
+            self.deletes = sorted(set(self.snapshot) - self.seen)
+            if self.deletes:
+                # Players that carry scouting reports are kept so nothing is orphaned
+                yield ("DELETE FROM players WHERE slug=? "
+                       "AND NOT EXISTS (SELECT 1 FROM community_reports WHERE player_id = players.id) "
+                       "AND NOT EXISTS (SELECT 1 FROM expert_reports WHERE player_id = players.id)",
+                       [(slug,) for slug in self.deletes])
+
+    def summary(self, limit: int = 20):
+        """Print what the delta wrote"""
+        print(f"\n🔀 Delta: +{len(self.inserts)} new, ~{len(self.changed)} changed, "
+              f"={self.unchanged} unchanged, -{len(self.deletes)} to delete")
+        if self.field_counts:
+            print("  Changed fields: " + ', '.join(f"{f} {n}" for f, n in self.field_counts.most_common()))
+        for slug, fields in self.changed[:limit]:
+            print(f"  ~ {slug}: {', '.join(fields)}")
+        for record in self.inserts[:limit]:
+            print(f"  + {record['slug']}")
+        for slug in self.deletes[:limit]:
+            print(f"  - {slug}")
+        missing = len(set(self.snapshot) - self.seen)
+        if missing and not self.deletes:
+            print(f"  ({missing} players in the database are not in the feed; "
+                  f"--delete-missing removes them)")
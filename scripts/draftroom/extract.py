@@ -0,0 +1,115 @@
+"""
+Early-exit field extraction for scraped player pages
+
+Each source declares its fields as byte patterns, each compiled on its own.
+A pattern that starts with a literal (all of Tankathon's) is located with
+re's fast substring search, so one search per field costs far less than a
+single alternation tried at every byte. Pages are matched as bytes (no
+decode), and `read()` stops pulling from the socket once every field,
+optional ones included, has been seen.
+"""
+
+import re
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+READ_CHUNK = 16 * 1024
+OVERLAP = 1024  # longer than any field match, so a match never straddles a rescan
+
+
+class Extraction:
+    """Field values found on a page plus the fields that were not"""
+
+    def __init__(self, source: str, fields: Dict[str, str], missing: List[str],
+                 missing_required: List[str], bytes_read: int):
+        self.source = source
+        self.fields = fields
+        self.missing = missing
+        self.missing_required = missing_required
+        self.bytes_read = bytes_read
+
+    @property
+    def ok(self) -> bool:
+        """True when every required field was found"""
+        return not self.missing_required
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.fields.get(name, default)
+
+
+class FieldExtractor:
+    """
+    Compiled extractor for one source.
+
+    `fields` maps a field name to a bytes regex with one or more capture
+    groups; multiple groups are joined with '-' (e.g. ESPN "6-2 HT").
+    Fields not in `required` are optional: a page without them is still ok,
+    but a streamed read keeps going until they are found or the page ends.
+    """
+
+    def __init__(self, source: str, fields: Dict[str, bytes], required: Sequence[str] = None):
+        self.source = source
+        self.patterns = {name: re.compile(pattern) for name, pattern in fields.items()}
+        self.names = list(fields)
+        self.required = set(required if required is not None else fields)
+
+    def _scan(self, buf: bytes, starts: Dict[str, int], found: Dict[str, str], eof: bool):
+        """Search each missing field from where its last search left off"""
+        safe_end = len(buf) if eof else len(buf) - OVERLAP
+        for name, pattern in self.patterns.items():
+            if name in found:
+                continue
+            match = pattern.search(buf, starts.get(name, 0))
+            if match is None:
+                # a match starting before safe_end would have ended inside buf
+                starts[name] = max(starts.get(name, 0), safe_end)
+            elif match.end() > safe_end:
+                starts[name] = match.start()  # may still grow; rescan once more data arrives
+            else:
+                found[name] = '-'.join(g.decode('ascii', 'replace') for g in match.groups())
+
+    def _result(self, found: Dict[str, str], bytes_read: int) -> Extraction:
+        missing = [name for name in self.names if name not in found]
+        missing_required = [name for name in missing if name in self.required]
+        return Extraction(self.source, found, missing, missing_required, bytes_read)
+
+    def extract(self, body: bytes) -> Extraction:
+        """Extract from a complete body"""
+        found = {}
+        self._scan(body, {}, found, eof=True)
+        return self._result(found, len(body))
+
+    def read(self, stream: BinaryIO, chunk_size: int = READ_CHUNK) -> Tuple[Extraction, bytes]:
+        """
+        Extract while reading, stopping once every field has been found.
+
+        Returns the extraction and the bytes actually read (a prefix of the
+        page when the read stopped early).
+        """
+        buf = bytearray()
+        found = {}
+        starts = {}
+        while True:
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            self._scan(buf, starts, found, eof)
+            if eof or len(found) == len(self.names):
+                return self._result(found, len(buf)), bytes(buf)
+
+
+# --- Source declarations --------------------------------------------------
+
+TANKATHON = FieldExtractor('tankathon', {
+    # <span class="feet">6'</span><span class="inches">5&quot;</span>
+    'feet': rb'<span class="feet">(\d+)\'</span>',
+    'inches': rb'<span class="inches">(\d+)&quot;</span>',
+    # <div class="label">Weight</div><div class="value">225<span class="small">lbs</span>
+    'weight': rb'<div class="label">Weight</div><div class="value">(\d+)<span class="small">lbs</span>',
+    # src="http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg"
+    'logo': rb'src="(http://d2uki2uvp6v3wr\.cloudfront\.net/ncaa/[^"]+\.svg)"',
+}, required=('feet', 'inches', 'weight'))
+
+ESPN = FieldExtractor('espn', {
+    'height': rb'(\d+)-(\d+)\s*HT',
+    'weight': rb'(\d+)\s*WT',
+})
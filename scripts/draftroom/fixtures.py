@@ -0,0 +1,239 @@
+"""
+Record/replay HTTP fixtures for the scrapers and logo probes
+
+Every outbound request goes through `urlopen()`. Live by default; with
+`--fixtures PATH --fixture-mode record` real responses (status, headers,
+full body) are captured into a single SQLite archive, and with
+`--fixture-mode replay` they are served from it with no network at all,
+after a simulated latency (fixed, or the latency measured when recording).
+
+Replaying is deterministic: a URL that was never recorded raises
+`FixtureMiss` (a URLError, so callers treat it like a connection failure),
+and If-None-Match against the recorded ETag answers 304 like the server did.
+"""
+
+import hashlib
+import http.client
+import io
+import json
+import sqlite3
+import threading
+import time
+import urllib.request
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+from urllib.error import HTTPError, URLError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixtures (
+  method TEXT NOT NULL,
+  url TEXT NOT NULL,
+  status INTEGER NOT NULL,
+  headers TEXT NOT NULL,
+  body BLOB NOT NULL,
+  sha256 TEXT NOT NULL,
+  elapsed_ms REAL NOT NULL,
+  recorded_at REAL NOT NULL,
+  PRIMARY KEY (method, url)
+)
+"""
+
+CONDITIONAL_HEADERS = ('If-none-match', 'If-modified-since')  # urllib capitalizes header names
+MODES = ('live', 'record', 'replay')
+
+
+class FixtureMiss(URLError):
+    """Raised in replay mode for a request that was never recorded"""
+
+    def __init__(self, method: str, url: str):
+        super().__init__(f"no fixture for {method} {url}")
+        self.method = method
+        self.url = url
+
+
+class Fixture:
+    """One recorded response"""
+
+    def __init__(self, method: str, url: str, status: int, headers: Dict[str, str],
+                 body: bytes, elapsed_ms: float):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+
+class FixtureResponse(io.BytesIO):
+    """In-memory stand-in for an http.client.HTTPResponse"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        super().__init__(body)
+        self.url = url
+        self.status = status
+        self.reason = http.client.responses.get(status, '')
+        self.headers = http.client.HTTPMessage()
+        for name, value in headers.items():
+            self.headers[name] = value
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+
+def _response(fixture: Fixture):
+    """A FixtureResponse for 2xx/3xx fixtures; HTTPError is raised for the rest"""
+    response = FixtureResponse(fixture.url, fixture.status, fixture.headers, fixture.body)
+    if fixture.status >= 400:
+        raise HTTPError(fixture.url, fixture.status, response.reason, response.headers, response)
+    return response
+
+
+class FixtureArchive:
+    """Thread-safe (method, url) -> Fixture store in one SQLite file"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(SCHEMA)
+        self.lock = threading.Lock()
+
+    def get(self, method: str, url: str) -> Optional[Fixture]:
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT status, headers, body, elapsed_ms FROM fixtures WHERE method = ? AND url = ?',
+                (method, url)
+            ).fetchone()
+        if not row:
+            return None
+        status, headers, body, elapsed_ms = row
+        return Fixture(method, url, status, json.loads(headers), zlib.decompress(body), elapsed_ms)
+
+    def put(self, fixture: Fixture):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO fixtures '
+                '(method, url, status, headers, body, sha256, elapsed_ms, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (fixture.method, fixture.url, fixture.status, json.dumps(fixture.headers),
+                 zlib.compress(fixture.body, 6), hashlib.sha256(fixture.body).hexdigest(),
+                 fixture.elapsed_ms, time.time())
+            )
+            self.conn.commit()
+
+    def __iter__(self) -> Iterator[Fixture]:
+        with self.lock:
+            keys = self.conn.execute('SELECT method, url FROM fixtures ORDER BY url, method').fetchall()
+        for method, url in keys:
+            yield self.get(method, url)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM fixtures').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class Transport:
+    """Routes urlopen() to the network, through a recorder, or to the archive"""
+
+    def __init__(self, mode: str = 'live', archive: Optional[FixtureArchive] = None,
+                 latency: Union[float, str] = 0.0):
+        if mode not in MODES:
+            raise ValueError(f"unknown fixture mode {mode!r}")
+        if mode != 'live' and archive is None:
+            raise ValueError(f"fixture mode {mode!r} needs an archive")
+        self.mode = mode
+        self.archive = archive
+        self.latency = latency  # seconds, or 'recorded' to replay the measured latency
+        self.lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+
+    def _count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def urlopen(self, req: urllib.request.Request, timeout: float):
+        if self.mode == 'replay':
+            return self._replay(req)
+        if self.mode == 'record':
+            return self._record(req, timeout)
+        return urllib.request.urlopen(req, timeout=timeout)
+
+    def _record(self, req: urllib.request.Request, timeout: float):
+        # Always fetch the full page so the fixture never depends on local cache state
+        for name in CONDITIONAL_HEADERS:
+            req.remove_header(name)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                status, headers, body = response.status, dict(response.headers.items()), response.read()
+        except HTTPError as e:
+            status, headers, body = e.code, dict(e.headers.items()) if e.headers else {}, e.read()
+        fixture = Fixture(req.get_method(), req.full_url, status, headers, body,
+                          (time.perf_counter() - start) * 1000)
+        self.archive.put(fixture)
+        self._count("recorded")
+        return _response(fixture)
+
+    def _replay(self, req: urllib.request.Request):
+        fixture = self.archive.get(req.get_method(), req.full_url)
+        if fixture is None:
+            self._count("missed")
+            raise FixtureMiss(req.get_method(), req.full_url)
+        delay = fixture.elapsed_ms / 1000 if self.latency == 'recorded' else float(self.latency)
+        if delay > 0:
+            time.sleep(delay)
+        self._count("replayed")
+        etag = fixture.headers.get('ETag')
+        if etag and req.get_header('If-none-match') == etag:
+            raise HTTPError(fixture.url, 304, 'Not Modified', _response(fixture).headers, None)
+        return _response(fixture)
+
+
+TRANSPORT = Transport()
+
+
+def urlopen(req: urllib.request.Request, timeout: float = 10):
+    """Drop-in for urllib.request.urlopen that honours the installed fixture mode"""
+    return TRANSPORT.urlopen(req, timeout)
+
+
+def install(mode: str, path: Optional[str] = None, latency: Union[float, str] = 0.0) -> Transport:
+    """Switch the process to live / record / replay"""
+    global TRANSPORT
+    archive = FixtureArchive(path) if mode != 'live' else None
+    TRANSPORT = Transport(mode, archive, latency)
+    return TRANSPORT
+
+
+def parse_latency(value: str) -> Union[float, str]:
+    return value if value == 'recorded' else float(value)
+
+
+def add_arguments(parser, default_path: Optional[str] = None):
+    """--fixtures / --fixture-mode / --replay-latency flags"""
+    parser.add_argument("--fixtures", default=default_path, metavar="PATH",
+                        help="HTTP fixture archive to record into or replay from")
+    parser.add_argument("--fixture-mode", choices=MODES, default='live',
+                        help="record real responses, or replay them with no network")
+    parser.add_argument("--replay-latency", type=parse_latency, default=0.0, metavar="SECONDS|recorded",
+                        help="simulated per-request latency when replaying (default 0)")
+
+
+def start(args) -> Transport:
+    if args.fixture_mode != 'live' and not args.fixtures:
+        raise SystemExit(f"--fixture-mode {args.fixture_mode} needs --fixtures PATH")
+    if args.fixture_mode == 'replay' and not Path(args.fixtures).exists():
+        raise SystemExit(f"No fixture archive at {args.fixtures}; record one with --fixture-mode record")
+    transport = install(args.fixture_mode, args.fixtures, args.replay_latency)
+    if transport.mode != 'live':
+        print(f"🎞  Fixtures: {transport.mode} {args.fixtures}")
+    return transport
+
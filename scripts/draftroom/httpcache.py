@@ -0,0 +1,131 @@
+"""
+Local HTTP response cache for the scrapers, with conditional revalidation
+
+Bodies are stored zlib-compressed and content-addressed (objects/<sha256>),
+so identical pages share storage. A SQLite index maps each URL to its body
+hash plus the ETag / Last-Modified validators; repeat fetches send
+If-None-Match / If-Modified-Since and a 304 is served from disk.
+`offline=True` never touches the network and answers from the cache only.
+"""
+
+import hashlib
+import io
+import sqlite3
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+from urllib.error import HTTPError
+
+from draftroom import fixtures
+from draftroom.metrics import RUN
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+  url TEXT PRIMARY KEY,
+  sha256 TEXT NOT NULL,
+  etag TEXT,
+  last_modified TEXT,
+  fetched_at REAL NOT NULL
+)
+"""
+
+
+def read_all(stream: BinaryIO) -> Tuple[bytes, bytes]:
+    """Default reader: the whole body is both the result and what gets cached"""
+    body = stream.read()
+    return body, body
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+class PageCache:
+    """Thread-safe conditional-GET cache rooted at `root`"""
+
+    def __init__(self, root: str, offline: bool = False):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.offline = offline
+        self.conn = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.conn.execute(SCHEMA)
+        self.lock = threading.Lock()
+        self.stats = {"fresh": 0, "revalidated": 0, "offline_hits": 0, "bytes_fetched": 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self.lock:
+            self.stats[key] += n
+        RUN.count(f'http_cache.{key}', n)
+
+    def _entry(self, url: str) -> Optional[tuple]:
+        with self.lock:
+            return self.conn.execute(
+                'SELECT sha256, etag, last_modified FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+
+    def _read_body(self, sha: str) -> bytes:
+        return zlib.decompress((self.objects / sha).read_bytes())
+
+    def _store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        sha = hashlib.sha256(body).hexdigest()
+        path = self.objects / sha
+        if not path.exists():
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(zlib.compress(body, 6))
+            tmp.replace(path)
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO responses (url, sha256, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET sha256 = excluded.sha256, etag = excluded.etag, '
+                'last_modified = excluded.last_modified, fetched_at = excluded.fetched_at',
+                (url, sha, etag, last_modified, time.time())
+            )
+            self.conn.commit()
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10,
+              reader: Callable[[BinaryIO], Tuple[Any, bytes]] = read_all) -> Any:
+        """
+        GET `url`, revalidating a cached copy; HTTP errors propagate as HTTPError.
+
+        `reader(stream) -> (result, bytes_read)` consumes the body; whatever it
+        read is what gets cached, so an early-exit reader caches a page prefix.
+        """
+        entry = self._entry(url)
+        if self.offline:
+            if not entry:
+                raise CacheMiss(url)
+            self._count("offline_hits")
+            return reader(io.BytesIO(self._read_body(entry[0])))[0]
+
+        req = urllib.request.Request(url, headers=dict(headers or {}))
+        if entry:
+            if entry[1]:
+                req.add_header('If-None-Match', entry[1])
+            if entry[2]:
+                req.add_header('If-Modified-Since', entry[2])
+
+        host = urllib.parse.urlsplit(url).netloc
+        start = time.perf_counter()
+        try:
+            with fixtures.urlopen(req, timeout=timeout) as response:
+                result, body = reader(response)
+                RUN.http(host, time.perf_counter() - start, response.status, len(body))
+                self._count("bytes_fetched", len(body))
+                self._count("fresh")
+                self._store(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                return result
+        except HTTPError as e:
+            RUN.http(host, time.perf_counter() - start, e.code)
+            if e.code == 304 and entry:
+                self._count("revalidated")
+                return reader(io.BytesIO(self._read_body(entry[0])))[0]
+            raise
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
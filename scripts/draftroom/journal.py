@@ -0,0 +1,86 @@
+"""
+Append-only progress journal with snapshot compaction
+
+Each finished item is one fsync'd JSON line in `<name>.jsonl`, so saving is
+O(1) per item and a crash can at worst lose a torn final line, which `load()`
+cuts off so the next append starts on a fresh line. `compact()`
+folds the journal into the `<name>.json` snapshot (written atomically) and
+truncates the journal.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+
+class ProgressJournal:
+    """key -> record store backed by a JSON snapshot plus a JSONL journal"""
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_suffix('.jsonl')
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = None
+
+    def load(self) -> Dict[str, Dict]:
+        """Snapshot data with the journal replayed on top"""
+        data = {}
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f).get("data", {})
+        if self.journal_path.exists():
+            self._truncate_torn_tail()
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # unreadable line; the ones around it are intact
+                    data[entry["key"]] = entry["record"]
+        return data
+
+    def _truncate_torn_tail(self):
+        """Drop a half-written last line left by a crash"""
+        with open(self.journal_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                f.truncate(end)
+
+    def append(self, key: str, record: Dict):
+        """Durably record one finished item"""
+        if self._fh is None:
+            if self.journal_path.exists():
+                self._truncate_torn_tail()
+            self._fh = open(self.journal_path, 'a')
+        self._fh.write(json.dumps({"key": key, "record": record}, separators=(',', ':')) + '\n')
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def compact(self) -> int:
+        """Fold the journal into the snapshot, return the number of records"""
+        data = self.load()
+        self.close()
+        tmp = self.snapshot_path.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({"completed": list(data), "data": data}, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        return len(data)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
@@ -0,0 +1,158 @@
+"""
+Incremental iteration over one array inside a large JSON document
+
+Uses json.JSONDecoder.raw_decode on a sliding read buffer, so peak memory is
+roughly one array element plus one read chunk rather than the whole parsed
+document, and the first element is available as soon as it has been read.
+An element that doesn't fit in what has been read is retried after the
+buffer has at least doubled, so a long record costs a constant number of
+decodes per byte. Top-level values other than the wanted array are skipped
+by a bracket scan, never decoded.
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+READ_CHUNK = 1 << 16
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = frozenset('0123456789+-.eE')
+OUTSIDE_STRING = re.compile(r'["\[\]{}]')
+INSIDE_STRING = re.compile(r'["\\]')
+
+
+class _Reader:
+    """Text buffer over a file with just enough tokenizing to walk JSON containers"""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size: int = 0) -> bool:
+        """Read max(size, chunk_size) more characters; False at EOF"""
+        if self.eof:
+            return False
+        chunk = self.f.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > len(self.buf) // 2:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character (without consuming it), '' at EOF"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete: at least double what is buffered before decoding again
+                if self.fill(len(self.buf) - self.pos):
+                    continue
+                raise
+            # A number running up to the end of the buffer ("2." of "2.5") may
+            # continue in the next chunk
+            if (not self.eof and isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and NUMBER_CHARS.issuperset(self.buf[end:]) and self.fill()):
+                continue
+            self.pos = end
+            return obj
+
+    def skip(self):
+        """Consume the next JSON value without decoding it"""
+        if not self.peek() or self.peek() not in '[{':
+            self.value()  # scalars are short
+            return
+        depth = 0
+        i = self.pos
+        in_string = False
+        while True:
+            pattern = INSIDE_STRING if in_string else OUTSIDE_STRING
+            match = pattern.search(self.buf, i)
+            # A backslash needs the character after it in the buffer too
+            if match is None or (match.group() == '\\' and match.end() == len(self.buf)):
+                self.pos = match.start() if match else len(self.buf)  # scanned text can go
+                if not self.fill():
+                    raise ValueError("unterminated JSON value in stream")
+                i = self.pos
+                continue
+            char = match.group()
+            i = match.end()
+            if in_string:
+                if char == '\\':
+                    i += 1
+                else:
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.pos = i
+                    return
+
+
+def _iter_elements(reader: _Reader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect(']')
+        return
+
+
+def iter_array(f: TextIO, key: str, chunk_size: int = READ_CHUNK) -> Iterator[Any]:
+    """
+    Yield the elements of `document[key]` one at a time.
+
+    Other top-level keys are skipped without being decoded. A top-level
+    array is iterated directly.
+    """
+    reader = _Reader(f, chunk_size)
+    if reader.peek() == '[':
+        yield from _iter_elements(reader)
+        return
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            yield from _iter_elements(reader)
+            return
+        reader.skip()
+        if reader.peek() != ',':
+            return
+        reader.pos += 1
@@ -0,0 +1,85 @@
+"""
+Persistent on-disk cache of school logo resolutions (SQLite in data/)
+
+Hits and misses expire on separate schedules: a found logo is trusted for
+HIT_TTL, while a school that 404'd is retried after MISS_TTL rather than on
+every run. Probes that failed for any other reason are never stored. Each
+result is committed as it is stored, so an interrupted run keeps the probes
+it already paid for.
+"""
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from draftroom.metrics import RUN
+
+DAY = 24 * 60 * 60
+HIT_TTL = 30 * DAY
+MISS_TTL = 7 * DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS school_logos (
+  school_key TEXT PRIMARY KEY,
+  school TEXT NOT NULL,
+  logo_url TEXT,
+  source TEXT,
+  checked_at REAL NOT NULL
+)
+"""
+
+
+def normalize_school(school_name: str) -> str:
+    """Cache key for a school name ("  Miami  (FL) " -> "miami (fl)")"""
+    return re.sub(r'\s+', ' ', school_name.strip().lower())
+
+
+class LogoCache:
+    """school -> (logo_url | None, source CDN, checked_at) with TTL expiry"""
+
+    def __init__(self, path: str, hit_ttl: float = HIT_TTL, miss_ttl: float = MISS_TTL):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, school_name: str, now: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """(fresh, logo_url): fresh is False when absent or expired"""
+        row = self.conn.execute(
+            'SELECT logo_url, checked_at FROM school_logos WHERE school_key = ?',
+            (normalize_school(school_name),)
+        ).fetchone()
+        now = time.time() if now is None else now
+        if row:
+            logo_url, checked_at = row
+            ttl = self.hit_ttl if logo_url else self.miss_ttl
+            if now - checked_at < ttl:
+                self.hits += 1
+                RUN.count('logo_cache.hits')
+                return True, logo_url
+        self.misses += 1
+        RUN.count('logo_cache.misses')
+        return False, None
+
+    def store(self, school_name: str, logo_url: Optional[str], source: str,
+              now: Optional[float] = None):
+        """Record a probe result (logo_url None = negative entry), committed at once"""
+        self.conn.execute(
+            'INSERT INTO school_logos (school_key, school, logo_url, source, checked_at) '
+            'VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(school_key) DO UPDATE SET school = excluded.school, '
+            'logo_url = excluded.logo_url, source = excluded.source, checked_at = excluded.checked_at',
+            (normalize_school(school_name), school_name, logo_url, source,
+             time.time() if now is None else now)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
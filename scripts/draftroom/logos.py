@@ -0,0 +1,153 @@
+"""
+School logo resolution against the Tankathon CDN
+"""
+
+import re
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.error import URLError, HTTPError
+
+from draftroom import fixtures, schools
+from draftroom.logocache import LogoCache
+from draftroom.metrics import RUN
+from draftroom.ratelimit import HostLimiter
+from draftroom.schools import SchoolIndex
+
+LOGO_CDN = "http://d2uki2uvp6v3wr.cloudfront.net/ncaa"
+PROBE_WORKERS = 8
+PROBE_RATE = 10.0  # HEAD requests per second per CDN host
+PROBE_BURST = 4
+
+
+def school_slug(school_name: str) -> str:
+    """Normalize a school name to the CDN slug format"""
+    school = schools.load().lookup(school_name)
+    if school:
+        return school.tankathon
+
+    # Clean slug for URL
+    slug = school_name.lower().strip()
+    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = slug.replace(' ', '-')
+    slug = re.sub(r'-+', '-', slug)
+    return slug.strip('-')
+
+
+MISSING = (404, 410)  # the only answers that say a logo doesn't exist
+
+
+def probe_logo(logo_url: str) -> Optional[bool]:
+    """
+    HEAD the logo URL: True if it exists, False if the CDN says it doesn't
+    (404/410), None if we couldn't tell (other statuses, network errors, timeouts)
+    """
+    host = urllib.parse.urlsplit(logo_url).netloc
+    start = time.perf_counter()
+    try:
+        req = urllib.request.Request(logo_url, method='HEAD')
+        req.add_header('User-Agent', 'Mozilla/5.0')
+
+        with fixtures.urlopen(req, timeout=3) as response:
+            RUN.http(host, time.perf_counter() - start, response.status)
+            return True if response.status == 200 else None
+    except HTTPError as e:
+        RUN.http(host, time.perf_counter() - start, e.code)
+        return False if e.code in MISSING else None
+    except (URLError, ConnectionError, TimeoutError):
+        RUN.http(host, time.perf_counter() - start, 'error')
+        return None
+
+
+def logo_url_for(school_name: str) -> str:
+    """Candidate Tankathon CDN URL for a school"""
+    return f"{LOGO_CDN}/{school_slug(school_name)}.svg"
+
+
+class LogoResolver:
+    """
+    Resolves school logos on a thread pool, one probe per unique school.
+
+    Probes are paced by a token bucket per CDN host, so the delay is only
+    paid for real network calls; schools already in `cache`, known to the
+    optional alias index `schools`, or fresh in the optional persistent
+    `store` cost nothing. With `probe=False` unknown schools get no logo.
+    """
+
+    def __init__(self, cache: Optional[Dict] = None, store: Optional[LogoCache] = None,
+                 workers: int = PROBE_WORKERS, rate: float = PROBE_RATE, burst: int = PROBE_BURST,
+                 schools: Optional[SchoolIndex] = None, fuzzy: bool = False, probe: bool = True):
+        self.cache = cache if cache is not None else {}
+        self.store = store
+        self.schools = schools
+        self.fuzzy = fuzzy
+        self.probe = probe
+        self.limiter = HostLimiter(rate, burst)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.pending: Dict[str, Future] = {}
+        self.probes = 0
+
+    def _probe(self, school_name: str) -> Tuple[Optional[str], bool]:
+        """(logo URL or None, whether the answer is definitive)"""
+        logo_url = logo_url_for(school_name)
+        self.limiter.acquire(urllib.parse.urlsplit(logo_url).netloc)
+        exists = probe_logo(logo_url)
+        return (logo_url if exists else None), exists is not None
+
+    def submit(self, school_name: str):
+        """Start resolving a school in the background (no-op if known)"""
+        if not school_name or school_name in self.cache or school_name in self.pending:
+            return
+        if self.schools:
+            logo_url = self.schools.logo_url(school_name, self.fuzzy)
+            if logo_url or not self.probe:
+                self.cache[school_name] = logo_url
+                RUN.count('logo.index_hits' if logo_url else 'logo.index_misses')
+                return
+        if not self.probe:
+            self.cache[school_name] = None
+            return
+        if self.store:
+            fresh, logo_url = self.store.lookup(school_name)
+            if fresh:
+                self.cache[school_name] = logo_url
+                return
+        self.pending[school_name] = self.pool.submit(self._probe, school_name)
+        self.probes += 1
+        RUN.count('logo.probes')
+
+    def get(self, school_name: str) -> Optional[str]:
+        """Logo URL for a school, waiting on an in-flight probe if needed"""
+        if not school_name:
+            return None
+        if school_name not in self.cache:
+            self.submit(school_name)
+        if school_name in self.pending:
+            logo_url, definitive = self.pending.pop(school_name).result()
+            self.cache[school_name] = logo_url
+            if not definitive:
+                RUN.count('logo.probe_errors')  # retried next run, not stored as a miss
+            elif self.store:
+                source = urllib.parse.urlsplit(logo_url_for(school_name)).netloc
+                self.store.store(school_name, logo_url, source)
+        return self.cache[school_name]
+
+    def resolve_many(self, school_names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve a batch of schools concurrently"""
+        names = [s for s in dict.fromkeys(school_names) if s]
+        for name in names:
+            self.submit(name)
+        return {name: self.get(name) for name in names}
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        if self.store:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
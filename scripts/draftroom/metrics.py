@@ -0,0 +1,245 @@
+"""
+Run metrics shared by the data scripts
+
+Everything reports into the process-wide `RUN`: stage timings, HTTP latency
+histograms per host, cache hit/miss and other counters, and subprocess
+durations. Aggregation is always on and cheap; with `--metrics PATH` the run
+is also written as NDJSON (subprocess events as they happen, then one line
+per stage, per host and the counters, and a final summary line). `--profile
+PATH` dumps a cProfile of the script's hot loop.
+
+Stage time is exclusive: when `resolve_logos` pulls from `normalize`, the
+time spent inside `normalize` is charged to `normalize`, not to both.
+"""
+
+import cProfile
+import contextlib
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (ms)"""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float):
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                break
+        else:
+            i = len(self.bounds)
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 2),
+            "buckets_ms": {("le_" + str(b)): n for b, n in zip(self.bounds, self.counts)},
+            "overflow": self.counts[-1],
+        }
+
+
+class RunMetrics:
+    """Thread-safe aggregate of one script run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.script = None
+        self.path = None
+        self.started = time.time()
+        self.counters = Counter()
+        self.stage_seconds = Counter()
+        self.stage_items = Counter()
+        self.http_latency: Dict[str, Histogram] = {}
+        self.http_status: Dict[str, Counter] = {}
+        self.http_bytes = Counter()
+        self.subprocesses: List[Dict] = []
+        self._sink = None
+        self._local = threading.local()
+
+    # --- output -----------------------------------------------------------
+
+    def open(self, path: str, script: str):
+        """Start writing NDJSON events to `path`"""
+        self.path = path
+        self.script = script
+        self._sink = open(path, 'w')
+        self.event("start", script=script)
+
+    def event(self, kind: str, **fields):
+        if self._sink is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), "kind": kind, **fields}, separators=(',', ':'))
+        with self.lock:
+            self._sink.write(line + '\n')
+            self._sink.flush()
+
+    # --- counters and observations ----------------------------------------
+
+    def count(self, name: str, n: float = 1):
+        with self.lock:
+            self.counters[name] += n
+
+    def http(self, host: str, seconds: float, status, nbytes: int = 0):
+        """Record one HTTP request (status is the code, or 'error')"""
+        with self.lock:
+            if host not in self.http_latency:
+                self.http_latency[host] = Histogram()
+                self.http_status[host] = Counter()
+            self.http_latency[host].observe(seconds * 1000)
+            self.http_status[host][str(status)] += 1
+            self.http_bytes[host] += nbytes
+
+    def subprocess(self, argv: Sequence[str], seconds: float, returncode: int):
+        record = {"argv": list(argv), "seconds": round(seconds, 3), "returncode": returncode}
+        with self.lock:
+            self.subprocesses.append(record)
+        self.event("subprocess", **record)
+
+    # --- stage timing -----------------------------------------------------
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+            self._local.mark = time.perf_counter()
+        return self._local.stack
+
+    def _enter(self, name: str):
+        stack = self._stack()
+        now = time.perf_counter()
+        if stack:
+            with self.lock:
+                self.stage_seconds[stack[-1]] += now - self._local.mark
+        stack.append(name)
+        self._local.mark = now
+
+    def _exit(self):
+        stack = self._stack()
+        now = time.perf_counter()
+        with self.lock:
+            self.stage_seconds[stack.pop()] += now - self._local.mark
+        self._local.mark = now
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Charge the time spent in this block (minus nested stages) to `name`"""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Pass-through generator stage whose own time is charged to `name`"""
+        it = iter(iterable)
+        while True:
+            self._enter(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            with self.lock:
+                self.stage_items[name] += 1
+            yield item
+
+    # --- summary ----------------------------------------------------------
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return {
+                "script": self.script,
+                "wall_seconds": round(time.time() - self.started, 3),
+                "stages": {name: {"seconds": round(s, 4), "items": self.stage_items.get(name, 0)}
+                           for name, s in self.stage_seconds.items()},
+                "http": {host: {**h.to_dict(), "status": dict(self.http_status[host]),
+                                "bytes": self.http_bytes[host]}
+                         for host, h in self.http_latency.items()},
+                "counters": {k: round(v, 4) if isinstance(v, float) else v
+                             for k, v in sorted(self.counters.items())},
+                "subprocess_seconds": round(sum(p["seconds"] for p in self.subprocesses), 3),
+            }
+
+    def close(self):
+        """Write per-stage, per-host and summary lines and close the file"""
+        if self._sink is None:
+            return
+        summary = self.summary()
+        for name, stage in summary["stages"].items():
+            self.event("stage", name=name, **stage)
+        for host, stats in summary["http"].items():
+            self.event("http", host=host, **stats)
+        self.event("counters", counters=summary["counters"])
+        self.event("summary", **summary)
+        self._sink.close()
+        self._sink = None
+
+
+RUN = RunMetrics()
+
+
+def add_arguments(parser):
+    """--metrics / --profile flags shared by every script"""
+    parser.add_argument("--metrics", default=None, metavar="PATH",
+                        help="write run metrics (stage timings, HTTP latency, counters) as NDJSON")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="dump a cProfile of the main loop (view with `python -m pstats PATH`)")
+
+
+def start(args, script: str) -> RunMetrics:
+    if getattr(args, 'metrics', None):
+        RUN.open(args.metrics, script)
+    return RUN
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str]):
+    """cProfile the block when `path` is set"""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        RUN.event("profile", path=path)
+
+
+def finish():
+    """Flush the metrics file, if one was requested"""
+    if RUN.path:
+        RUN.close()
+        print(f"📈 Metrics written to {RUN.path}")
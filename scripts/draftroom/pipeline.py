@@ -0,0 +1,319 @@
+"""
+Streaming prospect ingest pipeline shared by the Sportradar import scripts
+
+read -> normalize -> resolve logo -> emit, each stage a generator, so a
+prospect flows all the way to the SQL file before the next one is pulled.
+import-json-prospects.py, update-players-only.py and smart-update-players.py
+are thin modes of run().
+"""
+
+import argparse
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, Optional
+
+from draftroom import d1, fixtures, metrics, schools, wrangler
+from draftroom.d1 import Batch
+from draftroom.delta import Delta, load_snapshot
+from draftroom.jsonstream import iter_array
+from draftroom.logocache import LogoCache
+from draftroom.logos import LogoResolver
+from draftroom.metrics import RUN
+from draftroom.slugs import SlugIndex, load_slugs
+from draftroom.sqlutil import content_hash, inches_to_height
+
+INPUT_JSON = "/Users/max/clawd/2026-prospects.json"
+PROJECT_DIR = "/Users/max/projects/draftroom"
+LOGO_CACHE_DB = "data/logo-cache.sqlite"  # relative to PROJECT_DIR
+LOGO_WINDOW = 256  # records held back while their school's logo probe is in flight
+
+SOURCE_COLUMNS = ('name', 'slug', 'position', 'school', 'height', 'weight', 'rank', 'school_logo')
+PLAYER_COLUMNS = SOURCE_COLUMNS + ('content_hash',)
+
+CLEAR_STATEMENTS = [
+    "PRAGMA foreign_keys = OFF",
+    "DELETE FROM votes",
+    "DELETE FROM community_reports",
+    "DELETE FROM expert_reports",
+    "DELETE FROM players",
+    "PRAGMA foreign_keys = ON",
+]
+
+
+# --- Stages ---------------------------------------------------------------
+
+def read_prospects(path: str) -> Iterator[Dict]:
+    """Yield raw prospect dicts from a Sportradar JSON file, one at a time as they are read"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_array(f, 'prospects')
+
+
+def normalize(prospects: Iterable[Dict], slugs: Optional[SlugIndex] = None) -> Iterator[Dict]:
+    """
+    Map raw Sportradar prospects to players-table records (rank = feed order).
+
+    Slugs come from `slugs`, so two prospects with the same name never share one;
+    build it from the whole feed's names (as run() does) to make them
+    independent of feed order.
+    """
+    slugs = slugs if slugs is not None else SlugIndex()
+    for rank, prospect in enumerate(prospects, 1):
+        name = prospect.get('name', '')
+        position = prospect.get('position', '')
+        school = prospect.get('team_name', '')
+        yield {
+            'name': name,
+            'slug': slugs.assign(name, school, position),
+            'position': position,
+            'school': school,
+            'height': inches_to_height(prospect.get('height')),
+            'weight': prospect.get('weight') or None,
+            'rank': rank,
+        }
+
+
+def resolve_logos(records: Iterable[Dict], resolver: LogoResolver,
+                  window: int = LOGO_WINDOW) -> Iterator[Dict]:
+    """
+    Attach school_logo to each record, in input order.
+
+    Up to `window` records are read ahead so the probes for the schools they
+    mention run concurrently; each school is probed at most once.
+    """
+    buffer = deque()
+    for record in records:
+        resolver.submit(record['school'])
+        buffer.append(record)
+        if len(buffer) >= window:
+            head = buffer.popleft()
+            head['school_logo'] = resolver.get(head['school'])
+            yield head
+    while buffer:
+        head = buffer.popleft()
+        head['school_logo'] = resolver.get(head['school'])
+        yield head
+
+
+def fingerprint(records: Iterable[Dict]) -> Iterator[Dict]:
+    """Attach content_hash over the source fields (see migrations/0006)"""
+    for record in records:
+        record['content_hash'] = content_hash(record[c] for c in SOURCE_COLUMNS)
+        yield record
+
+
+def player_row(record: Dict) -> tuple:
+    return tuple(record[c] for c in PLAYER_COLUMNS)
+
+
+def emit(records: Iterable[Dict], mode: str) -> Iterator[Batch]:
+    """
+    Yield parameterized (sql, rows) batches for the given mode.
+
+    Players are written with chunked multi-row INSERT ... ON CONFLICT(slug)
+    DO UPDATE, one statement per chunk, so existing rows keep their id and
+    community_reports stay attached.
+    """
+    if mode == 'import':
+        for stmt in CLEAR_STATEMENTS:
+            yield stmt, [()]
+    yield from d1.upsert_batches('players', PLAYER_COLUMNS, 'slug', (player_row(r) for r in records))
+
+
+# --- Run bookkeeping ------------------------------------------------------
+
+class Stats:
+    """Running totals collected as records stream past"""
+
+    def __init__(self):
+        self.total = 0
+        self.with_height = 0
+        self.with_weight = 0
+        self.with_logo = 0
+        self.positions = Counter()
+        self.schools = set()
+
+    def observe(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Pass-through stage that updates the totals"""
+        for record in records:
+            self.total += 1
+            self.with_height += bool(record['height'])
+            self.with_weight += bool(record['weight'])
+            self.with_logo += bool(record.get('school_logo'))
+            self.positions[record['position'] or 'Unknown'] += 1
+            self.schools.add(record['school'])
+            if self.total % 50 == 0:
+                print(f"  [{self.total}] {record['name']} - {record['school']} "
+                      f"{'✓' if record.get('school_logo') else '✗'} (logos: {self.with_logo})")
+            yield record
+
+    def logo_pct(self) -> float:
+        return self.with_logo / self.total * 100 if self.total else 0.0
+
+
+MODES = {
+    'import': {
+        'title': "🏈 Importing 2026 NFL Draft Prospects from JSON",
+        'sql_name': "import-json-prospects.sql",
+        'notes': ["✓ Will clear existing players and related data"],
+    },
+    'upsert': {
+        'title': "🏈 Updating Players Table (Community Data Safe!)",
+        'sql_name': "update-players.sql",
+        'notes': ["✓ Using INSERT ... ON CONFLICT(slug) DO UPDATE (player ids preserved)",
+                  "✓ Community reports, expert reports, and votes will NOT be touched"],
+    },
+}
+
+
+def print_summary(mode: str, stats: Stats, resolver: LogoResolver):
+    """Print the end-of-run report for a mode"""
+    print("\n" + "=" * 60)
+    print("📊 IMPORT SUMMARY" if mode == 'import' else "📊 UPDATE SUMMARY")
+    print("=" * 60)
+    print(f"Total prospects:   {stats.total}")
+    print(f"With height data:  {stats.with_height}")
+    print(f"With weight data:  {stats.with_weight}")
+    print(f"With school logos: {stats.with_logo} ({stats.logo_pct():.1f}%)")
+    print(f"Schools:           {len(stats.schools)}")
+
+    if mode == 'import':
+        print("\n📈 Position Breakdown:")
+        for pos, count in stats.positions.most_common(10):
+            print(f"  {pos}: {count}")
+    else:
+        print("Community data:    PRESERVED ✅")
+        found = sorted(k for k, v in resolver.cache.items() if v is not None)
+        if found:
+            print(f"\n📊 Logos found for {len(found)} schools:")
+            for school in found[:20]:
+                print(f"  ✓ {school}")
+            if len(found) > 20:
+                print(f"  ... and {len(found) - 20} more")
+    print("\n" + "=" * 60)
+
+
+def verify(project_dir: str, remote: bool, db_path: Optional[str] = None):
+    """Print row counts from the database after applying"""
+    if not remote:
+        db = d1.LocalD1.open(project_dir, db_path)
+        print(f"✓ Verified: {db.count('players')} players, "
+              f"{db.count('community_reports')} community reports")
+        db.close()
+        return
+
+    results = wrangler.query(
+        'SELECT COUNT(*) as players FROM players; SELECT COUNT(*) as reports FROM community_reports;',
+        project_dir, remote=True)
+    try:
+        player_count = results[0]['results'][0]['players']
+        report_count = results[1]['results'][0]['reports']
+        print(f"✓ Verified: {player_count} players, {report_count} community reports")
+    except (TypeError, IndexError, KeyError):
+        print("✓ Complete (verification skipped)")
+
+
+def run(mode: str, input_json: str = INPUT_JSON, project_dir: str = PROJECT_DIR,
+        remote: bool = False, db_path: Optional[str] = None, sql_name: Optional[str] = None,
+        delta: bool = False, delete_missing: bool = False, profile: Optional[str] = None,
+        offline_logos: bool = False, fuzzy_schools: bool = False) -> int:
+    """
+    Run the full pipeline for one mode and apply it to the local (or remote) database.
+
+    With `delta`, the current players table is snapshotted first and only
+    new players, changed fields and (with `delete_missing`) removals are written.
+    Logos come from the school alias index first; only schools it doesn't know
+    are probed on the CDN, and with `offline_logos` not even those.
+    Each stage's exclusive time is charged to RUN; `profile` dumps a cProfile
+    of the streaming loop.
+    """
+    config = MODES[mode]
+    sql_file = f"{project_dir}/data/{sql_name or config['sql_name']}"
+    target = "REMOTE" if remote else "LOCAL"
+
+    print(config['title'])
+    print("=" * 60)
+    print(f"📖 Streaming {input_json}...")
+    for note in config['notes']:
+        print(note)
+    print(f"\n🔄 Processing prospects, fetching logos and writing to {target} database...")
+
+    stats = Stats()
+    store = LogoCache(f"{project_dir}/{LOGO_CACHE_DB}")
+    diff = None
+    try:
+        if delta:
+            with RUN.stage("snapshot"):
+                diff = Delta(load_snapshot(project_dir, remote, db_path))
+            print(f"✓ Snapshot of {len(diff.snapshot)} current players loaded for delta")
+        with RUN.stage("slugs"):
+            # Name pre-pass so collisions don't depend on feed order; a delta
+            # run's snapshot already holds the current slugs
+            existing = diff.snapshot.values() if diff else load_slugs(project_dir, remote, db_path)
+            slugs = SlugIndex(((p.get('name', ''), p.get('team_name', ''), p.get('position', ''))
+                               for p in read_prospects(input_json)), existing=existing)
+        with LogoResolver(store=store, schools=schools.load(), fuzzy=fuzzy_schools,
+                          probe=not offline_logos) as resolver:
+            records = RUN.timed("read", read_prospects(input_json))
+            records = RUN.timed("normalize", normalize(records, slugs))
+            records = RUN.timed("resolve_logos", resolve_logos(records, resolver))
+            records = RUN.timed("fingerprint", fingerprint(records))
+            records = stats.observe(records)
+            batches = diff.batches(records, delete_missing) if diff else emit(records, mode)
+            batches = RUN.timed("emit", batches)
+            with RUN.stage("apply"), metrics.profiled(profile):
+                result = d1.apply(batches, project_dir, remote=remote,
+                                  sql_file=sql_file, db_path=db_path)
+    except (RuntimeError, FileNotFoundError) as e:
+        print("❌ Failed!")
+        print(e)
+        return 1
+
+    print(f"\n✓ Processed {stats.total} prospects")
+    slugs.summary()
+    print(f"✓ Found {stats.with_logo} school logos ({stats.logo_pct():.1f}%), "
+          f"{resolver.probes} CDN probes for {len(resolver.cache)} schools "
+          f"(disk cache: {store.hits} hits, {store.misses} misses)")
+    if remote:
+        print(f"✓ Applied {result['statements']} statements via {sql_file}")
+    else:
+        print(f"✓ Applied {result['statements']} statements, {result['rows_changed']} rows changed")
+
+    if diff:
+        diff.summary()
+    print(f"✅ {target.title()} run successful!")
+    with RUN.stage("verify"):
+        verify(project_dir, remote, db_path)
+    print_summary(mode, stats, resolver)
+    if not remote:
+        print("\n💡 To deploy to PRODUCTION, rerun with --remote")
+    return 0
+
+
+def main(mode: str, sql_name: Optional[str] = None) -> int:
+    """Command-line entry point shared by the import scripts"""
+    parser = argparse.ArgumentParser(description=MODES[mode]['title'])
+    parser.add_argument("--input", default=INPUT_JSON, help="Sportradar prospects JSON")
+    parser.add_argument("--project-dir", default=PROJECT_DIR)
+    parser.add_argument("--remote", action="store_true",
+                        help="apply to production via wrangler instead of the local SQLite file")
+    parser.add_argument("--db", default=None, help="explicit path to the local D1 SQLite file")
+    parser.add_argument("--offline-logos", action="store_true",
+                        help="resolve logos from data/schools.json only, with no CDN probes")
+    parser.add_argument("--fuzzy-schools", action="store_true",
+                        help="match unlisted school spellings to the closest known school")
+    if mode == 'upsert':
+        parser.add_argument("--delta", action="store_true",
+                            help="only write players whose data changed since the current table")
+        parser.add_argument("--delete-missing", action="store_true",
+                            help="with --delta, delete players no longer in the feed")
+    fixtures.add_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    fixtures.start(args)
+    metrics.start(args, sql_name or MODES[mode]['sql_name'].replace('.sql', ''))
+    try:
+        return run(mode, args.input, args.project_dir, remote=args.remote, db_path=args.db,
+                   sql_name=sql_name, delta=getattr(args, 'delta', False),
+                   delete_missing=getattr(args, 'delete_missing', False), profile=args.profile,
+                   offline_logos=args.offline_logos, fuzzy_schools=args.fuzzy_schools)
+    finally:
+        metrics.finish()
@@ -0,0 +1,58 @@
+"""
+Thread-safe token buckets for pacing outbound requests per host/source
+"""
+
+import threading
+import time
+from typing import Dict
+
+from draftroom.metrics import RUN
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available, return seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostLimiter:
+    """One TokenBucket per key (CDN host, scrape source, ...), created lazily"""
+
+    def __init__(self, rate: float, burst: int = 1, overrides: Dict[str, float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, key: str) -> TokenBucket:
+        with self.lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(self.overrides.get(key, self.rate), self.burst)
+            return self.buckets[key]
+
+    def acquire(self, key: str) -> float:
+        waited = self.bucket(key).acquire()
+        if waited:
+            RUN.count(f'ratelimit.wait_seconds.{key}', waited)
+        return waited
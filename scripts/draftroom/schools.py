@@ -0,0 +1,89 @@
+"""
+Offline school alias index (data/schools.json)
+
+Every spelling a feed uses for a school ("Miami", "Miami (FL)", "NC State",
+"North Carolina State") maps to one canonical school with its ESPN team id,
+so logos resolve from a dict lookup instead of a CDN probe. The file is
+loaded once per process; `lookup(..., fuzzy=True)` falls back to the
+closest known spelling for names the file doesn't list.
+"""
+
+import difflib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+SCHOOLS_FILE = Path(__file__).resolve().parents[2] / "data" / "schools.json"
+ESPN_LOGO = "https://a.espncdn.com/i/teamlogos/ncaa/500/{}.png"
+FUZZY_CUTOFF = 0.88
+
+
+def school_key(name: str) -> str:
+    """Alias key: lowercase alphanumerics only, "St." spelled out ("Miami (FL)" -> "miami fl")"""
+    key = re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+    return re.sub(r' st$', ' state', key)
+
+
+class School:
+    """A canonical school"""
+
+    def __init__(self, name: str, espn_id: int, tankathon: str):
+        self.name = name
+        self.espn_id = espn_id
+        self.tankathon = tankathon  # Tankathon CDN slug
+
+    @property
+    def logo_url(self) -> str:
+        return ESPN_LOGO.format(self.espn_id)
+
+
+class SchoolIndex:
+    """alias key -> School"""
+
+    def __init__(self, entries):
+        self.schools: Dict[str, School] = {}
+        self.by_key: Dict[str, School] = {}
+        self.spellings: Dict[str, School] = {}  # every listed spelling, as written
+        self._fuzzy: Dict[str, Optional[School]] = {}
+        for entry in entries:
+            school = School(entry['name'], entry['espn_id'], entry['tankathon'])
+            self.schools[school.name] = school
+            for spelling in [school.name] + entry.get('aliases', []):
+                self.by_key[school_key(spelling)] = school
+                self.spellings[spelling] = school
+
+    @classmethod
+    def from_file(cls, path: str) -> "SchoolIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['schools'])
+
+    def lookup(self, name: str, fuzzy: bool = False) -> Optional[School]:
+        if not name:
+            return None
+        key = school_key(name)
+        school = self.by_key.get(key)
+        if school is not None or not fuzzy:
+            return school
+        if key not in self._fuzzy:
+            match = difflib.get_close_matches(key, self.by_key, n=1, cutoff=FUZZY_CUTOFF)
+            self._fuzzy[key] = self.by_key[match[0]] if match else None
+        return self._fuzzy[key]
+
+    def logo_url(self, name: str, fuzzy: bool = False) -> Optional[str]:
+        school = self.lookup(name, fuzzy)
+        return school.logo_url if school else None
+
+    def spelled(self) -> Iterator[Tuple[str, School]]:
+        """(spelling, school) for every name and alias in the file"""
+        return iter(self.spellings.items())
+
+    def __len__(self) -> int:
+        return len(self.schools)
+
+
+@lru_cache(maxsize=None)
+def load(path: str = str(SCHOOLS_FILE)) -> SchoolIndex:
+    """The index for `path`, read from disk once per process"""
+    return SchoolIndex.from_file(path)
@@ -0,0 +1,87 @@
+"""
+Player page scrapers for Tankathon (primary) and ESPN (fallback)
+"""
+
+import re
+import time
+import urllib.parse
+import urllib.request
+from typing import Dict, Optional
+from urllib.error import URLError, HTTPError
+
+from draftroom import fixtures
+from draftroom.extract import ESPN, TANKATHON, Extraction, FieldExtractor
+from draftroom.httpcache import CacheMiss, PageCache
+from draftroom.metrics import RUN
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+def clean_name_for_url(name: str) -> str:
+    """Clean player name for URL search"""
+    # Convert suffixes to lowercase and remove periods
+    name = re.sub(r'\s+Jr\.?$', ' Jr', name, flags=re.IGNORECASE)
+    name = re.sub(r'\s+Sr\.?$', ' Sr', name, flags=re.IGNORECASE)
+    return name.strip()
+
+
+def tankathon_url(name: str) -> str:
+    slug = clean_name_for_url(name).lower().replace(' ', '-').replace("'", "")
+    return f"https://www.tankathon.com/nfl/players/{slug}"
+
+
+def espn_url(name: str, school: str, position: str) -> str:
+    query = urllib.parse.quote(f"{clean_name_for_url(name)} {school} {position} 2026")
+    return f"https://www.espn.com/nfl/draft2026/player/_/{query}"
+
+
+def scrape(url: str, extractor: FieldExtractor, cache: Optional[PageCache] = None,
+           timeout: float = 10) -> Extraction:
+    """Fetch a page and extract the source's fields in one early-exit pass"""
+    if cache is not None:
+        return cache.fetch(url, HEADERS, timeout=timeout, reader=extractor.read)
+    host = urllib.parse.urlsplit(url).netloc
+    start = time.perf_counter()
+    req = urllib.request.Request(url, headers=HEADERS)
+    try:
+        with fixtures.urlopen(req, timeout=timeout) as response:
+            found = extractor.read(response)[0]
+    except HTTPError as e:
+        RUN.http(host, time.perf_counter() - start, e.code)
+        raise
+    except (URLError, TimeoutError):
+        RUN.http(host, time.perf_counter() - start, 'error')
+        raise
+    RUN.http(host, time.perf_counter() - start, response.status, found.bytes_read)
+    return found
+
+
+def search_tankathon(name: str, position: str, cache: Optional[PageCache] = None) -> Optional[Dict]:
+    """Search Tankathon for player data"""
+    try:
+        found = scrape(tankathon_url(name), TANKATHON, cache)
+    except (HTTPError, URLError, TimeoutError, CacheMiss):
+        return None
+
+    if not found.ok:
+        return None
+    return {
+        "height": f"{found.get('feet')}-{found.get('inches')}",
+        "weight": found.get('weight'),
+        "logo": found.get('logo', ''),
+        "source": "tankathon"
+    }
+
+
+def search_espn(name: str, school: str, position: str, cache: Optional[PageCache] = None) -> Optional[Dict]:
+    """Search ESPN for player data (fallback)"""
+    try:
+        found = scrape(espn_url(name, school, position), ESPN, cache)
+    except (HTTPError, URLError, TimeoutError, CacheMiss):
+        return None
+
+    if not found.ok:
+        return None
+    return {"height": found.get('height'), "weight": found.get('weight'), "logo": "", "source": "espn"}
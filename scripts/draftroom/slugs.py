@@ -0,0 +1,136 @@
+"""
+Batch slug assignment with a collision index
+
+Two prospects can slug to the same value ("Josh Allen" twice), and with
+ON CONFLICT(slug) the second would silently overwrite the first. SlugIndex
+resolves collisions so that a prospect's slug doesn't depend on feed order:
+
+- a prospect the database already holds keeps the slug it has, so existing
+  rows and their reports and votes stay attached. Rows are matched on
+  (name, school), on (name, school, position) when name and school are
+  shared, and finally on name alone when exactly one row of that name has
+  no match and exactly one prospect of that name is new (a transfer or a
+  respelled school: "Miami (FL)" -> "Miami");
+- every new prospect whose name slug is shared within the batch, or already
+  held by another row, is suffixed with -<school>, and with -<position> as
+  well when name and school are shared too. The first one in the feed is
+  suffixed like the rest, so same-named prospects swapping ranks keep their
+  identities.
+
+Only prospects with the same name, school and position fall back to a
+counter in feed order.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from draftroom import d1, wrangler
+from draftroom.sqlutil import generate_slug
+
+Key = Tuple[str, str, str]  # (name, school, position)
+IDENTITY_COLUMNS = ('slug', 'name', 'school', 'position')
+
+
+def _key(name: Optional[str], school: Optional[str] = None, position: Optional[str] = None) -> Key:
+    return (name or '', school or '', position or '')
+
+
+def load_slugs(project_dir: str, remote: bool = False, db_path: Optional[str] = None) -> List[Dict]:
+    """slug, name, school and position of every player already in the database"""
+    sql = f"SELECT {', '.join(IDENTITY_COLUMNS)} FROM players"
+    if not remote:
+        db = d1.LocalD1.open(project_dir, db_path)
+        try:
+            return [dict(zip(IDENTITY_COLUMNS, r)) for r in db.conn.execute(sql)]
+        finally:
+            db.close()
+    results = wrangler.query(sql, project_dir, remote=True)
+    if results is None:
+        raise RuntimeError("could not read player slugs from remote D1")
+    return results[0]['results']
+
+
+def match_existing(prospects: Iterable[Key], rows: Iterable[Tuple[Key, str]]) -> Dict[Key, str]:
+    """Prospect key -> the slug of the existing row that is the same player (see module docstring)"""
+    by_school = defaultdict(lambda: ([], []))  # (name, school) -> (prospect keys, (key, slug) rows)
+    for key in set(prospects):
+        by_school[key[:2]][0].append(key)
+    for key, slug in rows:
+        by_school[key[:2]][1].append((key, slug))
+
+    matched: Dict[Key, str] = {}
+    unmatched_keys = defaultdict(list)  # name -> prospect keys
+    unmatched_rows = defaultdict(list)  # name -> slugs
+    for (name, _), (keys, held) in by_school.items():
+        if len(keys) == 1 and len(held) == 1:
+            matched[keys[0]] = held[0][1]
+            continue
+        positions = Counter(key for key, _ in held)
+        for key, slug in held:
+            if positions[key] == 1 and key in keys:
+                matched[key] = slug
+            else:
+                unmatched_rows[name].append(slug)
+        unmatched_keys[name].extend(key for key in keys if key not in matched)
+
+    for name, keys in unmatched_keys.items():
+        if len(keys) == 1 and len(unmatched_rows[name]) == 1:
+            matched[keys[0]] = unmatched_rows[name][0]
+    return matched
+
+
+class SlugIndex:
+    """slug -> prospect name for everything assigned so far, plus the collisions resolved"""
+
+    def __init__(self, prospects: Iterable[Tuple[str, str, str]] = (),
+                 existing: Optional[Iterable[Dict]] = None):
+        """
+        `prospects` is every (name, school, position) in the batch, so the
+        first of a shared name is suffixed as well; `existing` is the
+        players already in the database, as load_slugs() returns them.
+        """
+        keys = {_key(*p) for p in prospects}
+        names = Counter(generate_slug(name) for name, _, _ in keys)
+        schools = Counter((generate_slug(name), generate_slug(school)) for name, school, _ in keys)
+        self.shared = {base for base, n in names.items() if n > 1}
+        self.shared_schools = {pair for pair, n in schools.items() if n > 1}
+        rows = [(_key(r['name'], r['school'], r['position']), r['slug']) for r in existing or ()]
+        self.held = {slug for _, slug in rows}
+        self.matched = match_existing(keys, rows)
+        self.taken: Dict[str, str] = {}
+        self.collisions: List[tuple] = []  # (base slug, assigned slug, name)
+
+    def _free(self, slug: str) -> bool:
+        return slug not in self.taken and slug not in self.held
+
+    def assign(self, name: str, school: Optional[str] = None, position: Optional[str] = None) -> str:
+        """Unique slug for a prospect, reserved immediately"""
+        slug = self.matched.get(_key(name, school, position))
+        if slug is not None and slug not in self.taken:
+            self.taken[slug] = name
+            return slug
+
+        base = generate_slug(name)
+        slug = base
+        if base in self.shared or not self._free(base):
+            if school:
+                slug = f"{slug}-{generate_slug(school)}"
+            if position and ((base, generate_slug(school or '')) in self.shared_schools
+                             or not self._free(slug)):
+                slug = f"{slug}-{generate_slug(position)}"
+            stem, n = slug, 2
+            while not self._free(slug):
+                slug = f"{stem}-{n}"
+                n += 1
+            self.collisions.append((base, slug, name))
+        self.taken[slug] = name
+        return slug
+
+    def summary(self, limit: int = 10):
+        if not self.collisions:
+            return
+        print(f"⚠️  {len(self.collisions)} slug collisions resolved:")
+        for base, slug, name in self.collisions[:limit]:
+            print(f"  {base} -> {slug} ({name})")
+        if len(self.collisions) > limit:
+            print(f"  ... and {len(self.collisions) - limit} more")
@@ -0,0 +1,55 @@
+"""
+Small helpers shared by everything that writes SQL for the players table
+"""
+
+import hashlib
+import re
+from typing import Any, Iterable, Optional
+
+
+SLUG_DROP = re.compile(r'[^\w\s\'-]')
+# The same rules as one str.translate table for ASCII names (the common case)
+SLUG_TABLE = {c: None for c in range(128) if SLUG_DROP.match(chr(c))}
+SLUG_TABLE.update({ord(' '): '-', ord("'"): None})
+
+
+def generate_slug(name: str) -> str:
+    """Generate URL-friendly slug from player name"""
+    slug = name.lower()
+    if slug.isascii():
+        return slug.translate(SLUG_TABLE)
+    return SLUG_DROP.sub('', slug).replace(' ', '-').replace("'", '')
+
+
+def inches_to_height(inches: Optional[int]) -> Optional[str]:
+    """Convert inches to feet-inches format (e.g., 74 -> '6-2')"""
+    if not inches:
+        return None
+    feet = inches // 12
+    remaining_inches = inches % 12
+    return f"{feet}-{remaining_inches}"
+
+
+def escape_sql(text: str) -> str:
+    """Escape single quotes for SQL"""
+    return text.replace("'", "''")
+
+
+def sql_value(value: Any) -> str:
+    """Render a Python value as a SQL literal, exactly as it would be bound (None -> NULL)"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return f"'{escape_sql(str(value))}'"
+
+
+def content_hash(values: Iterable[Any]) -> str:
+    """
+    Stable 16-hex-char fingerprint of a row's source fields.
+
+    Values are compared as text with None and '' equal, so 325 (feed) and
+    '325' (D1 TEXT column) hash the same.
+    """
+    canonical = '\x1f'.join('' if v is None else str(v) for v in values)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,215 @@
+"""
+Synthetic inputs and stub targets for benchmarking the ingest scripts
+
+Generators write Sportradar-style JSON and enriched CSVs of any size with
+deterministic content, `stub_project` builds a throwaway project directory
+whose local D1 SQLite file has every migration applied, `StubCDN`
+answers logo HEAD probes on localhost, and `write_fixture_archive` builds a
+replayable archive of Tankathon-shaped player pages and logo probes.
+"""
+
+import csv
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator
+
+from draftroom.d1 import LOCAL_STATE
+from draftroom.fixtures import Fixture, FixtureArchive
+from draftroom.logos import logo_url_for
+from draftroom.scrapers import tankathon_url
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+FIRST_NAMES = [
+    'Aaron', 'Bryce', 'Caleb', 'Darius', 'Elijah', 'Fernando', 'Garrett', 'Hunter', 'Isaiah', 'Jalen',
+    'Kyle', 'Luther', 'Marcus', 'Nick', 'Omarion', 'Peyton', 'Quinn', 'Rueben', 'Shedeur', 'Travis',
+    'Udo', "Ja'Marr", 'Vernon', 'Will', 'Xavier', 'Yahya', 'Zion', 'Arvell', 'Drew', 'Emeka',
+]
+LAST_NAMES = [
+    'Allen', 'Bain', 'Carter', 'Downs', 'Egbuka', 'Fields', 'Graham', 'Harris', 'Ingram', 'Jackson',
+    'Kelly', 'Lewis', 'Mendoza', "O'Neil", 'Price', 'Reese', 'Smith-Njigba', 'Thomas', 'Underwood',
+    'Vance', 'Walker', 'Young', 'Zabel', 'Bailey', 'Brooks', 'Collins', 'Davis', 'Evans', 'Ford', 'Green',
+]
+INITIALS = [''] + [f" {c}." for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ']
+SUFFIXES = ['', ' Jr.', ' II', ' III', ' IV']
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'OT', 'IOL', 'ED', 'DL', 'LB', 'CB', 'S']
+SCHOOLS = [
+    'Alabama', 'Arizona State', 'Auburn', 'Boston College', 'BYU', 'Clemson', 'Florida State',
+    'Georgia', 'Georgia Tech', 'Indiana', 'Iowa State', 'LSU', 'Miami (FL)', 'Michigan',
+    'Michigan State', 'Mississippi State', 'NC State', 'Notre Dame', 'Ohio State', 'Ole Miss',
+    'Oregon', 'Penn State', 'Pitt', 'SMU', 'South Carolina', 'TCU', 'Tennessee', 'Texas',
+    'Texas A&M', 'UCF', 'USC', 'UTSA', 'Virginia Tech', 'Wake Forest', 'Washington State',
+]
+# Pad the pool to a realistic FBS + FCS count
+SCHOOLS += [f"{region} {kind}" for region in ('Central', 'Eastern', 'Northern', 'Southern', 'Western')
+            for kind in ('State', 'Tech', 'A&M', 'University', 'College')]
+
+
+def prospect_name(i: int) -> str:
+    """Deterministic, unique name for index i (first/last/initial/suffix combinations)"""
+    i, first = divmod(i, len(FIRST_NAMES))
+    i, last = divmod(i, len(LAST_NAMES))
+    i, initial = divmod(i, len(INITIALS))
+    return f"{FIRST_NAMES[first]}{INITIALS[initial]} {LAST_NAMES[last]}{SUFFIXES[i % len(SUFFIXES)]}"
+
+
+def prospects(n: int, seed: int = 2026) -> Iterator[Dict]:
+    """n raw Sportradar-style prospects"""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            'id': f"{rng.getrandbits(128):032x}",
+            'name': prospect_name(i),
+            'position': rng.choice(POSITIONS),
+            'team_name': rng.choice(SCHOOLS),
+            'height': rng.randint(68, 80) if rng.random() > 0.05 else None,
+            'weight': rng.randint(175, 340) if rng.random() > 0.05 else None,
+            'eligibility': rng.choice(['JR', 'SR', 'RS-SR']),
+        }
+
+
+def write_sportradar_json(path: str, n: int, seed: int = 2026) -> str:
+    """Write {"prospects": [...]} one record per line"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"season": 2026, "prospects": [\n')
+        for i, prospect in enumerate(prospects(n, seed)):
+            f.write((',\n' if i else '') + json.dumps(prospect))
+        f.write('\n]}\n')
+    return path
+
+
+def write_enriched_csv(path: str, n: int, seed: int = 2026) -> str:
+    """Write a prospects-enriched.csv with the enrichment script's columns"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Rank', 'Player', 'Position', 'School', 'Height', 'Weight', 'School_Logo',
+                         'PFF Grade', 'Analysis'])
+        for rank, prospect in enumerate(prospects(n, seed), 1):
+            height = prospect['height']
+            writer.writerow([
+                rank,
+                prospect['name'],
+                prospect['position'],
+                prospect['team_name'],
+                f"{height // 12}-{height % 12}" if height else '',
+                prospect['weight'] or '',
+                f"http://stub-cdn.local/ncaa/{rank % 97}.svg" if rng.random() > 0.2 else '',
+                f"{rng.uniform(55, 95):.1f}" if rng.random() > 0.3 else '',
+                '',
+            ])
+    return path
+
+
+def stub_project(root: str) -> str:
+    """Create a project dir with a migrated local D1 SQLite file, return the file path"""
+    db_dir = Path(root, LOCAL_STATE, "miniflare-D1DatabaseObject")
+    db_dir.mkdir(parents=True, exist_ok=True)
+    Path(root, "data").mkdir(exist_ok=True)
+    db_path = db_dir / "bench.sqlite"
+    conn = sqlite3.connect(db_path)
+    try:
+        for migration in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            conn.executescript(migration.read_text())
+        conn.commit()
+    finally:
+        conn.close()
+    return str(db_path)
+
+
+class StubCDN:
+    """
+    Localhost logo CDN: HEAD returns 200 for ~80% of paths (stable per path)
+    and 404 for the rest, after `latency` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0, hit_ratio: float = 0.8):
+        self.latency = latency
+        self.hit_ratio = hit_ratio
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _handler(self):
+        cdn = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                with cdn._lock:
+                    cdn.requests += 1
+                if cdn.latency:
+                    time.sleep(cdn.latency)
+                bucket = hashlib.md5(self.path.encode()).digest()[0] / 256
+                self.send_response(200 if bucket < cdn.hit_ratio else 404)
+                self.send_header('Content-Type', 'image/svg+xml')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubCDN":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+PAGE_HEADERS = {'Content-Type': 'text/html; charset=utf-8'}
+# Filler around the stats block, roughly where it sits on a real player page
+PAGE_HEAD = ('<!DOCTYPE html><html><head><title>{name} - Tankathon</title></head><body>'
+             + '<nav><a class="nav-link" href="/nfl/big_board">Big Board</a></nav>' * 400)
+PAGE_STATS = ('<div class="player-info"><img src="{logo}" class="school-logo">'
+              '<div class="label">Height</div><div class="value"><span class="feet">{feet}\'</span>'
+              '<span class="inches">{inches}&quot;</span></div>'
+              '<div class="label">Weight</div><div class="value">{weight}<span class="small">lbs</span></div></div>')
+PAGE_TAIL = '<div class="mock-pick"><span class="team">TBD</span></div>' * 800 + '</body></html>'
+
+
+def player_page(prospect: Dict, logo_url: str) -> bytes:
+    """A Tankathon-shaped player page for a synthetic prospect"""
+    height = prospect['height'] or 74
+    return (PAGE_HEAD.format(name=prospect['name'])
+            + PAGE_STATS.format(logo=logo_url, feet=height // 12, inches=height % 12,
+                                weight=prospect['weight'] or 225)
+            + PAGE_TAIL).encode()
+
+
+def write_fixture_archive(path: str, n: int, seed: int = 2026, hit_ratio: float = 0.9,
+                          latency_ms: float = 150.0) -> str:
+    """
+    Replayable fixtures for n synthetic prospects: ~hit_ratio of them have a
+    Tankathon page (the rest 404, so enrichment falls through to ESPN, which
+    is not recorded), and every school's logo HEAD probe is answered.
+    """
+    rng = random.Random(seed)
+    archive = FixtureArchive(path)
+    try:
+        for prospect in prospects(n, seed):
+            url = tankathon_url(prospect['name'])
+            if rng.random() < hit_ratio:
+                body = player_page(prospect, logo_url_for(prospect['team_name']))
+                archive.put(Fixture('GET', url, 200, PAGE_HEADERS, body, latency_ms))
+            else:
+                archive.put(Fixture('GET', url, 404, PAGE_HEADERS, b'Not Found', latency_ms))
+        for school in SCHOOLS:
+            url = logo_url_for(school)
+            bucket = hashlib.md5(url.encode()).digest()[0] / 256
+            archive.put(Fixture('HEAD', url, 200 if bucket < 0.8 else 404,
+                                {'Content-Type': 'image/svg+xml'}, b'', latency_ms / 5))
+    finally:
+        archive.close()
+    return path
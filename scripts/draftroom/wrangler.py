@@ -0,0 +1,48 @@
+"""
+Thin wrappers around `npx wrangler d1 execute`
+"""
+
+import json
+import subprocess
+import time
+from typing import List, Optional
+
+from draftroom.metrics import RUN
+
+DATABASE = "draftroom-db"
+
+
+def _run(argv: List[str], project_dir: str) -> subprocess.CompletedProcess:
+    start = time.perf_counter()
+    result = subprocess.run(argv, cwd=project_dir, capture_output=True, text=True)
+    RUN.subprocess(argv, time.perf_counter() - start, result.returncode)
+    return result
+
+
+def execute_file(sql_file: str, project_dir: str, remote: bool = False) -> subprocess.CompletedProcess:
+    """Apply a .sql file to the local (or remote) D1 database"""
+    return _run(
+        ['npx', 'wrangler', 'd1', 'execute', DATABASE, '--remote' if remote else '--local',
+         f'--file={sql_file}'],
+        project_dir
+    )
+
+
+def query(command: str, project_dir: str, remote: bool = False) -> Optional[List]:
+    """Run SQL against D1 and return wrangler's JSON results"""
+    verify = _run(
+        ['npx', 'wrangler', 'd1', 'execute', DATABASE, '--remote' if remote else '--local',
+         '--json', f'--command={command}'],
+        project_dir
+    )
+    if verify.returncode != 0:
+        return None
+
+    try:
+        output = verify.stdout
+        json_start = output.find('[')
+        if json_start >= 0:
+            return json.loads(output[json_start:])
+    except ValueError:
+        pass
+    return None
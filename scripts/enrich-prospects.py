@@ -2,209 +2,201 @@
 """
 Prospect Data Enrichment Script
 Fetches missing height/weight data for 2026 NFL Draft prospects
+
+Players are enriched on a worker pool; each source (Tankathon, ESPN) has its
+own requests-per-second budget so the whole CSV can be processed without
+hammering either site.
 """
 
+import argparse
 import csv
-import json
-import time
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict
-import urllib.request
-import urllib.parse
-from urllib.error import URLError, HTTPError
+
+from draftroom.httpcache import PageCache
+from draftroom import fixtures, metrics
+from draftroom.journal import ProgressJournal
+from draftroom.metrics import RUN
+from draftroom.ratelimit import HostLimiter
+from draftroom.scrapers import search_espn, search_tankathon
 
 # Configuration
 INPUT_CSV = "/Users/max/.clawdbot/media/inbound/6e562302-1f43-45a6-a43a-854c466e9546.csv"
 OUTPUT_CSV = "/Users/max/projects/draftroom/data/prospects-enriched.csv"
-PROGRESS_FILE = "/Users/max/projects/draftroom/data/enrichment-progress.json"
-RATE_LIMIT_DELAY = 2  # seconds between requests
-
-# Create data directory
-Path(OUTPUT_CSV).parent.mkdir(parents=True, exist_ok=True)
-
-def load_progress() -> Dict:
-    """Load progress from previous run"""
-    if Path(PROGRESS_FILE).exists():
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
-    return {"completed": [], "data": {}}
-
-def save_progress(progress: Dict):
-    """Save progress for resume capability"""
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
-
-def clean_name_for_url(name: str) -> str:
-    """Clean player name for URL search"""
-    # Convert suffixes to lowercase and remove periods
-    name = re.sub(r'\s+Jr\.?$', ' Jr', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s+Sr\.?$', ' Sr', name, flags=re.IGNORECASE)
-    return name.strip()
-
-def search_tankathon(name: str, position: str) -> Optional[Dict]:
-    """Search Tankathon for player data"""
-    try:
-        # Create URL-friendly name
-        clean = clean_name_for_url(name)
-        slug = clean.lower().replace(' ', '-').replace("'", "")
-        
-        url = f"https://www.tankathon.com/nfl/players/{slug}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            html = response.read().decode('utf-8')
-            
-            # Extract height: <span class="feet">6'</span><span class="inches">5&quot;</span>
-            feet_match = re.search(r'<span class="feet">(\d+)\'</span>', html)
-            inches_match = re.search(r'<span class="inches">(\d+)&quot;</span>', html)
-            
-            # Extract weight: <div class="value">225<span class="small">lbs</span>
-            weight_match = re.search(r'<div class="label">Weight</div><div class="value">(\d+)<span class="small">lbs</span>', html)
-            
-            # Extract school logo: src="http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg"
-            logo_match = re.search(r'src="(http://d2uki2uvp6v3wr\.cloudfront\.net/ncaa/[^"]+\.svg)"', html)
-            
-            if feet_match and inches_match and weight_match:
-                feet = feet_match.group(1)
-                inches = inches_match.group(1)
-                height = f"{feet}-{inches}"
-                weight = weight_match.group(1)
-                logo = logo_match.group(1) if logo_match else ""
-                
-                return {
-                    "height": height,
-                    "weight": weight,
-                    "logo": logo,
-                    "source": "tankathon"
-                }
-    
-    except (HTTPError, URLError, TimeoutError):
-        pass
-    
-    return None
+PROGRESS_FILE = "/Users/max/projects/draftroom/data/enrichment-progress.json"  # snapshot; journal is .jsonl
+HTTP_CACHE_DIR = "/Users/max/projects/draftroom/data/http-cache"
+WORKERS = 4
+SOURCE_RPS = {  # requests-per-second ceiling per source
+    "tankathon": 0.5,
+    "espn": 0.5,
+}
 
-def search_espn(name: str, school: str, position: str) -> Optional[Dict]:
-    """Search ESPN for player data (fallback)"""
-    try:
-        # ESPN search endpoint
-        clean = clean_name_for_url(name)
-        query = urllib.parse.quote(f"{clean} {school} {position} 2026")
-        
-        url = f"https://www.espn.com/nfl/draft2026/player/_/{query}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            html = response.read().decode('utf-8')
-            
-            # Extract height/weight from ESPN format
-            height_match = re.search(r'(\d+)-(\d+)\s*HT', html)
-            weight_match = re.search(r'(\d+)\s*WT', html)
-            
-            if height_match and weight_match:
-                height = f"{height_match.group(1)}-{height_match.group(2)}"
-                weight = weight_match.group(1)
-                return {"height": height, "weight": weight, "logo": "", "source": "espn"}
-    
-    except (HTTPError, URLError, TimeoutError):
-        pass
-    
-    return None
+# Set in main(); None means fetch straight from the network
+PAGE_CACHE: Optional[PageCache] = None
 
-def enrich_player(name: str, position: str, school: str) -> Dict:
+def enrich_player(name: str, position: str, school: str, limiter: HostLimiter) -> Dict:
     """Try multiple sources to enrich player data"""
     
     # Try Tankathon first (most reliable for draft prospects)
-    data = search_tankathon(name, position)
+    limiter.acquire("tankathon")
+    with RUN.stage("tankathon"):
+        data = search_tankathon(name, position, PAGE_CACHE)
     if data:
         return data
     
-    time.sleep(1)  # Brief delay before trying next source
-    
-    # Try ESPN as fallback
-    data = search_espn(name, school, position)
+    # Try ESPN as fallback (paced by its own budget)
+    limiter.acquire("espn")
+    with RUN.stage("espn"):
+        data = search_espn(name, school, position, PAGE_CACHE)
     if data:
         return data
     
     return {"height": "", "weight": "", "logo": "", "source": "not_found"}
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enrich prospects CSV with height/weight/logo")
+    parser.add_argument("--input", default=INPUT_CSV, help="prospects CSV to enrich")
+    parser.add_argument("--output", default=OUTPUT_CSV, help="enriched CSV to write")
+    parser.add_argument("--progress", default=PROGRESS_FILE,
+                        help="progress snapshot (its .jsonl journal sits alongside)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent players in flight")
+    parser.add_argument("--tankathon-rps", type=float, default=SOURCE_RPS["tankathon"],
+                        help="max Tankathon requests per second")
+    parser.add_argument("--espn-rps", type=float, default=SOURCE_RPS["espn"],
+                        help="max ESPN requests per second")
+    parser.add_argument("--limit", type=int, default=None, help="only enrich the first N rows")
+    parser.add_argument("--cache-only", action="store_true",
+                        help="serve pages from the local HTTP cache only (no network)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the local HTTP cache")
+    parser.add_argument("--compact", action="store_true",
+                        help="fold the progress journal into the snapshot and exit")
+    fixtures.add_arguments(parser)
+    metrics.add_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    global PAGE_CACHE
+    args = parse_args()
+    metrics.start(args, "enrich-prospects")
+    transport = fixtures.start(args)
+    replaying = transport.mode == 'replay'
+    journal = ProgressJournal(args.progress)
+    if args.compact:
+        print(f"🗜  Compacted {journal.compact()} records into {args.progress}")
+        return
+    
     print("🏈 NFL Draft Prospect Data Enrichment")
     print("=" * 50)
     
-    # Load progress
-    progress = load_progress()
-    completed = set(progress.get("completed", []))
-    enriched_data = progress.get("data", {})
+    # Load progress (snapshot + journal replay)
+    with RUN.stage("read_input"):
+        enriched_data = journal.load()
+        completed = set(enriched_data)
+        
+        # Read input CSV
+        with open(args.input, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
     
-    # Read input CSV
-    with open(INPUT_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    if args.limit:
+        rows = rows[:args.limit]
     
-    # Limit to top 100 for now
-    rows = rows[:100]
+    # Create data directory
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
     
+    pending = [row for row in rows if row['Rank'] not in completed]
     total = len(rows)
     print(f"Total prospects: {total}")
-    print(f"Previously completed: {len(completed)}")
-    print(f"Remaining: {total - len(completed)}\n")
+    print(f"Previously completed: {total - len(pending)}")
+    print(f"Remaining: {len(pending)}")
+    print(f"Workers: {args.workers} (tankathon {args.tankathon_rps}/s, espn {args.espn_rps}/s)\n")
+    
+    # Replayed pages never go into the real page cache
+    if not args.no_cache and not replaying:
+        PAGE_CACHE = PageCache(HTTP_CACHE_DIR, offline=args.cache_only)
+    if args.cache_only or replaying:
+        # Nothing leaves the machine, so there is nothing to pace
+        limiter = HostLimiter(1e9, burst=args.workers)
+    else:
+        limiter = HostLimiter(args.tankathon_rps, overrides={"espn": args.espn_rps})
+    
+    # Process players concurrently; the journal is only written from this thread
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    futures = {
+        pool.submit(enrich_player, row['Player'], row['Position'], row['School'], limiter): row
+        for row in pending
+    }
+    try:
+        with RUN.stage("enrich"), metrics.profiled(args.profile):
+            enrich_loop(futures, pending, enriched_data, completed, journal)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        journal.close()
+        metrics.finish()
+        raise
+    pool.shutdown()
+    
+    # Fold this run's journal into the snapshot
+    with RUN.stage("compact"):
+        journal.compact()
+    
+    # Write enriched CSV
+    print("\n📝 Writing enriched CSV...")
+    with RUN.stage("write_csv"):
+        write_output(args.output, rows, enriched_data)
+    
+    # Summary
+    found = sum(1 for d in enriched_data.values() if d.get('height'))
+    print(f"\n✅ Complete!")
+    print(f"Found data for: {found}/{total} ({found/total*100:.1f}%)")
+    print(f"Output: {args.output}")
+    
+    # Stats by source
+    sources = {}
+    for d in enriched_data.values():
+        source = d.get('source', 'unknown')
+        sources[source] = sources.get(source, 0) + 1
+        RUN.count(f"enrich.source.{source}")
+    
+    print("\n📊 Sources:")
+    for source, count in sources.items():
+        print(f"  {source}: {count}")
     
-    # Process each player
-    for i, row in enumerate(rows, 1):
+    if PAGE_CACHE is not None:
+        stats = PAGE_CACHE.stats
+        print(f"\n🗄  HTTP cache: {stats['fresh']} fetched ({stats['bytes_fetched'] / 1024:.0f} KB), "
+              f"{stats['revalidated']} not modified, {stats['offline_hits']} served offline")
+    if transport.mode != 'live':
+        stats = transport.stats
+        print(f"🎞  Fixtures: {stats['recorded']} recorded, {stats['replayed']} replayed, "
+              f"{stats['missed']} not in archive")
+    metrics.finish()
+
+def enrich_loop(futures, pending, enriched_data: Dict, completed: set, journal: ProgressJournal):
+    """Collect results as workers finish; the journal is only written from this thread"""
+    for done, future in enumerate(as_completed(futures), 1):
+        row = futures[future]
         rank = row['Rank']
-        name = row['Player']
-        position = row['Position']
-        school = row['School']
-        
-        # Skip if already processed
-        if rank in completed:
-            continue
-        
-        print(f"[{i}/{total}] {name} ({position}, {school})...", end=' ')
-        sys.stdout.flush()
-        
-        # Enrich data
-        data = enrich_player(name, position, school)
+        data = future.result()
         
         enriched_data[rank] = {
-            "name": name,
+            "name": row['Player'],
             "height": data.get("height", ""),
             "weight": data.get("weight", ""),
             "logo": data.get("logo", ""),
             "source": data["source"]
         }
-        
         completed.add(rank)
-        
-        # Save progress every 10 players
-        if i % 10 == 0:
-            save_progress({"completed": list(completed), "data": enriched_data})
+        journal.append(rank, enriched_data[rank])
         
         status = "✓" if data["height"] else "✗"
-        print(f"{status} ({data['source']})")
-        
-        # Rate limiting
-        time.sleep(RATE_LIMIT_DELAY)
-    
-    # Final save
-    save_progress({"completed": list(completed), "data": enriched_data})
-    
-    # Write enriched CSV
-    print("\n📝 Writing enriched CSV...")
-    
-    with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
+        print(f"[{done}/{len(pending)}] #{rank} {row['Player']} ({row['Position']}, {row['School']}) "
+              f"{status} ({data['source']})")
+
+def write_output(path: str, rows, enriched_data: Dict):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
         fieldnames = ['Rank', 'Player', 'Position', 'School', 'Height', 'Weight', 'School_Logo', 'PFF Grade', 'Analysis']
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
@@ -224,22 +216,6 @@ def main():
                 'PFF Grade': row['PFF Grade'],
                 'Analysis': row['Analysis']
             })
-    
-    # Summary
-    found = sum(1 for d in enriched_data.values() if d.get('height'))
-    print(f"\n✅ Complete!")
-    print(f"Found data for: {found}/{total} ({found/total*100:.1f}%)")
-    print(f"Output: {OUTPUT_CSV}")
-    
-    # Stats by source
-    sources = {}
-    for d in enriched_data.values():
-        source = d.get('source', 'unknown')
-        sources[source] = sources.get(source, 0) + 1
-    
-    print("\n📊 Sources:")
-    for source, count in sources.items():
-        print(f"  {source}: {count}")
 
 if __name__ == "__main__":
     try:
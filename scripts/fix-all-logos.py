@@ -1,136 +1,82 @@
 #!/usr/bin/env python3
 """
 Fix all school logos using ESPN's reliable CDN
-Maps school names to ESPN team IDs
+School names and their ESPN team IDs come from data/schools.json
+
+The mapping and the clearing of Tankathon logos on unmapped schools are one
+UPDATE over a VALUES CTE of the mapping. Mapped schools are sought through
+idx_players_school (migrations/0007). A single pass over players clears the
+Tankathon logos left on schools the mapping doesn't cover. Only rows whose
+logo changes are rewritten.
 """
 
-import subprocess
+import argparse
+
+from draftroom import d1, metrics, schools
+from draftroom.metrics import RUN
+from draftroom.sqlutil import sql_value
+
+PROJECT_DIR = "/Users/max/projects/draftroom"
+TANKATHON_LOGOS = "%d2uki2uvp6v3wr%"
 
-# ESPN team ID mapping for major schools
-ESPN_TEAM_IDS = {
-    'Alabama': 333,
-    'Arizona': 12,
-    'Arizona State': 9,
-    'Arkansas': 8,
-    'Auburn': 2,
-    'Baylor': 239,
-    'Boise State': 68,
-    'Boston College': 103,
-    'BYU': 252,
-    'Buffalo': 2084,
-    'California': 25,
-    'Cincinnati': 2132,
-    'Clemson': 228,
-    'Colorado': 38,
-    'Duke': 150,
-    'East Carolina': 151,
-    'Florida': 57,
-    'Florida State': 52,
-    'Georgia': 61,
-    'Georgia State': 2247,
-    'Georgia Tech': 59,
-    'Houston': 248,
-    'Illinois': 356,
-    'Indiana': 84,
-    'Iowa': 2294,
-    'Iowa State': 66,
-    'Kansas': 2305,
-    'Kansas State': 2306,
-    'Kentucky': 96,
-    'LSU': 99,
-    'Louisville': 97,
-    'Maryland': 120,
-    'Miami (FL)': 2390,
-    'Michigan': 130,
-    'Michigan State': 127,
-    'Minnesota': 135,
-    'Mississippi State': 344,
-    'Missouri': 142,
-    'Nebraska': 158,
-    'Nevada': 2440,
-    'North Carolina': 153,
-    'North Carolina State': 152,
-    'Notre Dame': 87,
-    'Ohio State': 194,
-    'Oklahoma': 201,
-    'Oklahoma State': 197,
-    'Ole Miss': 145,
-    'Oregon': 2483,
-    'Oregon State': 204,
-    'Penn State': 213,
-    'Pittsburgh': 221,
-    'Purdue': 2509,
-    'Rutgers': 164,
-    'SMU': 2567,
-    'South Carolina': 2579,
-    'Stanford': 24,
-    'Syracuse': 183,
-    'TCU': 2628,
-    'Tennessee': 2633,
-    'Texas': 251,
-    'Texas A&M': 245,
-    'Texas Tech': 2641,
-    'UCF': 2116,
-    'UCLA': 26,
-    'UMass': 113,
-    'USC': 30,
-    'UTSA': 2636,
-    'Utah': 254,
-    'Vanderbilt': 238,
-    'Virginia': 258,
-    'Virginia Tech': 259,
-    'Wake Forest': 154,
-    'Washington': 264,
-    'Washington State': 265,
-    'West Virginia': 277,
-    'Wisconsin': 275,
-}
+def logo_fix_sql(mapping) -> str:
+    """
+    Single UPDATE ... FROM over a VALUES CTE of (school, logo) pairs: mapped
+    schools get their logo, and unmapped schools lose any logo LIKE the one
+    bound parameter. Unchanged rows are skipped.
+    """
+    values = ', '.join(f"({sql_value(school)}, {sql_value(logo)})" for school, logo in mapping)
+    return (f"WITH logos(school, logo) AS (VALUES {values}), "
+            f"fixes(id, logo) AS ("
+            f"SELECT players.id, logos.logo FROM logos JOIN players ON players.school = logos.school "
+            f"WHERE players.school_logo IS NOT logos.logo "
+            f"UNION ALL "
+            f"SELECT id, NULL FROM players WHERE school_logo LIKE ? AND school NOT IN (SELECT school FROM logos)) "
+            f"UPDATE players SET school_logo = fixes.logo FROM fixes WHERE players.id = fixes.id")
 
 def main():
+    parser = argparse.ArgumentParser(description="Point school logos at ESPN's CDN")
+    parser.add_argument("--remote", action="store_true",
+                        help="apply to production via wrangler instead of the local SQLite file")
+    parser.add_argument("--db", default=None, help="explicit path to the local D1 SQLite file")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args, "fix-all-logos")
+    try:
+        return fix_logos(args)
+    finally:
+        metrics.finish()
+
+def fix_logos(args) -> int:
     print("🏈 Fixing School Logos with ESPN CDN")
     print("=" * 60)
     
-    sql_statements = []
-    fixed_count = 0
-    
-    for school, team_id in ESPN_TEAM_IDS.items():
-        logo_url = f"https://a.espncdn.com/i/teamlogos/ncaa/500/{team_id}.png"
-        escaped_school = school.replace("'", "''")
-        sql_statements.append(
-            f"UPDATE players SET school_logo='{logo_url}' WHERE school='{escaped_school}';")
-        fixed_count += 1
-    
-    # Clear broken Tankathon logos
-    sql_statements.insert(0, "UPDATE players SET school_logo=NULL WHERE school_logo LIKE '%d2uki2uvp6v3wr%';")
+    # Set ESPN logos for every known spelling and clear the broken Tankathon
+    # logos on schools the mapping doesn't cover, in one pass
+    index = schools.load()
+    batches = [
+        (logo_fix_sql((spelling, school.logo_url) for spelling, school in index.spelled()), [(TANKATHON_LOGOS,)]),
+    ]
+    print(f"✓ Prepared updates for {len(index)} schools")
     
-    # Write SQL file
-    sql_file = "/Users/max/projects/draftroom/data/fix-all-logos.sql"
-    with open(sql_file, 'w') as f:
-        for stmt in sql_statements:
-            f.write(stmt + '\n')
-    
-    print(f"✓ Prepared updates for {fixed_count} schools")
-    print(f"✓ Wrote SQL to {sql_file}")
-    
-    # Execute locally first
-    print("\n🚀 Updating local database...")
-    result = subprocess.run(
-        ['npx', 'wrangler', 'd1', 'execute', 'draftroom-db', '--local', f'--file={sql_file}'],
-        cwd='/Users/max/projects/draftroom',
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print("✅ Local update successful!")
-        print("\n💡 To deploy to production, run:")
-        print("  cd /Users/max/projects/draftroom")
-        print(f"  npx wrangler d1 execute draftroom-db --remote --file=data/fix-all-logos.sql")
-    else:
+    target = "production" if args.remote else "local database"
+    print(f"\n🚀 Updating {target}...")
+    try:
+        with RUN.stage("apply"), metrics.profiled(args.profile):
+            result = d1.apply(batches, PROJECT_DIR, remote=args.remote,
+                              sql_file=f"{PROJECT_DIR}/data/fix-all-logos.sql", db_path=args.db)
+    except (RuntimeError, FileNotFoundError) as e:
         print("❌ Update failed!")
-        print(result.stderr)
+        print(e)
         return 1
     
+    print("✅ Update successful!")
+    if args.remote:
+        print(f"✓ Applied {result['statements']} statements")
+    else:
+        print(f"✓ {result['rows_changed']} player rows updated")
+        print("\n💡 To deploy to production, rerun with --remote")
+    
     return 0
 
 if __name__ == "__main__":
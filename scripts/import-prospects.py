@@ -4,150 +4,116 @@ Import enriched prospects CSV into DraftRoom database
 Clears existing data and imports fresh 2026 prospects
 """
 
+import argparse
 import csv
-import re
-import subprocess
-import json
+
+from draftroom import d1, metrics
+from draftroom.metrics import RUN
+from draftroom.pipeline import CLEAR_STATEMENTS, fingerprint
+from draftroom.slugs import SlugIndex, load_slugs
+from draftroom.sqlutil import generate_slug
 
 INPUT_CSV = "/Users/max/projects/draftroom/data/prospects-enriched.csv"
+PROJECT_DIR = "/Users/max/projects/draftroom"
 
-def generate_slug(name: str) -> str:
-    """Generate URL-friendly slug from player name"""
-    # Convert to lowercase
-    slug = name.lower()
-    # Remove punctuation except hyphens and apostrophes
-    slug = re.sub(r'[^\w\s\'-]', '', slug)
-    # Replace spaces with hyphens
-    slug = slug.replace(' ', '-')
-    # Remove apostrophes
-    slug = slug.replace("'", '')
-    return slug
+COLUMNS = ('name', 'slug', 'position', 'school', 'height', 'weight', 'rank', 'pff_grade', 'scout_grade', 'school_logo',
+           'content_hash')
 
 def main():
+    parser = argparse.ArgumentParser(description="Import enriched prospects CSV")
+    parser.add_argument("--remote", action="store_true",
+                        help="apply to production via wrangler instead of the local SQLite file")
+    parser.add_argument("--db", default=None, help="explicit path to the local D1 SQLite file")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args, "import-prospects")
+    try:
+        return import_prospects(args)
+    finally:
+        metrics.finish()
+
+def import_prospects(args) -> int:
     print("🏈 Importing 2026 NFL Draft Prospects")
     print("=" * 50)
     
     # Read CSV
-    with open(INPUT_CSV, 'r', encoding='utf-8') as f:
+    with RUN.stage("read_csv"), open(INPUT_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         prospects = list(reader)
     
     print(f"📊 Found {len(prospects)} prospects in CSV")
     
-    # Build SQL statements
-    sql_statements = []
-    
     # Clear existing data (in correct order to respect foreign keys)
-    sql_statements.append("PRAGMA foreign_keys = OFF;")
-    sql_statements.append("DELETE FROM votes;")
-    sql_statements.append("DELETE FROM community_reports;")
-    sql_statements.append("DELETE FROM expert_reports;")
-    sql_statements.append("DELETE FROM players;")
-    sql_statements.append("PRAGMA foreign_keys = ON;")
+    batches = [(stmt, [()]) for stmt in CLEAR_STATEMENTS]
     print("✓ Will clear existing players and related data")
     
-    # Insert new prospects
+    # Insert new prospects, keeping the first row per prospect (name slug + school)
+    unique = {}
     for row in prospects:
+        unique.setdefault((generate_slug(row['Player']), row['School']), row)
+    try:
+        existing = load_slugs(PROJECT_DIR, args.remote, args.db)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"❌ Could not read current slugs: {e}")
+        return 1
+    slugs = SlugIndex(((row['Player'], row['School'], row['Position']) for row in unique.values()),
+                      existing=existing)
+    records = []
+    for row in unique.values():
         name = row['Player']
-        slug = generate_slug(name)
-        position = row['Position']
-        school = row['School']
-        height = row['Height'] or None
-        weight = row['Weight'] or None
-        rank = int(row['Rank'])
         
         # Handle PFF Grade - convert to numeric or None
         pff_grade = row['PFF Grade'].strip()
-        if pff_grade:
-            try:
-                pff_grade = float(pff_grade)
-            except ValueError:
-                pff_grade = None
-        else:
+        try:
+            pff_grade = float(pff_grade) if pff_grade else None
+        except ValueError:
             pff_grade = None
         
-        # Projected round - try to extract number
-        projected_round = None  # We don't have this in CSV
-        
-        # School logo URL
-        school_logo = row['School_Logo'] or None
-        
-        # Build INSERT statement
-        height_val = f"'{height}'" if height else 'NULL'
-        weight_val = f"'{weight}'" if weight else 'NULL'
-        pff_val = str(pff_grade) if pff_grade else 'NULL'
-        logo_val = f"'{school_logo}'" if school_logo else 'NULL'
-        
-        sql_statements.append(
-            f"INSERT INTO players (name, slug, position, school, height, weight, rank, pff_grade, scout_grade, school_logo) "
-            f"VALUES ("
-            f"'{name.replace(chr(39), chr(39)+chr(39))}', "  # Escape single quotes
-            f"'{slug}', "
-            f"'{position}', "
-            f"'{school.replace(chr(39), chr(39)+chr(39))}', "
-            f"{height_val}, "
-            f"{weight_val}, "
-            f"{rank}, "
-            f"{pff_val}, "
-            f"NULL, "  # scout_grade - will be added manually
-            f"{logo_val}"
-            f");"
-        )
-    
-    print(f"✓ Prepared {len(prospects)} INSERT statements")
+        records.append({
+            'name': name,
+            'slug': slugs.assign(name, row['School'], row['Position']),
+            'position': row['Position'],
+            'school': row['School'],
+            'height': row['Height'] or None,
+            'weight': row['Weight'] or None,
+            'rank': int(row['Rank']),
+            'pff_grade': pff_grade,
+            'scout_grade': None,  # will be added manually
+            'school_logo': row['School_Logo'] or None,
+        })
+    # Same fingerprint as the JSON pipeline, so a later --delta run sees these rows as unchanged
+    rows = [tuple(r[c] for c in COLUMNS) for r in fingerprint(records)]
+    batches.extend(d1.upsert_batches('players', COLUMNS, 'slug', rows))
     
-    # Write to temp SQL file
-    sql_file = "/Users/max/projects/draftroom/data/import-prospects.sql"
-    with open(sql_file, 'w') as f:
-        for stmt in sql_statements:
-            f.write(stmt + '\n')
+    print(f"✓ Prepared {len(rows)} rows in {len(batches) - len(CLEAR_STATEMENTS)} INSERT batches")
+    if len(rows) < len(prospects):
+        print(f"✓ Skipped {len(prospects) - len(rows)} duplicate rows")
+    slugs.summary()
     
-    print(f"✓ Wrote SQL to {sql_file}")
-    
-    # Execute via wrangler
-    print("\n🚀 Executing import...")
-    result = subprocess.run(
-        ['npx', 'wrangler', 'd1', 'execute', 'draftroom-db', '--local', f'--file={sql_file}'],
-        cwd='/Users/max/projects/draftroom',
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print("✅ Import successful!")
-        
-        # Verify count
-        verify = subprocess.run(
-            ['npx', 'wrangler', 'd1', 'execute', 'draftroom-db', '--local', '--command=SELECT COUNT(*) as count FROM players;'],
-            cwd='/Users/max/projects/draftroom',
-            capture_output=True,
-            text=True
-        )
-        
-        if verify.returncode == 0:
-            # Parse JSON output
-            try:
-                output = verify.stdout
-                # Find the JSON array in output
-                json_start = output.find('[')
-                if json_start >= 0:
-                    json_data = json.loads(output[json_start:])
-                    count = json_data[0]['results'][0]['count']
-                    print(f"✓ Verified: {count} players in database")
-            except:
-                print("✓ Import complete (verification skipped)")
-        
-        print("\n📝 Summary:")
-        print(f"  - Imported: {len(prospects)} prospects")
-        print(f"  - With height/weight: {sum(1 for p in prospects if p['Height'] and p['Weight'])}")
-        print(f"  - With PFF grades: {sum(1 for p in prospects if p['PFF Grade'])}")
-        print(f"  - Scout grades: 0 (to be added manually)")
-        
-    else:
+    # Apply (local SQLite directly, or production via wrangler)
+    target = "production" if args.remote else "local database"
+    print(f"\n🚀 Importing to {target}...")
+    try:
+        with RUN.stage("apply"), metrics.profiled(args.profile):
+            result = d1.apply(batches, PROJECT_DIR, remote=args.remote,
+                              sql_file=f"{PROJECT_DIR}/data/import-prospects.sql", db_path=args.db)
+    except (RuntimeError, FileNotFoundError) as e:
         print("❌ Import failed!")
-        print(result.stderr)
+        print(e)
         return 1
     
+    print(f"✅ Import successful! ({result['statements']} statements)")
+    if not args.remote:
+        db = d1.LocalD1.open(PROJECT_DIR, args.db)
+        print(f"✓ Verified: {db.count('players')} players in database")
+        db.close()
+    
+    print("\n📝 Summary:")
+    print(f"  - Imported: {len(rows)} prospects")
+    print(f"  - With height/weight: {sum(1 for p in prospects if p['Height'] and p['Weight'])}")
+    print(f"  - With PFF grades: {sum(1 for p in prospects if p['PFF Grade'])}")
+    print(f"  - Scout grades: 0 (to be added manually)")
+    
     return 0
 
 if __name__ == "__main__":
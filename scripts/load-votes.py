@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Load-test the vote endpoints against a running worker (`npm run worker:dev`)
+Fires concurrent POST /api/player-vote and /api/vote requests from synthetic
+client IPs and reports p50/p95/p99 latency per endpoint. Save a run on the
+old worker with --save-baseline, rerun on the new one to compare.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+
+RESULTS_DIR = Path(__file__).resolve().parents[1] / "data" / "bench"
+API_URL = "http://localhost:8787"
+ENDPOINTS = ['player-vote', 'vote']
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+def client_ip(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def post(url: str, body: Dict, ip: str) -> Tuple[float, int]:
+    """(milliseconds, HTTP status) for one request"""
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST', headers={
+        'Content-Type': 'application/json', 'CF-Connecting-IP': ip, 'X-Forwarded-For': ip,
+    })
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except HTTPError as e:
+        status = e.code
+    except (URLError, ConnectionError, TimeoutError):
+        status = 0  # no response; counted as non-2xx
+    return (time.perf_counter() - start) * 1000, status
+
+
+def get_json(url: str):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.load(response)
+
+
+def targets(api_url: str, n_players: int) -> Tuple[List[int], List[int]]:
+    """Player ids and community report ids to vote on"""
+    players = get_json(f"{api_url}/api/players")[:n_players]
+    reports = []
+    for player in players:
+        detail = get_json(f"{api_url}/api/players/{player['slug']}")
+        reports.extend(r['id'] for r in detail.get('communityReports') or [])
+    return [p['id'] for p in players], reports
+
+
+def quantile(sorted_ms: List[float], q: float) -> Optional[float]:
+    if not sorted_ms:
+        return None
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))], 2)
+
+
+def run_endpoint(api_url: str, endpoint: str, ids: List[int], requests: int, concurrency: int,
+                 ip_pool: int, seed: int) -> Dict:
+    """
+    Fire `requests` votes at one endpoint. Player votes cycle through
+    `ip_pool` client IPs so toggles both add and remove; report votes use a
+    fresh IP per request so none are rejected as repeats.
+    """
+    rng = random.Random(seed)
+    if endpoint == 'player-vote':
+        jobs = [({'player_id': rng.choice(ids)}, client_ip(i % ip_pool)) for i in range(requests)]
+    else:
+        jobs = [({'report_id': rng.choice(ids), 'vote_type': rng.choice(['up', 'down'])},
+                 client_ip(ip_pool + i)) for i in range(requests)]
+
+    url = f"{api_url}/api/{endpoint}"
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda job: post(url, *job), jobs))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, _ in results)
+    statuses: Dict[str, int] = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    summary = {f"p{round(q * 100)}_ms": quantile(latencies, q) for q in QUANTILES}
+    summary.update({
+        'requests': requests,
+        'concurrency': concurrency,
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'max_ms': round(latencies[-1], 2),
+        'req_per_sec': round(requests / wall, 1),
+        'statuses': statuses,
+    })
+    return summary
+
+
+def print_result(endpoint: str, r: Dict):
+    errors = sum(n for status, n in r['statuses'].items() if not status.startswith('2'))
+    print(f"  {endpoint:<12} p50 {r['p50_ms']:>7.1f} ms  p95 {r['p95_ms']:>7.1f} ms  "
+          f"p99 {r['p99_ms']:>7.1f} ms  {r['req_per_sec']:>7.1f} req/s  {errors} non-2xx")
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> int:
+    """Print p50/p99 deltas against the baseline, return the number of regressions"""
+    regressions = 0
+    print(f"\n📊 Against baseline ({baseline.get('created', '?')}):")
+    for endpoint, r in results.items():
+        before = baseline.get('results', {}).get(endpoint)
+        if not before:
+            continue
+        for key in ('p50_ms', 'p99_ms'):
+            change = (r[key] - before[key]) / before[key] if before[key] else 0.0
+            flag = "  ⚠️" if change > threshold else ""
+            regressions += change > threshold
+            print(f"  {endpoint:<12} {key[:3]} {before[key]:>7.1f} -> {r[key]:>7.1f} ms "
+                  f"({change:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vote endpoint latency under concurrent load")
+    parser.add_argument("--url", default=API_URL, help="worker base URL")
+    parser.add_argument("--endpoints", nargs='+', choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--players", type=int, default=10, help="vote on the top N players")
+    parser.add_argument("--ip-pool", type=int, default=200, help="client IPs for player votes")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--out", default=str(RESULTS_DIR / "votes.json"))
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "votes-baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="fractional p50/p99 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    print(f"🗳  Vote load test against {args.url}")
+    print("=" * 60)
+    try:
+        players, reports = targets(args.url, args.players)
+    except (URLError, ValueError) as e:
+        print(f"❌ Could not read the board from {args.url} ({e}); is `npm run worker:dev` running?")
+        return 1
+
+    results = {}
+    for endpoint in args.endpoints:
+        ids = players if endpoint == 'player-vote' else reports
+        if not ids:
+            print(f"  {endpoint:<12} skipped (no {'players' if endpoint == 'player-vote' else 'community reports'})")
+            continue
+        results[endpoint] = run_endpoint(args.url, endpoint, ids, args.requests, args.concurrency,
+                                         args.ip_pool, args.seed)
+        print_result(endpoint, results[endpoint])
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'url': args.url,
+        'results': results,
+    }
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.out}")
+
+    regressions = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved as baseline {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} regression(s) beyond {args.threshold:.0%}")
+    else:
+        print("💡 No baseline yet; rerun with --save-baseline to record one")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Recompute players.community_score from player_votes and fix any drift
+The worker keeps the column up to date on every vote (migrations/0008);
+run this after bulk vote changes or restores, or on a schedule
+"""
+
+import argparse
+
+from draftroom import d1, metrics, wrangler
+from draftroom.metrics import RUN
+
+PROJECT_DIR = "/Users/max/projects/draftroom"
+
+VOTE_COUNT = "(SELECT COUNT(*) FROM player_votes pv WHERE pv.player_id = players.id)"
+DRIFT_SQL = (f"SELECT id, name, community_score, {VOTE_COUNT} AS votes FROM players "
+             f"WHERE community_score IS NOT {VOTE_COUNT} ORDER BY rank")
+# One pass over players; each count is a seek on idx_player_votes_player_id
+RECONCILE_SQL = (f"UPDATE players SET community_score = {VOTE_COUNT} "
+                 f"WHERE community_score IS NOT {VOTE_COUNT}")
+
+
+def find_drift(project_dir: str, remote: bool, db_path=None):
+    """[{id, name, community_score, votes}] for every player whose stored score is wrong"""
+    if not remote:
+        db = d1.LocalD1.open(project_dir, db_path)
+        try:
+            cursor = db.conn.execute(DRIFT_SQL)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+        finally:
+            db.close()
+    results = wrangler.query(DRIFT_SQL, project_dir, remote=True)
+    if results is None:
+        raise RuntimeError("could not read community scores from remote D1")
+    return results[0]['results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile players.community_score with player_votes")
+    parser.add_argument("--project-dir", default=PROJECT_DIR)
+    parser.add_argument("--remote", action="store_true",
+                        help="apply to production via wrangler instead of the local SQLite file")
+    parser.add_argument("--db", default=None, help="explicit path to the local D1 SQLite file")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args, "reconcile-community-scores")
+    try:
+        return reconcile(args)
+    finally:
+        metrics.finish()
+
+
+def reconcile(args) -> int:
+    print("🗳  Reconciling community scores")
+    print("=" * 50)
+
+    try:
+        with RUN.stage("drift"):
+            drift = find_drift(args.project_dir, args.remote, args.db)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+    RUN.count('reconcile.drifted_players', len(drift))
+
+    if not drift:
+        print("✅ Every community_score matches player_votes")
+        return 0
+    print(f"⚠️  {len(drift)} players drifted:")
+    for row in drift[:10]:
+        print(f"  {row['name']}: stored {row['community_score']}, actual {row['votes']}")
+    if len(drift) > 10:
+        print(f"  ... and {len(drift) - 10} more")
+    if args.dry_run:
+        return 0
+
+    try:
+        with RUN.stage("apply"), metrics.profiled(args.profile):
+            result = d1.apply([(RECONCILE_SQL, [()])], args.project_dir, remote=args.remote,
+                              sql_file=f"{args.project_dir}/data/reconcile-community-scores.sql",
+                              db_path=args.db)
+    except (RuntimeError, FileNotFoundError) as e:
+        print("❌ Reconcile failed!")
+        print(e)
+        return 1
+
+    if args.remote:
+        print("✅ Reconciled production")
+    else:
+        print(f"✅ Fixed {result['rows_changed']} players")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,70 +1,46 @@
 #!/usr/bin/env python3
-"""Test the enrichment script on top 5 players"""
+"""Test the enrichment script on top 5 players
 
-import sys
-import re
-import urllib.request
+Replays data/fixtures/tankathon-top5.sqlite when it exists, so results are
+the same on every run and no network is needed. No archive is shipped:
+record one from the live site with `--fixture-mode record`; until then the
+script scrapes live.
+"""
+
+import argparse
+from pathlib import Path
 from urllib.error import URLError, HTTPError
 
-def clean_name_for_url(name: str) -> str:
-    # Convert suffixes to lowercase and remove periods
-    name = re.sub(r'\s+Jr\.?$', ' Jr', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s+Sr\.?$', ' Sr', name, flags=re.IGNORECASE)
-    return name.strip()
+from draftroom import fixtures
+from draftroom.extract import TANKATHON
+from draftroom.scrapers import scrape, tankathon_url
+
+FIXTURES = str(Path(__file__).resolve().parents[1] / "data" / "fixtures" / "tankathon-top5.sqlite")
 
 def search_tankathon(name: str, position: str):
     try:
-        clean = clean_name_for_url(name)
-        slug = clean.lower().replace(' ', '-').replace("'", "")
-        
-        url = f"https://www.tankathon.com/nfl/players/{slug}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            html = response.read().decode('utf-8')
-            
-            # New patterns based on actual HTML structure
-            # Height: <span class="feet">6'</span><span class="inches">5&quot;</span>
-            feet_match = re.search(r'<span class="feet">(\d+)\'</span>', html)
-            inches_match = re.search(r'<span class="inches">(\d+)&quot;</span>', html)
-            
-            # Weight: <div class="value">225<span class="small">lbs</span>
-            weight_match = re.search(r'<div class="label">Weight</div><div class="value">(\d+)<span class="small">lbs</span>', html)
-            
-            # School logo: src="http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg"
-            logo_match = re.search(r'src="(http://d2uki2uvp6v3wr\.cloudfront\.net/ncaa/[^"]+\.svg)"', html)
-            
-            if feet_match and inches_match and weight_match:
-                feet = feet_match.group(1)
-                inches = inches_match.group(1)
-                height = f"{feet}-{inches}"
-                weight = weight_match.group(1)
-                logo = logo_match.group(1) if logo_match else None
-                
-                print(f"✓ {name}: {height}, {weight} lbs")
-                if logo:
-                    print(f"  Logo: {logo}")
-                return True
-            else:
-                print(f"✗ {name}: Found page but couldn't extract data")
-                if not feet_match or not inches_match:
-                    print(f"  Height missing: feet={bool(feet_match)}, inches={bool(inches_match)}")
-                if not weight_match:
-                    print(f"  Weight missing")
-                return False
-    
+        found = scrape(tankathon_url(name), TANKATHON)
     except HTTPError as e:
         print(f"✗ {name}: HTTP {e.code}")
         return False
+    except fixtures.FixtureMiss:
+        print(f"✗ {name}: not in fixture archive (rerun with --fixture-mode record)")
+        return False
     except (URLError, TimeoutError) as e:
         print(f"✗ {name}: Network error")
         return False
 
+    if found.ok:
+        print(f"✓ {name}: {found.get('feet')}-{found.get('inches')}, {found.get('weight')} lbs "
+              f"({found.bytes_read / 1024:.0f} KB read)")
+        if found.get('logo'):
+            print(f"  Logo: {found.get('logo')}")
+        return True
+
+    print(f"✗ {name}: Found page but couldn't extract data")
+    print(f"  Missing: {', '.join(found.missing)}")
+    return False
+
 # Test with top 5 from CSV
 test_players = [
     ("Fernando Mendoza", "QB"),
@@ -74,6 +50,15 @@ test_players = [
     ("Caleb Downs", "S")
 ]
 
+parser = argparse.ArgumentParser(description="Scrape the top 5 prospects from Tankathon")
+fixtures.add_arguments(parser, default_path=FIXTURES)
+recorded = Path(FIXTURES).exists()
+parser.set_defaults(fixture_mode='replay' if recorded else 'live')
+args = parser.parse_args()
+if not recorded and args.fixture_mode == 'live':
+    print(f"No recorded archive at {FIXTURES}; scraping live (record one with --fixture-mode record)\n")
+fixtures.start(args)
+
 print("Testing enrichment on top 5 players:\n")
 success = 0
 for name, pos in test_players:
@@ -82,3 +67,4 @@ for name, pos in test_players:
     print()
 
 print(f"Success rate: {success}/{len(test_players)}")
+exit(0 if success == len(test_players) else 1)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""draftroom.applier: chunking, and resuming a crashed apply at the chunk that failed"""
+
+import contextlib
+import io
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from draftroom import d1, pipeline, synthetic
+from draftroom.applier import ChunkedApply, iter_chunks, iter_statements, plan, read_statements, split_statements
+
+
+def player_rows(n):
+    records = pipeline.fingerprint(dict(r, school_logo=None) for r in
+                                   pipeline.normalize(synthetic.prospects(n)))
+    return [pipeline.player_row(r) for r in records]
+
+
+def dump(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT {', '.join(pipeline.PLAYER_COLUMNS)} FROM players ORDER BY slug").fetchall()
+    finally:
+        conn.close()
+
+
+class PlanTest(unittest.TestCase):
+
+    def test_split_ignores_semicolons_in_literals_and_comments(self):
+        text = "-- header; not a statement\nINSERT INTO t VALUES ('a;b', 'it''s;');\nDELETE FROM t;"
+        self.assertEqual(list(split_statements(text)),
+                         ["INSERT INTO t VALUES ('a;b', 'it''s;')", "DELETE FROM t"])
+
+    def test_statements_split_across_pieces(self):
+        text = ("-- header; not a statement\nINSERT INTO t VALUES ('a;b', 'it''s;', \"q\"\"x;\");\n"
+                "UPDATE t SET a = 1 - 2 -- trailing; comment\n;\nDELETE FROM t")
+        expected = list(split_statements(text))
+        self.assertEqual(len(expected), 3)
+        for cut in range(1, len(text)):
+            self.assertEqual(list(iter_statements([text[:cut], text[cut:]])), expected, cut)
+        self.assertEqual(list(iter_statements(iter(text))), expected)
+
+    def test_chunks_are_cut_before_the_input_is_exhausted(self):
+        def statements():
+            for i in range(5):  # the fifth closes the second chunk
+                yield f"UPDATE t SET a = {i} WHERE b = {i}"
+            raise AssertionError("read past the first chunks")
+
+        chunks = iter_chunks(statements(), chunk_statements=2)
+        self.assertEqual(len(next(chunks).statements), 2)
+        self.assertEqual(len(next(chunks).statements), 2)
+
+    def test_upsert_groups_get_their_own_chunks_and_pragmas_carry(self):
+        upsert = "INSERT INTO players (slug) VALUES ('{}') ON CONFLICT(slug) DO UPDATE SET slug=excluded.slug"
+        statements = (["PRAGMA foreign_keys = OFF", "DELETE FROM votes", "DELETE FROM players"]
+                      + [upsert.format(i) for i in range(5)]
+                      + ["UPDATE players SET rank = 1 WHERE slug = 'a'"])
+        chunks = plan(statements, chunk_statements=2)
+        self.assertEqual([len(c.statements) for c in chunks], [2, 2, 2, 1, 1])
+        self.assertEqual([c.parallel for c in chunks], [False, True, True, True, False])
+        self.assertTrue(all(c.preamble == ["PRAGMA foreign_keys = OFF"] for c in chunks))
+        self.assertEqual(len({c.group for c in chunks[1:4]}), 1)
+
+
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.project = self.dir.name
+        self.db_path = synthetic.stub_project(self.project)
+        self.sql_file = f"{self.project}/data/players.sql"
+        rows = player_rows(300)
+        batches = list(d1.upsert_batches('players', pipeline.PLAYER_COLUMNS, 'slug', rows))
+        batches.append(("UPDATE players SET rank = rank + 1000 WHERE rank > ?", [(250,)]))
+        d1.write_sql_file(batches, self.sql_file)
+
+        self.expected_dir = tempfile.TemporaryDirectory()
+        self.expected_db = synthetic.stub_project(self.expected_dir.name)
+        d1.apply(batches, self.expected_dir.name, db_path=self.expected_db)
+
+    def tearDown(self):
+        self.dir.cleanup()
+        self.expected_dir.cleanup()
+
+    def runner(self):
+        return ChunkedApply(self.sql_file, self.project, db_path=self.db_path, workers=4,
+                            chunk_statements=5)
+
+    def crash_at(self, failing):
+        """Run once with the given chunk indices failing; return the statements that landed"""
+        runner = self.runner()
+        apply_chunk = runner._apply_chunk
+
+        def flaky(chunk):
+            if chunk.index in failing:
+                raise RuntimeError(f"chunk {chunk.index} failed: connection reset")
+            return apply_chunk(chunk)
+
+        with mock.patch.object(runner, '_apply_chunk', side_effect=flaky), \
+                contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                runner.run()
+        return runner.statements
+
+    def resume(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.runner().run()
+
+    def test_resume_after_crash_applies_each_chunk_once(self):
+        landed = self.crash_at({3})
+        result = self.resume()
+        self.assertGreater(result['skipped'], 0)
+        total = len(list(read_statements(self.sql_file, block=1000)))
+        self.assertEqual(landed + result['statements'], total)
+        self.assertEqual(dump(self.db_path), dump(self.expected_db))
+
+    def test_crash_in_the_trailing_sequential_chunk(self):
+        total = len(plan(read_statements(self.sql_file), chunk_statements=5))
+        self.crash_at({total - 1})
+        result = self.resume()
+        self.assertEqual((result['skipped'], result['statements']), (total - 1, 1))
+        self.assertEqual(dump(self.db_path), dump(self.expected_db))
+
+    def test_finished_apply_clears_its_journal(self):
+        self.crash_at({3})
+        runner = self.runner()
+        self.assertTrue(runner.journal.journal_path.exists())
+        self.resume()
+        self.assertFalse(runner.journal.journal_path.exists())
+        self.assertFalse(runner.journal.snapshot_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Local (bound parameters) and --remote (rendered .sql) writes must store the same rows"""
+
+import contextlib
+import io
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from draftroom import d1, pipeline, synthetic
+from draftroom.applier import ChunkedApply
+
+ROWS = [
+    # name, slug, position, school, height, weight, rank, school_logo, content_hash
+    ("Fernando Mendoza", "fernando-mendoza", "QB", "Indiana", "6-5", "225", 1, None, "a" * 16),
+    ("Ja'Marr O'Neil", "jamarr-oneil", "", "", None, "", 2, "https://x/1.png", "b" * 16),
+    ("Zoë Müller; DROP TABLE players", "zoe", "WR", "Texas A&M", "6-0", 190.5, 3, "", "c" * 16),
+]
+
+
+def players(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT {', '.join(pipeline.PLAYER_COLUMNS)} FROM players ORDER BY rank").fetchall()
+    finally:
+        conn.close()
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def project(self, name: str):
+        root = str(Path(self.dir.name, name))
+        return root, synthetic.stub_project(root)
+
+    def batches(self):
+        return d1.upsert_batches('players', pipeline.PLAYER_COLUMNS, 'slug', ROWS, max_params=20)
+
+    def test_local_and_rendered_rows_match(self):
+        local_dir, local_db = self.project("local")
+        d1.apply(self.batches(), local_dir)
+
+        remote_dir, remote_db = self.project("remote")
+        sql_file = f"{remote_dir}/data/players.sql"
+        d1.write_sql_file(self.batches(), sql_file)
+        ChunkedApply(sql_file, remote_dir, remote=False, db_path=remote_db).run()
+
+        self.assertEqual(players(local_db), players(remote_db))
+        self.assertEqual(players(local_db)[1][2:4], ('', ''))  # NOT NULL columns keep ''
+
+    def test_render_only_nulls_none(self):
+        self.assertEqual(d1.render("INSERT INTO t VALUES (?, ?, ?)", (None, '', "it's")),
+                         "INSERT INTO t VALUES (NULL, '', 'it''s');")
+
+
+def board_version(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT version FROM board_version WHERE id = 1").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class BoardVersionTest(unittest.TestCase):
+    """The worker's board cache is only invalidated by writes that changed something"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.project = self.dir.name
+        self.db_path = synthetic.stub_project(self.project)
+        self.feed = synthetic.write_sportradar_json(f"{self.project}/prospects.json", 20)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def run_delta(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(pipeline.run('upsert', self.feed, self.project, db_path=self.db_path,
+                                          delta=True, offline_logos=True), 0)
+
+    def test_delta_without_changes_does_not_bump(self):
+        self.run_delta()
+        bumped = board_version(self.db_path)
+        self.run_delta()
+        self.assertEqual(board_version(self.db_path), bumped)
+
+    def test_local_apply_bumps_once_rows_change(self):
+        before = board_version(self.db_path)
+        d1.apply(iter([]), self.project, db_path=self.db_path)
+        self.assertEqual(board_version(self.db_path), before)
+        d1.apply(self.batches(), self.project, db_path=self.db_path)
+        self.assertEqual(board_version(self.db_path), before + 1)
+
+    def test_rendered_file_bumps_only_after_writes(self):
+        sql_file = f"{self.project}/data/delta.sql"
+        self.assertEqual(d1.write_sql_file(d1._then_bump(iter([("DELETE FROM players WHERE slug = ?", [])])),
+                                           sql_file), 0)
+        self.assertEqual(d1.write_sql_file(d1._then_bump(self.batches()), sql_file), 2)
+        self.assertTrue(Path(sql_file).read_text().rstrip().endswith(d1.BUMP_BOARD_VERSION + ';'))
+
+    def batches(self):
+        return d1.upsert_batches('players', pipeline.PLAYER_COLUMNS, 'slug', ROWS[:1])
+
+
+class FindLocalDbTest(unittest.TestCase):
+    """wrangler.toml declares two D1 databases; writes go to the default one or nowhere"""
+
+    WRANGLER_TOML = (Path(__file__).resolve().parents[1] / "wrangler.toml").read_text()
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.project = self.dir.name
+        self.state = Path(self.project, d1.LOCAL_STATE, d1.D1_OBJECT)
+        self.state.mkdir(parents=True)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def database(self, name):
+        path = self.state / name
+        sqlite3.connect(path).close()
+        return path
+
+    def test_configured_database_id(self):
+        Path(self.project, "wrangler.toml").write_text(self.WRANGLER_TOML)
+        self.assertEqual(d1.configured_database_id(self.project), "10dc70cb-0c61-4018-9b0f-0dd2c02ff039")
+
+    def test_picks_the_default_database_over_a_newer_one(self):
+        Path(self.project, "wrangler.toml").write_text(self.WRANGLER_TOML)
+        default = self.database(d1.local_db_name(d1.configured_database_id(self.project)))
+        self.database(d1.local_db_name("00000000-0000-0000-0000-000000000000"))  # [env.local], touched last
+        self.assertEqual(d1.find_local_db(self.project), default)
+
+    def test_refuses_to_guess_between_databases(self):
+        self.database("a.sqlite")
+        self.database("b.sqlite")
+        with self.assertRaises(FileNotFoundError):
+            d1.find_local_db(self.project)
+
+    def test_a_single_database_is_used(self):
+        only = self.database("a.sqlite")
+        self.assertEqual(d1.find_local_db(self.project), only)
+
+
+if __name__ == "__main__":
+    unittest.main()
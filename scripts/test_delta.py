@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""draftroom.delta: what a delta run writes against local and hash-only (remote) snapshots"""
+
+import contextlib
+import io
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from draftroom import d1, delta, pipeline, synthetic
+from draftroom.applier import ChunkedApply
+from draftroom.sqlutil import content_hash
+
+
+def record(slug, rank, weight=220, school='Indiana'):
+    r = {'name': slug.title(), 'slug': slug, 'position': 'QB', 'school': school,
+         'height': '6-2', 'weight': weight, 'rank': rank, 'school_logo': None}
+    r['content_hash'] = content_hash(r[c] for c in pipeline.SOURCE_COLUMNS)
+    return r
+
+
+BOARD = [record('alpha', 1), record('bravo', 2), record('charlie', 3), record('delta', 4)]
+# bravo gained weight, charlie is unchanged, delta left the feed, echo is new
+FEED = [record('alpha', 1), record('bravo', 2, weight=231), record('charlie', 3), record('echo', 4)]
+
+
+def dump(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT {', '.join(pipeline.PLAYER_COLUMNS)} FROM players ORDER BY slug").fetchall()
+    finally:
+        conn.close()
+
+
+class DeltaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def project(self, name):
+        root = str(Path(self.dir.name, name))
+        db_path = synthetic.stub_project(root)
+        rows = [pipeline.player_row(r) for r in BOARD]
+        d1.apply(d1.upsert_batches('players', pipeline.PLAYER_COLUMNS, 'slug', rows), root, db_path=db_path)
+        return root, db_path
+
+    def test_local_snapshot_writes_only_changed_fields(self):
+        root, db_path = self.project("local")
+        diff = delta.Delta(delta.load_snapshot(root, db_path=db_path))
+        batches = [(sql, list(rows)) for sql, rows in diff.batches([dict(r) for r in FEED], delete_missing=True)]
+
+        self.assertEqual([r['slug'] for r in diff.inserts], ['echo'])
+        self.assertEqual(diff.changed, [('bravo', ('weight',))])
+        self.assertEqual((diff.unchanged, diff.deletes), (2, ['delta']))
+        self.assertIn(("UPDATE players SET weight=?, content_hash=? WHERE slug=?",
+                       [(231, FEED[1]['content_hash'], 'bravo')]), batches)
+
+        d1.apply(batches, root, db_path=db_path)
+        self.assertEqual([row[1] for row in dump(db_path)], ['alpha', 'bravo', 'charlie', 'echo'])
+
+    def test_hash_only_snapshot_rewrites_changed_rows_whole(self):
+        snapshot = {r['slug']: {'slug': r['slug'], 'content_hash': r['content_hash']} for r in BOARD}
+        diff = delta.Delta(snapshot)
+        batches = list(diff.batches([dict(r) for r in FEED]))
+        self.assertEqual(diff.changed, [('bravo', delta.COMPARE_COLUMNS)])
+        updates = [sql for sql, _ in batches if sql.startswith('UPDATE')]
+        self.assertEqual(updates, [f"UPDATE players SET {', '.join(f'{c}=?' for c in delta.WRITE_COLUMNS)} "
+                                   f"WHERE slug=?"])
+
+    def test_players_with_reports_are_not_deleted(self):
+        root, db_path = self.project("reports")
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO community_reports (player_id, content, ip_hash) "
+                     "SELECT id, 'Quick release', 'x' FROM players WHERE slug = 'delta'")
+        conn.commit()
+        conn.close()
+        diff = delta.Delta(delta.load_snapshot(root, db_path=db_path))
+        d1.apply(diff.batches([dict(r) for r in FEED], delete_missing=True), root, db_path=db_path)
+        self.assertIn('delta', [row[1] for row in dump(db_path)])
+
+    def test_local_and_remote_apply_agree(self):
+        local_root, local_db = self.project("local")
+        diff = delta.Delta(delta.load_snapshot(local_root, db_path=local_db))
+        d1.apply(diff.batches([dict(r) for r in FEED], delete_missing=True), local_root, db_path=local_db)
+
+        remote_root, remote_db = self.project("remote")
+        snapshot = {slug: {c: row[c] for c in delta.REMOTE_SNAPSHOT_COLUMNS}
+                    for slug, row in delta.load_snapshot(remote_root, db_path=remote_db).items()}
+        diff = delta.Delta(snapshot)  # what --remote sees
+        sql_file = f"{remote_root}/data/delta.sql"
+        d1.write_sql_file(diff.batches([dict(r) for r in FEED], delete_missing=True), sql_file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ChunkedApply(sql_file, remote_root, db_path=remote_db).run()
+
+        self.assertEqual(dump(local_db), dump(remote_db))
+
+
+if __name__ == "__main__":
+    unittest.main()
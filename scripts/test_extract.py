@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""draftroom.extract: streamed reads agree with whole-page extraction and keep optional fields"""
+
+import io
+import unittest
+
+from draftroom import synthetic
+from draftroom.extract import ESPN, TANKATHON
+
+LOGO = b'src="http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg"'
+
+
+class ExtractTest(unittest.TestCase):
+
+    def setUp(self):
+        prospect = next(synthetic.prospects(1, 2026))
+        self.page = synthetic.player_page(prospect, 'http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg')
+
+    def test_streamed_read_matches_extract_at_any_chunk_size(self):
+        expected = TANKATHON.extract(self.page).fields
+        self.assertEqual(set(expected), {'feet', 'inches', 'weight', 'logo'})
+        for chunk_size in (1, 7, 100, 1000, 16384):
+            found, _ = TANKATHON.read(io.BytesIO(self.page), chunk_size=chunk_size)
+            self.assertEqual(found.fields, expected, chunk_size)
+
+    def test_read_stops_once_every_field_is_found(self):
+        found, body = TANKATHON.read(io.BytesIO(self.page))
+        self.assertTrue(found.ok)
+        self.assertLess(len(body), len(self.page))
+        self.assertEqual(found.bytes_read, len(body))
+
+    def test_optional_field_after_required_ones_is_kept(self):
+        page = self.page.replace(LOGO, b'') + b'<img ' + LOGO + b'>'
+        found, _ = TANKATHON.read(io.BytesIO(page), chunk_size=1000)
+        self.assertEqual(found.get('logo'), 'http://d2uki2uvp6v3wr.cloudfront.net/ncaa/indiana.svg')
+
+    def test_missing_optional_field_is_still_ok(self):
+        found, body = TANKATHON.read(io.BytesIO(self.page.replace(LOGO, b'')))
+        self.assertTrue(found.ok)
+        self.assertEqual(found.missing, ['logo'])
+
+    def test_multi_group_field_split_across_chunks(self):
+        page = b'x' * 5000 + b'6-2 HT, 215 WT' + b'y' * 5000
+        found, _ = ESPN.read(io.BytesIO(page), chunk_size=3)
+        self.assertEqual(found.fields, {'height': '6-2', 'weight': '215'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Crash, resume and compaction behaviour of draftroom.journal.ProgressJournal"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from draftroom.journal import ProgressJournal
+
+
+class ProgressJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.dir.name, "progress.json"))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def crash_mid_append(self, journal: ProgressJournal, key: str):
+        """Simulate a crash that left half of `key`'s line on disk"""
+        journal.close()
+        with open(journal.journal_path, 'a') as f:
+            f.write('{"key":"%s","record":{"na' % key)
+
+    def test_resume_after_torn_line(self):
+        journal = ProgressJournal(self.path)
+        journal.append("1", {"n": 1})
+        journal.append("2", {"n": 2})
+        self.crash_mid_append(journal, "3")
+
+        resumed = ProgressJournal(self.path)
+        self.assertEqual(list(resumed.load()), ["1", "2"])
+        resumed.append("3", {"n": 3})
+        resumed.append("4", {"n": 4})
+        self.assertEqual(list(resumed.load()), ["1", "2", "3", "4"])
+
+        self.assertEqual(resumed.compact(), 4)
+        self.assertEqual(ProgressJournal(self.path).load(),
+                         {"1": {"n": 1}, "2": {"n": 2}, "3": {"n": 3}, "4": {"n": 4}})
+
+    def test_append_without_load_starts_a_new_line(self):
+        journal = ProgressJournal(self.path)
+        journal.append("1", {"n": 1})
+        self.crash_mid_append(journal, "2")
+
+        resumed = ProgressJournal(self.path)
+        resumed.append("2", {"n": 2})
+        self.assertEqual(list(resumed.load()), ["1", "2"])
+
+    def test_bad_line_does_not_hide_later_ones(self):
+        journal = ProgressJournal(self.path)
+        journal.append("1", {"n": 1})
+        journal.close()
+        with open(journal.journal_path, 'a') as f:
+            f.write('not json\n')
+        journal.append("2", {"n": 2})
+        self.assertEqual(list(journal.load()), ["1", "2"])
+
+    def test_compact_then_append(self):
+        journal = ProgressJournal(self.path)
+        journal.append("1", {"n": 1})
+        journal.compact()
+        journal.append("2", {"n": 2})
+        self.assertFalse(Path(self.path).with_suffix('.json.tmp').exists())
+        self.assertEqual(list(ProgressJournal(self.path).load()), ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""draftroom.jsonstream: values split across reads, long records, skipped siblings"""
+
+import io
+import json
+import unittest
+from unittest import mock
+
+from draftroom import jsonstream
+from draftroom.jsonstream import iter_array
+
+
+def decodes():
+    """Count raw_decode calls while still decoding"""
+    return mock.patch.object(json.JSONDecoder, 'raw_decode', autospec=True,
+                             side_effect=json.JSONDecoder.raw_decode)
+
+
+class CountingReader(io.StringIO):
+    """StringIO that counts how many characters were read"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.chars = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.chars += len(chunk)
+        return chunk
+
+
+def items(document, key='prospects', chunk_size=jsonstream.READ_CHUNK):
+    return list(iter_array(io.StringIO(document), key, chunk_size))
+
+
+class IterArrayTest(unittest.TestCase):
+
+    def test_every_chunk_boundary(self):
+        document = json.dumps({'season': 2026, 'meta': {'a': [1, ']}\\"x']},
+                               'prospects': [{'name': 'A "Q" B', 'w': 2.5}, -1e-3, 12, True, None, "x"]})
+        expected = json.loads(document)['prospects']
+        for chunk_size in range(1, len(document) + 1):
+            self.assertEqual(items(document, chunk_size=chunk_size), expected, chunk_size)
+
+    def test_number_split_across_reads(self):
+        self.assertEqual(items('[2.5, 10]', chunk_size=2), [2.5, 10])  # "[2" | ".5" ...
+        self.assertEqual(items('{"prospects": [1e10]}', chunk_size=17), [1e10])
+
+    def test_long_single_record(self):
+        record = {'name': 'x' * 2_000_000, 'notes': ['y' * 100] * 1000}
+        reader = CountingReader(json.dumps({'prospects': [record, 1]}))
+        with decodes() as raw_decode:
+            found = list(iter_array(reader, 'prospects', chunk_size=1024))
+        self.assertEqual(found, [record, 1])
+        self.assertLess(raw_decode.call_count, 40)  # doubling: ~log2(2MB / 1KB) retries, not 2000
+
+    def test_siblings_are_skipped_not_decoded(self):
+        document = ('{"meta": {"x": [' + ', '.join(['{"a": "\\\\\\"]"}'] * 5000) + ']}, '
+                    '"tail": "s", "prospects": [1, 2], "after": {"ignored": true}}')
+        with decodes() as raw_decode:
+            self.assertEqual(items(document, chunk_size=7), [1, 2])
+        self.assertLess(raw_decode.call_count, 12)  # keys, "s" and two elements (plus refills)
+
+    def test_unterminated_document_raises(self):
+        with self.assertRaises(ValueError):
+            items('{"meta": [1, 2', chunk_size=4)
+        with self.assertRaises(ValueError):
+            items('{"prospects": [{"a": 1', chunk_size=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""draftroom.logos: only a definitive 404/410 is remembered as a missing logo"""
+
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from draftroom import logos
+from draftroom.logocache import LogoCache
+
+STATUSES = {'found': 200, 'gone': 404, 'removed': 410, 'overloaded': 503}
+
+
+class StubCDN(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        school = Path(self.path).stem
+        if school not in STATUSES:  # hang up without answering
+            self.close_connection = True
+            return
+        self.send_response(STATUSES[school])
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class LogoResolverTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubCDN)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.cdn, logos.LOGO_CDN = logos.LOGO_CDN, f"http://127.0.0.1:{cls.server.server_port}/ncaa"
+
+    @classmethod
+    def tearDownClass(cls):
+        logos.LOGO_CDN = cls.cdn
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.dir.name, "logos.sqlite"))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def resolve(self, *schools):
+        with logos.LogoResolver(store=LogoCache(self.path), rate=1000, burst=100) as resolver:
+            return resolver.resolve_many(schools)
+
+    def stored(self, school):
+        store = LogoCache(self.path)
+        try:
+            return store.lookup(school)
+        finally:
+            store.close()
+
+    def test_probe_outcomes(self):
+        self.assertIs(logos.probe_logo(logos.logo_url_for('found')), True)
+        self.assertIs(logos.probe_logo(logos.logo_url_for('gone')), False)
+        self.assertIs(logos.probe_logo(logos.logo_url_for('removed')), False)
+        self.assertIsNone(logos.probe_logo(logos.logo_url_for('overloaded')))
+        self.assertIsNone(logos.probe_logo(logos.logo_url_for('hangup')))
+
+    def test_only_definitive_answers_are_stored(self):
+        found = self.resolve('found', 'gone', 'overloaded', 'hangup')
+        self.assertEqual(found['found'], logos.logo_url_for('found'))
+        self.assertEqual([found[s] for s in ('gone', 'overloaded', 'hangup')], [None, None, None])
+
+        self.assertEqual(self.stored('found'), (True, logos.logo_url_for('found')))
+        self.assertEqual(self.stored('gone'), (True, None))
+        self.assertEqual(self.stored('overloaded'), (False, None))
+        self.assertEqual(self.stored('hangup'), (False, None))
+
+    def test_stored_results_survive_a_run_that_never_closes(self):
+        store = LogoCache(self.path)
+        store.store('found', logos.logo_url_for('found'), 'cdn')
+        try:
+            self.assertEqual(self.stored('found'), (True, logos.logo_url_for('found')))
+        finally:
+            store.conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
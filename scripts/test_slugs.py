@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""draftroom.slugs: collisions resolve the same way whatever the feed order"""
+
+import contextlib
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from draftroom import pipeline, synthetic
+from draftroom.slugs import SlugIndex, load_slugs
+
+WYOMING = {'name': 'Josh Allen', 'team_name': 'Wyoming', 'position': 'QB', 'height': 77, 'weight': 237}
+WYOMING_LB = dict(WYOMING, position='LB', weight=245)
+KENTUCKY = {'name': 'Josh Allen', 'team_name': 'Kentucky', 'position': 'EDGE', 'height': 77, 'weight': 262}
+OTHER = {'name': 'Travis Hunter', 'team_name': 'Colorado', 'position': 'CB', 'height': 73, 'weight': 185}
+WARD = {'name': 'Cam Ward', 'team_name': 'Miami (FL)', 'position': 'QB', 'height': 74, 'weight': 223}
+
+
+def key(prospect):
+    return prospect['name'], prospect['team_name'], prospect['position']
+
+
+def held(slug, prospect):
+    """An existing players row for a prospect, as load_slugs() returns it"""
+    return {'slug': slug, 'name': prospect['name'], 'school': prospect['team_name'],
+            'position': prospect['position']}
+
+
+def assign_all(feed, existing=None):
+    slugs = SlugIndex([key(p) for p in feed], existing=existing)
+    return {key(p): slugs.assign(*key(p)) for p in feed}
+
+
+class SlugIndexTest(unittest.TestCase):
+
+    def test_every_colliding_name_is_suffixed(self):
+        slugs = assign_all([WYOMING, KENTUCKY, OTHER])
+        self.assertEqual(slugs[key(WYOMING)], 'josh-allen-wyoming')
+        self.assertEqual(slugs[key(KENTUCKY)], 'josh-allen-kentucky')
+        self.assertEqual(slugs[key(OTHER)], 'travis-hunter')
+
+    def test_feed_order_does_not_matter(self):
+        self.assertEqual(assign_all([WYOMING, KENTUCKY, OTHER]), assign_all([KENTUCKY, OTHER, WYOMING]))
+
+    def test_same_name_and_school_are_told_apart_by_position(self):
+        slugs = assign_all([WYOMING, WYOMING_LB])
+        self.assertEqual(slugs[key(WYOMING)], 'josh-allen-wyoming-qb')
+        self.assertEqual(slugs[key(WYOMING_LB)], 'josh-allen-wyoming-lb')
+        self.assertEqual(assign_all([WYOMING_LB, WYOMING]), slugs)
+
+    def test_reordered_collision_keeps_existing_slugs(self):
+        existing = [held('josh-allen', WYOMING), held('josh-allen-wyoming', WYOMING_LB)]
+        first = assign_all([WYOMING, WYOMING_LB], existing)
+        self.assertEqual(first, {key(WYOMING): 'josh-allen', key(WYOMING_LB): 'josh-allen-wyoming'})
+        self.assertEqual(assign_all([WYOMING_LB, WYOMING], existing), first)
+
+    def test_existing_slug_is_kept(self):
+        slugs = assign_all([KENTUCKY, WYOMING], [held('josh-allen', WYOMING)])
+        self.assertEqual(slugs[key(WYOMING)], 'josh-allen')
+        self.assertEqual(slugs[key(KENTUCKY)], 'josh-allen-kentucky')
+
+    def test_position_change_keeps_the_slug(self):
+        slugs = assign_all([WYOMING_LB], [held('josh-allen', WYOMING)])
+        self.assertEqual(slugs[key(WYOMING_LB)], 'josh-allen')
+
+    def test_new_prospect_never_takes_a_held_slug(self):
+        existing = [held('josh-allen', WYOMING), held('josh-allen-kentucky', OTHER)]
+        slugs = assign_all([KENTUCKY, WYOMING, OTHER], existing)
+        self.assertEqual(slugs[key(KENTUCKY)], 'josh-allen-kentucky-edge')
+
+    def test_school_change_keeps_the_slug(self):
+        slugs = assign_all([dict(WARD, team_name='Miami')], [held('cam-ward', WARD)])
+        self.assertEqual(list(slugs.values()), ['cam-ward'])
+
+    def test_ambiguous_school_change_gets_a_new_slug(self):
+        # Two new Josh Allens and one Josh Allen gone: no way to tell which one it was
+        slugs = assign_all([KENTUCKY, dict(WYOMING, team_name='Utah')], [held('josh-allen', WYOMING)])
+        self.assertNotIn('josh-allen', slugs.values())
+
+    def test_same_name_and_school_fall_back_to_position_then_counter(self):
+        slugs = SlugIndex()
+        self.assertEqual(slugs.assign('Josh Allen', 'Wyoming', 'QB'), 'josh-allen')
+        self.assertEqual(slugs.assign('Josh Allen', 'Wyoming', 'QB'), 'josh-allen-wyoming')
+        self.assertEqual(slugs.assign('Josh Allen', 'Wyoming', 'QB'), 'josh-allen-wyoming-qb')
+        self.assertEqual(slugs.assign('Josh Allen', 'Wyoming', 'QB'), 'josh-allen-wyoming-qb-2')
+
+
+class TwoFeedsTest(unittest.TestCase):
+    """The same prospects across two pipeline runs keep their rows"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.project = self.dir.name
+        self.db_path = synthetic.stub_project(self.project)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def run_feed(self, name, feed, **kwargs):
+        path = Path(self.project, name)
+        path.write_text(json.dumps({'prospects': feed}))
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = pipeline.run('upsert', str(path), self.project, db_path=self.db_path,
+                                  offline_logos=True, **kwargs)
+        self.assertEqual(status, 0)
+
+    def query(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return dict(conn.execute(sql))
+        finally:
+            conn.close()
+
+    def rows(self):
+        return self.query("SELECT slug, school FROM players")
+
+    def ids(self):
+        return self.query("SELECT slug, id FROM players")
+
+    def test_collision_across_two_feeds(self):
+        self.run_feed('week1.json', [WYOMING, KENTUCKY, OTHER])
+        first = self.rows()
+        self.run_feed('week2.json', [OTHER, KENTUCKY, WYOMING])
+        self.assertEqual(self.rows(), first)
+        self.assertEqual(first['josh-allen-wyoming'], 'Wyoming')
+        self.assertEqual(first['josh-allen-kentucky'], 'Kentucky')
+
+    def test_existing_bare_slug_survives_a_new_namesake(self):
+        self.run_feed('week1.json', [WYOMING, OTHER])
+        self.assertEqual(self.rows()['josh-allen'], 'Wyoming')
+        self.run_feed('week2.json', [KENTUCKY, WYOMING, OTHER], delta=True)
+        rows = self.rows()
+        self.assertEqual(rows['josh-allen'], 'Wyoming')
+        self.assertEqual(rows['josh-allen-kentucky'], 'Kentucky')
+        self.assertEqual(len(rows), 3)
+        self.assertIn(held('josh-allen-kentucky', KENTUCKY), load_slugs(self.project, db_path=self.db_path))
+
+    def test_delta_run_reads_slugs_from_its_snapshot(self):
+        self.run_feed('week1.json', [WYOMING, OTHER])
+        with mock.patch.object(pipeline, 'load_slugs', side_effect=AssertionError("second players read")):
+            self.run_feed('week2.json', [KENTUCKY, WYOMING, OTHER], delta=True)
+        self.assertEqual(self.rows()['josh-allen'], 'Wyoming')
+
+    def test_reordered_same_school_collision(self):
+        for delta in (False, True):
+            with self.subTest(delta=delta):
+                self.run_feed('week1.json', [WYOMING, WYOMING_LB, OTHER], delta=delta)
+                first = self.ids()
+                self.run_feed('week2.json', [WYOMING_LB, OTHER, WYOMING], delta=delta)
+                self.assertEqual(self.ids(), first)
+                self.assertEqual(set(first), {'josh-allen-wyoming-qb', 'josh-allen-wyoming-lb', 'travis-hunter'})
+
+    def test_school_change_updates_the_same_row(self):
+        for delta in (False, True):
+            with self.subTest(delta=delta):
+                self.run_feed('week1.json', [WARD, OTHER], delta=delta)
+                before = self.ids()
+                self.run_feed('week2.json', [dict(WARD, team_name='Miami'), OTHER], delta=delta)
+                self.assertEqual(self.ids(), before)
+                self.assertEqual(self.rows()['cam-ward'], 'Miami')
+
+
+if __name__ == "__main__":
+    unittest.main()
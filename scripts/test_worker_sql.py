@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""The worker's one-batch vote statements, run against SQLite with every migration applied
+
+The SQL is read from worker/index.ts, so these check the statements the
+worker actually sends (worker/index.test.ts pins that it sends them, in
+this order, as one batch). D1 runs a batch as one transaction on SQLite,
+so changes() behaves here exactly as it does there.
+"""
+
+import re
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from draftroom import synthetic
+
+WORKER = Path(__file__).resolve().parents[1] / "worker" / "index.ts"
+SOURCE = WORKER.read_text()
+STATEMENTS = re.findall(r"'((?:INSERT|UPDATE|DELETE|SELECT) [^']*)'", SOURCE)
+
+
+def columns(name: str) -> str:
+    """A `const NAME = '...' + '...';` column list from the worker"""
+    found = re.search(rf"const {name} = ((?:'[^']*'\s*\+?\s*)+);", SOURCE)
+    if not found:
+        raise AssertionError(f"no {name} in {WORKER}")
+    return ''.join(re.findall(r"'([^']*)'", found.group(1)))
+
+
+def statement(*needles: str) -> str:
+    """The single worker statement containing every needle"""
+    found = [sql for sql in STATEMENTS if all(n in sql for n in needles)]
+    if len(found) != 1:
+        raise AssertionError(f"expected one statement with {needles} in {WORKER}, found {found}")
+    return found[0]
+
+
+TOGGLE = [
+    statement('DELETE FROM player_votes'),
+    statement('INSERT INTO player_votes', 'changes()'),
+    statement('UPDATE players SET community_score', 'changes()'),
+    statement('SELECT community_score FROM players'),
+]
+REPORT_VOTE = [
+    statement('INSERT INTO votes'),
+    statement('UPDATE community_reports', 'upvotes = upvotes + 1'),
+    statement('SELECT upvotes, downvotes, score FROM community_reports'),
+]
+
+
+class WorkerSqlTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(synthetic.stub_project(self.dir.name), isolation_level=None)
+        self.conn.execute("INSERT INTO players (id, name, slug, position, school, rank) "
+                          "VALUES (1, 'Test Player', 'test-player', 'QB', 'Indiana', 1)")
+        self.conn.execute("INSERT INTO community_reports (id, player_id, content, ip_hash) "
+                          "VALUES (5, 1, 'Great arm', 'author')")
+
+    def tearDown(self):
+        self.conn.close()
+        self.dir.cleanup()
+
+    def batch(self, statements, *binds):
+        """Run statements as D1 does a batch: in order, in one transaction; (changes, rows) each"""
+        results = []
+        self.conn.execute("BEGIN")
+        for sql, params in zip(statements, binds):
+            rows = self.conn.execute(sql, params).fetchall()
+            results.append((self.conn.execute("SELECT changes()").fetchone()[0], rows))
+        self.conn.execute("COMMIT")
+        return results
+
+    def toggle(self, ip_hash):
+        _, (inserted, _), _, (_, [(score,)]) = self.batch(TOGGLE, (1, ip_hash), (1, ip_hash), (1,), (1,))
+        return ('added' if inserted else 'removed'), score
+
+    def test_player_vote_toggles(self):
+        self.assertEqual(self.toggle('ip1'), ('added', 1))
+        self.assertEqual(self.toggle('ip2'), ('added', 2))
+        self.assertEqual(self.toggle('ip1'), ('removed', 1))
+        self.assertEqual(self.toggle('ip1'), ('added', 2))
+        self.assertEqual(self.toggle('ip2'), ('removed', 1))
+        self.assertEqual(self.conn.execute("SELECT ip_hash FROM player_votes").fetchall(), [('ip1',)])
+
+    def test_report_vote_counts_once_per_client(self):
+        first = self.batch(REPORT_VOTE, (5, 'voter', 'up'), (5,), (5,))
+        self.assertEqual(first[0][0], 1)
+        self.assertEqual(first[2][1], [(1, 0, 1)])
+
+        repeat = self.batch(REPORT_VOTE, (5, 'voter', 'up'), (5,), (5,))
+        self.assertEqual(repeat[0][0], 0)  # the handler answers 400 on this
+        self.assertEqual(repeat[2][1], [(1, 0, 1)])
+
+    def test_board_lists_every_column_but_content_hash(self):
+        selected = self.conn.execute(f"SELECT {columns('BOARD_COLUMNS')} FROM players").description
+        table = [row[1] for row in self.conn.execute("PRAGMA table_info(players)")]
+        self.assertEqual(sorted(c[0] for c in selected), sorted(c for c in table if c != 'content_hash'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -178,9 +178,9 @@ export default function AdminRankingsPage() {
 
       if (response.ok) {
         setMessage(`✅ Saved ${updates.length} rankings!`)
-        // Reload players to get updated ranks
-        const data = await fetch(`${API_URL}/api/players`).then(r => r.json())
-        setPlayers(Array.isArray(data) ? data : [])
+        // The response carries the re-ranked board
+        const data = await response.json()
+        setPlayers(Array.isArray(data.players) ? data.players : [])
       } else {
         setMessage('❌ Failed to save rankings')
       }
@@ -152,9 +152,8 @@ export default function HomePage() {
         }
         setVotedPlayers(newVoted)
 
-        // Reload players to get updated counts
-        const updated = await fetch(`${API_URL}/api/players`).then(r => r.json())
-        setPlayers(Array.isArray(updated) ? updated : [])
+        // The vote response carries the player's new count; no need to reload the board
+        setPlayers(prev => prev.map(p => p.id === playerId ? { ...p, community_score: result.community_score } : p))
       } else {
         alert(result.error || 'Vote failed')
       }
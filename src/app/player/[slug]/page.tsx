@@ -126,9 +126,13 @@ export default function PlayerPage({ params }: { params: Promise<{ slug: string
       const result = await res.json()
       
       if (res.ok) {
-        // Reload player data to get updated scores
-        const updated = await fetch(`${API_URL}/api/players/${slug}`).then(r => r.json())
-        setPlayerData(updated)
+        // The vote response carries the report's new counts; no need to reload the player
+        const { upvotes, downvotes, score } = result
+        setPlayerData((prev: any) => ({
+          ...prev,
+          communityReports: prev.communityReports.map((r: any) =>
+            r.id === reportId ? { ...r, upvotes, downvotes, score } : r)
+        }))
       } else {
         alert(result.error || 'Vote failed')
       }
@@ -3,7 +3,8 @@
  * Run with: npx vitest or npm test
  */
 
-import { describe, it, expect, beforeEach, vi } from 'vitest'
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest'
+import worker from './index'
 
 // Mock environment
 class MockD1Database {
@@ -11,7 +12,7 @@ class MockD1Database {
 
   constructor() {
     this.data.set('players', [
-      { id: 1, name: 'Test Player', rank: 1, slug: 'test-player' }
+      { id: 1, name: 'Test Player', rank: 1, slug: 'test-player', community_score: 0 }
     ])
     this.data.set('player_votes', [])
   }
@@ -191,16 +192,247 @@ describe('Player List with Community Scores', () => {
       DB: new MockD1Database()
     }
 
-    const players = await mockEnv.DB.prepare(`
-      SELECT 
-        p.*,
-        COALESCE(COUNT(pv.id), 0) as community_score
-      FROM players p
-      LEFT JOIN player_votes pv ON p.id = pv.player_id
-      GROUP BY p.id
-    `).bind().all()
+    const players = await mockEnv.DB.prepare('SELECT * FROM players ORDER BY rank ASC').bind().all()
 
     expect(players.results).toBeDefined()
     expect(players.results.length).toBeGreaterThan(0)
+    expect(players.results[0]).toHaveProperty('community_score')
+  })
+})
+
+// Records what the worker sends to D1 and answers batches with canned results,
+// so the tests pin the exact statements (their SQLite semantics are checked
+// against a real database in scripts/test_worker_sql.py)
+class RecordingD1 {
+  batches: { sql: string, args: any[] }[][] = []
+
+  constructor(private answer: (sql: string) => any) {}
+
+  prepare(sql: string) {
+    return { bind: (...args: any[]) => ({ sql, args }) }
+  }
+
+  async batch(statements: { sql: string, args: any[] }[]) {
+    this.batches.push(statements)
+    return statements.map(({ sql }) => this.answer(sql))
+  }
+}
+
+const ctx = { waitUntil: () => {}, passThroughOnException: () => {} } as any
+
+const post = (path: string, body: any, ip: string) => new Request(`http://test.com${path}`, {
+  method: 'POST',
+  headers: { 'Content-Type': 'application/json', 'CF-Connecting-IP': ip },
+  body: JSON.stringify(body),
+})
+
+describe('Vote handlers', () => {
+  it('should toggle a player vote in one batch', async () => {
+    const answer = (inserted: boolean) => (sql: string) => ({
+      results: sql.startsWith('SELECT') ? [{ community_score: 7 }] : [],
+      meta: { changes: sql.startsWith('INSERT') ? Number(inserted) : 1 },
+    })
+    const db = new RecordingD1(answer(true))
+    const response = await worker.fetch(post('/api/player-vote', { player_id: 1 }, '10.0.0.1'), { DB: db } as any, ctx)
+
+    expect(await response.json()).toEqual({ success: true, action: 'added', community_score: 7 })
+    const ipHash = btoa('10.0.0.1').substring(0, 32)
+    expect(db.batches).toEqual([[
+      { sql: 'DELETE FROM player_votes WHERE player_id = ? AND ip_hash = ?', args: [1, ipHash] },
+      { sql: 'INSERT INTO player_votes (player_id, ip_hash) SELECT ?, ? WHERE changes() = 0 ON CONFLICT(player_id, ip_hash) DO NOTHING', args: [1, ipHash] },
+      { sql: 'UPDATE players SET community_score = community_score + CASE changes() WHEN 0 THEN -1 ELSE 1 END WHERE id = ?', args: [1] },
+      { sql: 'SELECT community_score FROM players WHERE id = ?', args: [1] },
+    ]])
+
+    const removed = await worker.fetch(post('/api/player-vote', { player_id: 1 }, '10.0.0.1'),
+      { DB: new RecordingD1(answer(false)) } as any, ctx)
+    expect((await removed.json()).action).toBe('removed')
+  })
+
+  it('should write a report vote in one batch and reject a repeat', async () => {
+    const answer = (inserted: boolean) => (sql: string) => ({
+      results: sql.startsWith('SELECT') ? [{ upvotes: 3, downvotes: 1, score: 2 }] : [],
+      meta: { changes: Number(inserted) },
+    })
+    const db = new RecordingD1(answer(true))
+    const response = await worker.fetch(post('/api/vote', { report_id: 5, vote_type: 'up' }, '10.0.0.2'), { DB: db } as any, ctx)
+
+    expect(await response.json()).toEqual({ success: true, upvotes: 3, downvotes: 1, score: 2 })
+    const ipHash = btoa('10.0.0.2').substring(0, 32)
+    expect(db.batches).toEqual([[
+      { sql: 'INSERT INTO votes (report_id, ip_hash, vote_type) VALUES (?, ?, ?) ON CONFLICT(report_id, ip_hash) DO NOTHING', args: [5, ipHash, 'up'] },
+      { sql: 'UPDATE community_reports SET upvotes = upvotes + 1, score = score + 1 WHERE id = ? AND changes() > 0', args: [5] },
+      { sql: 'SELECT upvotes, downvotes, score FROM community_reports WHERE id = ?', args: [5] },
+    ]])
+
+    const repeat = await worker.fetch(post('/api/vote', { report_id: 5, vote_type: 'up' }, '10.0.0.3'),
+      { DB: new RecordingD1(answer(false)) } as any, ctx)
+    expect(repeat.status).toBe(400)
+  })
+})
+
+describe('Player detail', () => {
+  const player = { id: 1, name: 'Test Player', slug: 'test-player', community_score: 3 }
+  const report = { id: 9, player_id: 1, display_name: 'Scout', content: 'Quick release', upvotes: 2, downvotes: 0, score: 2 }
+  const answer = (found: boolean) => (sql: string) => ({
+    results: !found ? [] : sql.includes('FROM community_reports') ? [report] : sql.includes('FROM expert_reports') ? [] : [player],
+  })
+  const get = (db: RecordingD1, ifNoneMatch?: string) => worker.fetch(new Request('http://test.com/api/players/test-player', {
+    headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {},
+  }), { DB: db } as any, ctx)
+
+  it('should read the player and both report lists in one batch', async () => {
+    const db = new RecordingD1(answer(true))
+    const response = await get(db)
+
+    expect(await response.json()).toEqual({ player, expertReport: null, communityReports: [report] })
+    const playerId = '(SELECT id FROM players WHERE slug = ?)'
+    expect(db.batches).toEqual([[
+      { sql: 'SELECT id, name, slug, position, school, school_logo, height, weight, rank, projected_round, consensus_grade, pff_grade, scout_grade, community_score FROM players WHERE slug = ?', args: ['test-player'] },
+      { sql: `SELECT player_id, summary, strengths, weaknesses, scheme_fit, nfl_comp, floor, ceiling, risk, full_report_text FROM expert_reports WHERE player_id = ${playerId} LIMIT 1`, args: ['test-player'] },
+      { sql: `SELECT id, player_id, display_name, content, upvotes, downvotes, score, created_at FROM community_reports WHERE player_id = ${playerId} ORDER BY score DESC`, args: ['test-player'] },
+    ]])
+    expect(db.batches[0].map(({ sql }) => sql).join('\n')).not.toMatch(/\*|email|ip_hash/)
+  })
+
+  it('should 404 an unknown slug', async () => {
+    const response = await get(new RecordingD1(answer(false)))
+
+    expect(response.status).toBe(404)
+    expect(await response.json()).toEqual({ error: 'Player not found' })
+  })
+
+  it('should answer a matching If-None-Match with an empty 304 that keeps the ETag', async () => {
+    const etag = (await get(new RecordingD1(answer(true)))).headers.get('ETag') as string
+    expect(etag).toMatch(/^"[0-9a-f]{32}"$/)
+
+    const response = await get(new RecordingD1(answer(true)), etag)
+    expect(response.status).toBe(304)
+    expect(response.headers.get('ETag')).toBe(etag)
+    expect(await response.text()).toBe('')
+  })
+
+  it('should send the body for a stale tag, strong or weak', async () => {
+    const stale = '"0123456789abcdef0123456789abcdef"'
+    for (const tag of [stale, `W/${stale}`, `${stale}, W/"fedcba9876543210fedcba9876543210"`]) {
+      const response = await get(new RecordingD1(answer(true)), tag)
+      expect(response.status).toBe(200)
+      expect((await response.json()).player).toEqual(player)
+    }
+  })
+
+  it('should match the weak form of the current tag', async () => {
+    // Cloudflare turns a strong ETag weak when it compresses the response,
+    // and If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+    const etag = (await get(new RecordingD1(answer(true)))).headers.get('ETag') as string
+
+    const response = await get(new RecordingD1(answer(true)), `W/${etag}`)
+    expect(response.status).toBe(304)
+    expect(response.headers.get('ETag')).toBe(etag)
+  })
+})
+
+// A players table and its board_version row; records the board queries
+class BoardD1 {
+  version = 1
+  players: any[] = [{ id: 1, name: 'Test Player', slug: 'test-player', rank: 1 }]
+  boardQueries: string[] = []
+
+  prepare(sql: string) {
+    const statement = {
+      sql,
+      args: [] as any[],
+      bind: (...args: any[]) => ({ ...statement, args }),
+      first: async () => this.version,
+      all: async () => {
+        this.boardQueries.push(sql)
+        return { results: this.players }
+      },
+    }
+    return statement
+  }
+
+  async batch(statements: { sql: string }[]) {
+    return statements.map(({ sql }) => sql.startsWith('UPDATE board_version')
+      ? { results: [{ version: ++this.version }] }
+      : { results: [] })
+  }
+}
+
+describe('Big Board cache', () => {
+  let now = Date.UTC(2026, 3, 1)
+  const tick = (seconds: number) => vi.setSystemTime(now += seconds * 1000)
+  const waits: Promise<any>[] = []
+  const boardCtx = { waitUntil: (p: Promise<any>) => waits.push(p), passThroughOnException: () => {} } as any
+  const getBoard = async (env: any) => {
+    const response = await worker.fetch(new Request('http://test.com/api/players'), env, boardCtx)
+    return {
+      cache: response.headers.get('X-Board-Cache'),
+      version: response.headers.get('X-Board-Version'),
+      players: await response.json(),
+    }
+  }
+
+  beforeEach(() => {
+    vi.useFakeTimers({ toFake: ['Date'] })
+    tick(3600) // the board is cached per isolate: start past anything an earlier test cached
+  })
+
+  afterEach(() => {
+    vi.useRealTimers()
+  })
+
+  it('should go MISS, HIT, STALE while refreshing, then MISS once too old', async () => {
+    const db = new BoardD1()
+    expect((await getBoard({ DB: db })).cache).toBe('MISS')
+    expect((await getBoard({ DB: db })).cache).toBe('HIT')
+    expect(db.boardQueries).toHaveLength(1)
+
+    tick(11)
+    expect((await getBoard({ DB: db })).cache).toBe('STALE')
+    await Promise.all(waits.splice(0))
+    expect(db.boardQueries).toHaveLength(2)
+    expect((await getBoard({ DB: db })).cache).toBe('HIT')
+
+    tick(301)
+    expect((await getBoard({ DB: db })).cache).toBe('MISS')
+    expect(db.boardQueries).toHaveLength(3)
+  })
+
+  it('should never serve an older board version after a bump', async () => {
+    const db = new BoardD1()
+    await getBoard({ DB: db })
+    db.version = 2
+    db.players = [{ ...db.players[0], rank: 2 }]
+
+    tick(6) // past the version check, well inside BOARD_FRESH_SECONDS
+    const after = await getBoard({ DB: db })
+    expect([after.cache, after.version, after.players[0].rank]).toEqual(['MISS', '2', 2])
+  })
+
+  it('should serve the board update-ranks wrote straight away', async () => {
+    const db = new BoardD1()
+    const env = { DB: db, ADMIN_PASSWORD: 'pw' }
+    await getBoard(env)
+    db.players = [{ ...db.players[0], rank: 5 }]
+
+    const response = await worker.fetch(new Request('http://test.com/api/admin/update-ranks', {
+      method: 'POST',
+      headers: { Authorization: 'Bearer pw' },
+      body: JSON.stringify({ updates: [{ player_id: 1, rank: 5 }] }),
+    }), env as any, boardCtx)
+    const body = await response.json()
+    expect([body.version, body.players[0].rank]).toEqual([2, 5])
+
+    // No tick: the version check is still cached, and already says 2
+    const after = await getBoard(env)
+    expect([after.cache, after.version, after.players[0].rank]).toEqual(['HIT', '2', 5])
+  })
+
+  it('should select explicit columns, leaving out content_hash', async () => {
+    const db = new BoardD1()
+    await getBoard({ DB: db })
+    expect(db.boardQueries[0]).toMatch(/^SELECT id, name, slug, .* FROM players ORDER BY rank ASC$/)
+    expect(db.boardQueries[0]).not.toMatch(/\*|content_hash/)
   })
 })
@@ -1,7 +1,11 @@
+import { containsProfanity } from './profanity';
+import { RateAction, RateLimiter } from './ratelimit';
+
 export interface Env {
   DB: D1Database;
   RATE_LIMITER: KVNamespace;
   ADMIN_PASSWORD: string;
+  PROFANITY_WORDS?: string; // extra filter words, comma- or newline-separated
 }
 
 // Helper to hash IP addresses for privacy
@@ -9,20 +13,126 @@ function hashIP(ip: string): string {
   return btoa(ip).substring(0, 32);
 }
 
-// Rate limiting helper
-async function checkRateLimit(env: Env, ip: string, action: string, limit: number, windowSeconds: number): Promise<boolean> {
-  if (!env.RATE_LIMITER) return true; // Skip if KV not available (local dev)
-  
-  const key = `ratelimit:${action}:${hashIP(ip)}`;
-  const current = await env.RATE_LIMITER.get(key);
-  const count = current ? parseInt(current) : 0;
-  
-  if (count >= limit) {
-    return false; // Rate limit exceeded
+// Rate limiting helper: decided in this isolate's memory, KV (when bound) is
+// only read once per client and written back in the background (see ratelimit.ts)
+const rateLimiter = new RateLimiter();
+
+function checkRateLimit(env: Env, ctx: ExecutionContext, ip: string, action: RateAction): Promise<boolean> {
+  return rateLimiter.check(env.RATE_LIMITER, action, hashIP(ip), promise => ctx.waitUntil(promise));
+}
+
+// Big Board cache. Each board_version (migrations/0009, bumped by the import
+// scripts and /api/admin/update-ranks) is cached in this isolate and in the
+// colo's Cache API. Entries older than BOARD_FRESH_SECONDS are served while
+// one background query per isolate refreshes them, so D1 sees a few board
+// queries a minute however many visitors there are. A board from an older
+// version is never served: the first request after a bump waits for the new one.
+const BOARD_FRESH_SECONDS = 10; // community_score lags votes by at most this
+const BOARD_STALE_SECONDS = 300; // never serve anything older
+const BOARD_VERSION_CHECK_SECONDS = 5;
+// Every players column except the internal content_hash (migrations/0006)
+const BOARD_COLUMNS = 'id, name, slug, position, school, school_logo, height, weight, rank, ' +
+  'projected_round, consensus_grade, pff_grade, scout_grade, community_score, created_at';
+
+interface BoardEntry {
+  version: number;
+  body: string;
+  fetchedAt: number;
+}
+
+let board: BoardEntry | null = null;
+let boardVersion: { version: number; checkedAt: number } | null = null;
+let versionCheck: Promise<number> | null = null;
+const boardRefreshes = new Map<number, Promise<BoardEntry>>();
+
+function boardCacheKey(origin: string, version: number): Request {
+  return new Request(`${origin}/api/players?board_version=${version}`);
+}
+
+async function currentBoardVersion(env: Env): Promise<number> {
+  if (boardVersion && Date.now() - boardVersion.checkedAt < BOARD_VERSION_CHECK_SECONDS * 1000) {
+    return boardVersion.version;
+  }
+  if (!versionCheck) {
+    versionCheck = env.DB.prepare('SELECT version FROM board_version WHERE id = 1')
+      .first<number>('version')
+      .then(version => {
+        boardVersion = { version: version ?? 0, checkedAt: Date.now() };
+        return boardVersion.version;
+      })
+      .finally(() => { versionCheck = null; });
+  }
+  return versionCheck;
+}
+
+// One D1 query per version per isolate at a time; concurrent callers share it
+function refreshBoard(env: Env, origin: string, version: number): Promise<BoardEntry> {
+  let refresh = boardRefreshes.get(version);
+  if (!refresh) {
+    refresh = (async () => {
+      const { results } = await env.DB.prepare(`SELECT ${BOARD_COLUMNS} FROM players ORDER BY rank ASC`).all();
+      const entry = { version, body: JSON.stringify(results), fetchedAt: Date.now() };
+      board = entry;
+      if (typeof caches !== 'undefined') {
+        await caches.default.put(boardCacheKey(origin, version), new Response(entry.body, {
+          headers: {
+            'Content-Type': 'application/json',
+            'Cache-Control': `public, max-age=${BOARD_STALE_SECONDS}`,
+            'X-Board-Fetched-At': String(entry.fetchedAt),
+          },
+        }));
+      }
+      return entry;
+    })().finally(() => boardRefreshes.delete(version));
+    boardRefreshes.set(version, refresh);
+  }
+  return refresh;
+}
+
+async function cachedBoard(origin: string, version: number): Promise<BoardEntry | null> {
+  if (typeof caches === 'undefined') return null;
+  const hit = await caches.default.match(boardCacheKey(origin, version));
+  if (!hit) return null;
+  const entry = { version, body: await hit.text(), fetchedAt: Number(hit.headers.get('X-Board-Fetched-At')) };
+  board = entry;
+  return entry;
+}
+
+async function getBoard(env: Env, ctx: ExecutionContext, origin: string): Promise<{ entry: BoardEntry; status: string }> {
+  const version = await currentBoardVersion(env);
+  const entry = board && board.version === version ? board : await cachedBoard(origin, version);
+  if (!entry || Date.now() - entry.fetchedAt > BOARD_STALE_SECONDS * 1000) {
+    return { entry: await refreshBoard(env, origin, version), status: 'MISS' };
+  }
+  if (Date.now() - entry.fetchedAt > BOARD_FRESH_SECONDS * 1000) {
+    ctx.waitUntil(refreshBoard(env, origin, version));
+    return { entry, status: 'STALE' };
   }
-  
-  await env.RATE_LIMITER.put(key, (count + 1).toString(), { expirationTtl: windowSeconds });
-  return true;
+  return { entry, status: 'HIT' };
+}
+
+// Player detail: the columns the player page shows (community reports leave
+// out email and ip_hash)
+const PLAYER_DETAIL_COLUMNS = 'id, name, slug, position, school, school_logo, height, weight, rank, ' +
+  'projected_round, consensus_grade, pff_grade, scout_grade, community_score';
+const EXPERT_REPORT_COLUMNS = 'player_id, summary, strengths, weaknesses, scheme_fit, nfl_comp, ' +
+  'floor, ceiling, risk, full_report_text';
+const COMMUNITY_REPORT_COLUMNS = 'id, player_id, display_name, content, upvotes, downvotes, score, created_at';
+
+// Strong ETag over the serialized body: any write that changes what the page
+// shows (import, expert report, new report, report or player vote) changes it
+async function bodyETag(body: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(body));
+  const hex = [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, '0')).join('');
+  return `"${hex.substring(0, 32)}"`;
+}
+
+function etagMatches(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch.split(',').some(tag => {
+    tag = tag.trim();
+    return tag === '*' || tag.replace(/^W\//, '') === etag;
+  });
 }
 
 // Input validation helpers
@@ -35,39 +145,8 @@ function isValidEmail(email: string): boolean {
   return emailRegex.test(email) && email.length <= 254;
 }
 
-// Profanity filter - basic word list
-function containsProfanity(text: string): boolean {
-  const profanityList = [
-    'fuck', 'shit', 'bitch', 'ass', 'damn', 'hell', 'crap', 
-    'bastard', 'dick', 'cock', 'pussy', 'slut', 'whore', 'fag',
-    'nigger', 'nigga', 'retard', 'rape', 'nazi', 'hitler'
-  ];
-  
-  const lowerText = text.toLowerCase();
-  
-  // Check for exact words or words with common character substitutions
-  for (const word of profanityList) {
-    const pattern = word.split('').map(char => {
-      // Handle common substitutions: a->@, e->3, i->1, o->0, s->$
-      if (char === 'a') return '[a@4]';
-      if (char === 'e') return '[e3]';
-      if (char === 'i') return '[i1!]';
-      if (char === 'o') return '[o0]';
-      if (char === 's') return '[s$5]';
-      return char;
-    }).join('[\\s\\-_]*'); // Allow spaces, dashes, underscores between letters
-    
-    const regex = new RegExp(`\\b${pattern}\\b`, 'i');
-    if (regex.test(lowerText)) {
-      return true;
-    }
-  }
-  
-  return false;
-}
-
 export default {
-  async fetch(request: Request, env: Env): Promise<Response> {
+  async fetch(request: Request, env: Env, ctx: ExecutionContext): Promise<Response> {
     const url = new URL(request.url);
     const path = url.pathname;
 
@@ -75,7 +154,8 @@ export default {
     const corsHeaders = {
       'Access-Control-Allow-Origin': '*',
       'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-      'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+      'Access-Control-Allow-Headers': 'Content-Type, Authorization, If-None-Match',
+      'Access-Control-Expose-Headers': 'ETag',
     };
 
     if (request.method === 'OPTIONS') {
@@ -84,44 +164,54 @@ export default {
 
     try {
       // GET /api/players - Get all players with community vote counts
+      // (community_score is maintained by /api/player-vote, see migrations/0008)
       if (path === '/api/players' && request.method === 'GET') {
-        const { results } = await env.DB.prepare(`
-          SELECT 
-            p.*,
-            COALESCE(COUNT(pv.id), 0) as community_score
-          FROM players p
-          LEFT JOIN player_votes pv ON p.id = pv.player_id
-          GROUP BY p.id
-          ORDER BY p.rank ASC
-        `).all();
-        return Response.json(results, { headers: corsHeaders });
+        const { entry, status } = await getBoard(env, ctx, url.origin);
+        return new Response(entry.body, {
+          headers: {
+            ...corsHeaders,
+            'Content-Type': 'application/json',
+            'X-Board-Version': String(entry.version),
+            'X-Board-Cache': status,
+          },
+        });
       }
 
       // GET /api/players/:slug - Get player with expert report and community reports
+      // One batch (one round trip); the reports are looked up through the slug
       if (path.startsWith('/api/players/') && request.method === 'GET') {
         const slug = path.split('/')[3];
-        
-        const player = await env.DB.prepare(
-          'SELECT * FROM players WHERE slug = ?'
-        ).bind(slug).first();
-
+        const playerId = '(SELECT id FROM players WHERE slug = ?)';
+
+        const [players, expertReports, communityReports] = await env.DB.batch([
+          env.DB.prepare(`SELECT ${PLAYER_DETAIL_COLUMNS} FROM players WHERE slug = ?`).bind(slug),
+          env.DB.prepare(
+            `SELECT ${EXPERT_REPORT_COLUMNS} FROM expert_reports WHERE player_id = ${playerId} LIMIT 1`
+          ).bind(slug),
+          env.DB.prepare(
+            `SELECT ${COMMUNITY_REPORT_COLUMNS} FROM community_reports WHERE player_id = ${playerId} ORDER BY score DESC`
+          ).bind(slug),
+        ]);
+
+        const player = players.results[0];
         if (!player) {
           return Response.json({ error: 'Player not found' }, { status: 404, headers: corsHeaders });
         }
 
-        const expertReport = await env.DB.prepare(
-          'SELECT * FROM expert_reports WHERE player_id = ?'
-        ).bind(player.id).first();
-
-        const { results: communityReports } = await env.DB.prepare(
-          'SELECT * FROM community_reports WHERE player_id = ? ORDER BY score DESC'
-        ).bind(player.id).all();
-
-        return Response.json({
+        const body = JSON.stringify({
           player,
-          expertReport,
-          communityReports
-        }, { headers: corsHeaders });
+          expertReport: expertReports.results[0] ?? null,
+          communityReports: communityReports.results
+        });
+        const headers = {
+          ...corsHeaders,
+          'ETag': await bodyETag(body),
+          'Cache-Control': 'no-cache', // always revalidate; unchanged pages come back as 304
+        };
+        if (etagMatches(request.headers.get('If-None-Match'), headers.ETag)) {
+          return new Response(null, { status: 304, headers });
+        }
+        return new Response(body, { headers: { ...headers, 'Content-Type': 'application/json' } });
       }
 
       // POST /api/reports - Submit a community report
@@ -129,7 +219,7 @@ export default {
         const ip = request.headers.get('CF-Connecting-IP') || request.headers.get('X-Forwarded-For') || 'unknown';
         
         // Rate limiting: max 3 reports per hour per IP
-        const rateLimitOk = await checkRateLimit(env, ip, 'report', 3, 3600);
+        const rateLimitOk = await checkRateLimit(env, ctx, ip, 'report');
         if (!rateLimitOk) {
           return Response.json({ error: 'Rate limit exceeded. Please try again later.' }, { status: 429, headers: corsHeaders });
         }
@@ -172,7 +262,8 @@ export default {
         }
 
         // Validation: profanity check
-        if (containsProfanity(sanitizedContent) || containsProfanity(sanitizedName)) {
+        if (containsProfanity(sanitizedContent, env.PROFANITY_WORDS) ||
+            containsProfanity(sanitizedName, env.PROFANITY_WORDS)) {
           return Response.json({ error: 'Please keep your report professional and avoid inappropriate language' }, { status: 400, headers: corsHeaders });
         }
 
@@ -190,7 +281,7 @@ export default {
         const ip = request.headers.get('CF-Connecting-IP') || request.headers.get('X-Forwarded-For') || 'unknown';
         
         // Rate limiting: max 20 votes per minute per IP
-        const rateLimitOk = await checkRateLimit(env, ip, 'vote', 20, 60);
+        const rateLimitOk = await checkRateLimit(env, ctx, ip, 'vote');
         if (!rateLimitOk) {
           return Response.json({ error: 'Rate limit exceeded. Slow down!' }, { status: 429, headers: corsHeaders });
         }
@@ -205,32 +296,25 @@ export default {
 
         const ip_hash = hashIP(ip);
 
-        // Check if already voted
-        const existingVote = await env.DB.prepare(
-          'SELECT * FROM votes WHERE report_id = ? AND ip_hash = ?'
-        ).bind(report_id, ip_hash).first();
-
-        if (existingVote) {
+        // One batch (one round trip, one transaction): the UNIQUE(report_id, ip_hash)
+        // conflict rejects a repeat vote, and the counters only move if changes()
+        // says the vote row went in
+        const [vote, , report] = await env.DB.batch([
+          env.DB.prepare(
+            'INSERT INTO votes (report_id, ip_hash, vote_type) VALUES (?, ?, ?) ON CONFLICT(report_id, ip_hash) DO NOTHING'
+          ).bind(report_id, ip_hash, vote_type),
+          env.DB.prepare(vote_type === 'up'
+            ? 'UPDATE community_reports SET upvotes = upvotes + 1, score = score + 1 WHERE id = ? AND changes() > 0'
+            : 'UPDATE community_reports SET downvotes = downvotes + 1, score = score - 1 WHERE id = ? AND changes() > 0'
+          ).bind(report_id),
+          env.DB.prepare('SELECT upvotes, downvotes, score FROM community_reports WHERE id = ?').bind(report_id),
+        ]);
+
+        if (!vote.meta.changes) {
           return Response.json({ error: 'Already voted on this report' }, { status: 400, headers: corsHeaders });
         }
 
-        // Insert vote
-        await env.DB.prepare(
-          'INSERT INTO votes (report_id, ip_hash, vote_type) VALUES (?, ?, ?)'
-        ).bind(report_id, ip_hash, vote_type).run();
-
-        // Update report scores
-        if (vote_type === 'up') {
-          await env.DB.prepare(
-            'UPDATE community_reports SET upvotes = upvotes + 1, score = score + 1 WHERE id = ?'
-          ).bind(report_id).run();
-        } else {
-          await env.DB.prepare(
-            'UPDATE community_reports SET downvotes = downvotes + 1, score = score - 1 WHERE id = ?'
-          ).bind(report_id).run();
-        }
-
-        return Response.json({ success: true }, { headers: corsHeaders });
+        return Response.json({ success: true, ...(report.results[0] as any) }, { headers: corsHeaders });
       }
 
       // POST /api/player-vote - Upvote a player on the Big Board
@@ -238,7 +322,7 @@ export default {
         const ip = request.headers.get('CF-Connecting-IP') || request.headers.get('X-Forwarded-For') || 'unknown';
         
         // Rate limiting: max 50 player votes per hour per IP
-        const rateLimitOk = await checkRateLimit(env, ip, 'player-vote', 50, 3600);
+        const rateLimitOk = await checkRateLimit(env, ctx, ip, 'player-vote');
         if (!rateLimitOk) {
           return Response.json({ error: 'Rate limit exceeded. Try again later.' }, { status: 429, headers: corsHeaders });
         }
@@ -252,26 +336,27 @@ export default {
 
         const ip_hash = hashIP(ip);
 
-        // Check if already voted for this player
-        const existingVote = await env.DB.prepare(
-          'SELECT * FROM player_votes WHERE player_id = ? AND ip_hash = ?'
-        ).bind(player_id, ip_hash).first();
-
-        if (existingVote) {
-          // Allow un-voting (toggle behavior)
-          await env.DB.prepare(
+        // Toggle in one batch (one round trip, one transaction): delete an existing
+        // vote, otherwise insert one, then move community_score by whichever happened
+        // (the INSERT's changes() is 1 only when nothing was deleted)
+        const [, insert, , score] = await env.DB.batch([
+          env.DB.prepare(
             'DELETE FROM player_votes WHERE player_id = ? AND ip_hash = ?'
-          ).bind(player_id, ip_hash).run();
-          
-          return Response.json({ success: true, action: 'removed' }, { headers: corsHeaders });
-        }
+          ).bind(player_id, ip_hash),
+          env.DB.prepare(
+            'INSERT INTO player_votes (player_id, ip_hash) SELECT ?, ? WHERE changes() = 0 ON CONFLICT(player_id, ip_hash) DO NOTHING'
+          ).bind(player_id, ip_hash),
+          env.DB.prepare(
+            'UPDATE players SET community_score = community_score + CASE changes() WHEN 0 THEN -1 ELSE 1 END WHERE id = ?'
+          ).bind(player_id),
+          env.DB.prepare('SELECT community_score FROM players WHERE id = ?').bind(player_id),
+        ]);
 
-        // Insert new vote
-        await env.DB.prepare(
-          'INSERT INTO player_votes (player_id, ip_hash) VALUES (?, ?)'
-        ).bind(player_id, ip_hash).run();
-
-        return Response.json({ success: true, action: 'added' }, { headers: corsHeaders });
+        return Response.json({
+          success: true,
+          action: insert.meta.changes ? 'added' : 'removed',
+          community_score: (score.results[0] as any)?.community_score
+        }, { headers: corsHeaders });
       }
 
       // PUT /api/admin/expert-report - Update expert report (admin only)
@@ -327,14 +412,24 @@ export default {
           return Response.json({ error: 'Invalid updates format' }, { status: 400, headers: corsHeaders });
         }
 
-        // Batch update ranks
-        for (const update of updates) {
-          await env.DB.prepare(
+        // Batch update ranks, bumping the board version in the same transaction
+        const results = await env.DB.batch([
+          ...updates.map((update: any) => env.DB.prepare(
             'UPDATE players SET rank = ? WHERE id = ?'
-          ).bind(update.rank, update.player_id).run();
-        }
-
-        return Response.json({ success: true, updated: updates.length }, { headers: corsHeaders });
+          ).bind(update.rank, update.player_id)),
+          env.DB.prepare(
+            'UPDATE board_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1 RETURNING version'
+          ),
+        ]);
+        const version = (results[results.length - 1].results?.[0] as { version?: number } | undefined)?.version ?? 0;
+        boardVersion = { version, checkedAt: Date.now() };
+
+        // Send the new board back: another isolate may still be on the old
+        // version for up to BOARD_VERSION_CHECK_SECONDS
+        const entry = await refreshBoard(env, url.origin, version);
+        return new Response(`{"success":true,"updated":${updates.length},"version":${version},"players":${entry.body}}`, {
+          headers: { 'Content-Type': 'application/json', ...corsHeaders },
+        });
       }
 
       return Response.json({ error: 'Not found' }, { status: 404, headers: corsHeaders });
@@ -0,0 +1,44 @@
+/**
+ * Profanity filter throughput: the old per-word RegExp loop against the
+ * compiled single pattern, on 2500-character reports
+ * Run with: npm run bench
+ */
+
+import { bench, describe } from 'vitest'
+import { PROFANITY_WORDS, compileProfanityPattern, containsProfanity } from './profanity'
+
+// The filter as it was before the pattern was compiled once
+function perWordRegex(text: string, words: string[]): boolean {
+  const lowerText = text.toLowerCase()
+  for (const word of words) {
+    const pattern = word.split('').map(char => {
+      if (char === 'a') return '[a@4]'
+      if (char === 'e') return '[e3]'
+      if (char === 'i') return '[i1!]'
+      if (char === 'o') return '[o0]'
+      if (char === 's') return '[s$5]'
+      return char
+    }).join('[\\s\\-_]*')
+    if (new RegExp(`\\b${pattern}\\b`, 'i').test(lowerText)) return true
+  }
+  return false
+}
+
+const SENTENCE = 'Explosive first step with a relentless motor; sets a firm edge against the run and ' +
+  'bends the corner well, though his hand usage still needs refinement at the next level. '
+const REPORT = SENTENCE.repeat(Math.ceil(2500 / SENTENCE.length)).slice(0, 2500) // clean: every word is scanned
+
+// A larger list, e.g. loaded through PROFANITY_WORDS
+const LARGE_LIST = [...PROFANITY_WORDS]
+for (let i = 0; LARGE_LIST.length < 1000; i++) LARGE_LIST.push(`zq${i.toString(36)}x`)
+const LARGE = compileProfanityPattern(LARGE_LIST)
+
+describe('20 words', () => {
+  bench('per-word RegExp', () => { perWordRegex(REPORT, PROFANITY_WORDS) })
+  bench('compiled pattern', () => { containsProfanity(REPORT) })
+})
+
+describe('1000 words', () => {
+  bench('per-word RegExp', () => { perWordRegex(REPORT, LARGE_LIST) })
+  bench('compiled pattern', () => { LARGE.test(REPORT.toLowerCase()) })
+})
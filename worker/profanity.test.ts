@@ -0,0 +1,39 @@
+/**
+ * Unit tests for the compiled profanity filter
+ * Run with: npx vitest or npm test
+ */
+
+import { describe, it, expect } from 'vitest'
+import { compileProfanityPattern, containsProfanity, profanityPattern } from './profanity'
+
+describe('Profanity filter', () => {
+  it('should catch listed words, substitutions and split letters', () => {
+    expect(containsProfanity('What the hell was that')).toBe(true)
+    expect(containsProfanity('SH!T tackling')).toBe(true)
+    expect(containsProfanity('total b4st4rd move')).toBe(true)
+    expect(containsProfanity('f-u_c k')).toBe(true)
+  })
+
+  it('should only match whole words', () => {
+    expect(containsProfanity('Hello from Scunthorpe, great class assessment')).toBe(false)
+    expect(containsProfanity('Elite burst off the edge, hitting the gap hard')).toBe(false)
+  })
+
+  it('should match words that share a prefix', () => {
+    const pattern = compileProfanityPattern(['dang', 'danger', 'dart'])
+    expect(pattern.test('dang')).toBe(true)
+    expect(pattern.test('danger')).toBe(true)
+    expect(pattern.test('dart')).toBe(true)
+    expect(pattern.test('dange')).toBe(false)
+  })
+
+  it('should merge extra words and compile them once', () => {
+    expect(containsProfanity('what a dingus')).toBe(false)
+    expect(containsProfanity('what a dingus', 'dingus,\nbozo')).toBe(true)
+    expect(profanityPattern('dingus,\nbozo')).toBe(profanityPattern('dingus,\nbozo'))
+  })
+
+  it('should never match with an empty list', () => {
+    expect(compileProfanityPattern([]).test('anything at all')).toBe(false)
+  })
+})
@@ -0,0 +1,85 @@
+/**
+ * Profanity filter compiled once into a single regex
+ *
+ * The word list is folded into a trie and emitted as one pattern, so a check
+ * is one scan of the text whatever the list size. Letters match their common
+ * substitutions (a -> @/4, e -> 3, i -> 1/!, o -> 0, s -> $/5) and may be split
+ * by spaces, dashes or underscores. Those classes never overlap, so at every
+ * trie node at most one branch can continue and a failed start position is
+ * abandoned after a few characters.
+ */
+
+export const PROFANITY_WORDS = [
+  'fuck', 'shit', 'bitch', 'ass', 'damn', 'hell', 'crap',
+  'bastard', 'dick', 'cock', 'pussy', 'slut', 'whore', 'fag',
+  'nigger', 'nigga', 'retard', 'rape', 'nazi', 'hitler'
+];
+
+const SUBSTITUTIONS: Record<string, string> = {
+  a: '[a@4]',
+  e: '[e3]',
+  i: '[i1!]',
+  o: '[o0]',
+  s: '[s$5]',
+};
+const SEPARATOR = '[\\s\\-_]*'; // allowed between the letters of a word
+
+interface TrieNode {
+  children: Map<string, TrieNode>;
+  end: boolean;
+}
+
+function letterPattern(char: string): string {
+  return SUBSTITUTIONS[char] ?? char.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+function nodePattern(node: TrieNode, root: boolean): string {
+  const branches = [...node.children].map(([char, child]) =>
+    (root ? '' : SEPARATOR) + letterPattern(char) + nodePattern(child, false));
+  if (node.end && branches.length) branches.push('');
+  if (branches.length <= 1) return branches[0] ?? '';
+  return `(?:${branches.join('|')})`;
+}
+
+/** One regex matching any of `words` as a whole word in lowercased text */
+export function compileProfanityPattern(words: Iterable<string>): RegExp {
+  const root: TrieNode = { children: new Map(), end: false };
+  for (const word of words) {
+    const letters = word.trim().toLowerCase();
+    if (!letters) continue;
+    let node = root;
+    for (const char of letters) {
+      let child = node.children.get(char);
+      if (!child) {
+        child = { children: new Map(), end: false };
+        node.children.set(char, child);
+      }
+      node = child;
+    }
+    node.end = true;
+  }
+  if (!root.children.size) return /(?!)/; // empty list: never matches
+  return new RegExp(`\\b${nodePattern(root, true)}\\b`);
+}
+
+const BUILTIN = compileProfanityPattern(PROFANITY_WORDS);
+let extended: { source: string; pattern: RegExp } | null = null;
+
+/**
+ * The compiled filter; `extraWords` (comma- or newline-separated, e.g. the
+ * PROFANITY_WORDS var) is merged in and compiled once per isolate
+ */
+export function profanityPattern(extraWords?: string): RegExp {
+  if (!extraWords) return BUILTIN;
+  if (extended?.source !== extraWords) {
+    extended = {
+      source: extraWords,
+      pattern: compileProfanityPattern([...PROFANITY_WORDS, ...extraWords.split(/[,\n]/)]),
+    };
+  }
+  return extended.pattern;
+}
+
+export function containsProfanity(text: string, extraWords?: string): boolean {
+  return profanityPattern(extraWords).test(text.toLowerCase());
+}
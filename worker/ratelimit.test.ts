@@ -0,0 +1,92 @@
+/**
+ * Unit tests for the per-isolate rate limiter
+ * Run with: npx vitest or npm test
+ */
+
+import { describe, it, expect, beforeEach } from 'vitest'
+import { RateLimiter } from './ratelimit'
+
+class CountingKV {
+  storage: Map<string, string> = new Map()
+  gets = 0
+  puts = 0
+
+  async get(key: string) {
+    this.gets++
+    return this.storage.get(key) ?? null
+  }
+
+  async put(key: string, value: string) {
+    this.puts++
+    this.storage.set(key, value)
+  }
+}
+
+describe('RateLimiter', () => {
+  let now: number
+  let limiter: RateLimiter
+  let kv: CountingKV
+
+  beforeEach(() => {
+    now = Date.UTC(2026, 3, 23, 20, 0, 0) // on an hour boundary
+    limiter = new RateLimiter(() => now)
+    kv = new CountingKV()
+  })
+
+  const allowed = async (action: 'report' | 'vote' | 'player-vote', client: string, times: number) => {
+    let ok = 0
+    for (let i = 0; i < times; i++) {
+      if (await limiter.check(kv as any, action, client)) ok++
+    }
+    return ok
+  }
+
+  it('should keep the existing per-action limits', async () => {
+    expect(await allowed('report', 'a', 10)).toBe(3)
+    expect(await allowed('vote', 'a', 30)).toBe(20)
+    expect(await allowed('player-vote', 'a', 60)).toBe(50)
+  })
+
+  it('should limit each client separately', async () => {
+    expect(await allowed('report', 'a', 5)).toBe(3)
+    expect(await allowed('report', 'b', 5)).toBe(3)
+  })
+
+  it('should read KV once per client and write back only occasionally', async () => {
+    await allowed('vote', 'a', 10)
+    expect(kv.gets).toBe(1)
+    expect(kv.puts).toBe(0)
+
+    await allowed('vote', 'a', 10) // reaches the limit: written straight away
+    expect(kv.gets).toBe(1)
+    expect(kv.puts).toBe(1)
+  })
+
+  it('should slide the window instead of resetting at the boundary', async () => {
+    now += 30_000
+    expect(await allowed('vote', 'a', 20)).toBe(20)
+
+    now += 45_000 // 15s into the next minute: 75% of the old window still counts
+    expect(await allowed('vote', 'a', 20)).toBe(5)
+
+    now += 120_000 // two windows on: nothing carries over
+    expect(await allowed('vote', 'a', 30)).toBe(20)
+  })
+
+  it('should pick up counts another isolate wrote to KV', async () => {
+    await allowed('report', 'a', 3)
+    const other = new RateLimiter(() => now)
+    expect(await other.check(kv as any, 'report', 'a')).toBe(false)
+  })
+
+  it('should treat an old bare-number KV counter as this window\'s count', async () => {
+    kv.storage.set(`ratelimit:report:a`, '2')
+    expect(await allowed('report', 'a', 5)).toBe(1)
+  })
+
+  it('should still limit without a KV binding', async () => {
+    const ok = []
+    for (let i = 0; i < 5; i++) ok.push(await limiter.check(undefined, 'report', 'a'))
+    expect(ok.filter(Boolean).length).toBe(3)
+  })
+})
@@ -0,0 +1,116 @@
+/**
+ * Per-isolate rate limiting
+ *
+ * Each isolate keeps a sliding-window counter per (action, client) in memory,
+ * so allowing or rejecting a request needs no I/O. KV is a coarse
+ * write-behind backup: a key is read once when an isolate first sees it and
+ * written back at most every SYNC_SECONDS (or as soon as it reaches its limit),
+ * so limits survive isolate restarts and roughly carry across isolates.
+ */
+
+export interface RateLimit {
+  limit: number;
+  windowSeconds: number;
+}
+
+export const RATE_LIMITS = {
+  report: { limit: 3, windowSeconds: 3600 }, // community reports per hour
+  vote: { limit: 20, windowSeconds: 60 }, // report votes per minute
+  'player-vote': { limit: 50, windowSeconds: 3600 }, // Big Board votes per hour
+} satisfies Record<string, RateLimit>;
+
+export type RateAction = keyof typeof RATE_LIMITS;
+
+const SYNC_SECONDS = 30;
+const MAX_KEYS = 10_000; // oldest clients are forgotten past this
+const KV_MIN_TTL = 60; // KV rejects shorter expirationTtl
+
+// Fixed windows aligned to windowSeconds; the estimate weights the previous
+// window's count by how much of it still overlaps the sliding window
+interface Window {
+  start: number;
+  count: number;
+  previous: number;
+  syncedAt: number;
+}
+
+export class RateLimiter {
+  private windows = new Map<string, Window>();
+  private loads = new Map<string, Promise<Window>>();
+
+  constructor(private now: () => number = Date.now) {}
+
+  async check(
+    kv: KVNamespace | undefined,
+    action: RateAction,
+    client: string,
+    waitUntil: (promise: Promise<any>) => void = promise => { promise.catch(() => {}); },
+  ): Promise<boolean> {
+    const { limit, windowSeconds } = RATE_LIMITS[action];
+    const windowMs = windowSeconds * 1000;
+    const key = `ratelimit:${action}:${client}`;
+
+    let window = this.windows.get(key);
+    if (!window && kv) {
+      window = await this.load(kv, key, windowMs); // once per key per isolate
+    }
+    const now = this.now();
+    window = roll(window, now, windowMs);
+    this.remember(key, window);
+
+    const overlap = 1 - (now - window.start) / windowMs;
+    if (window.previous * overlap + window.count >= limit) {
+      return false;
+    }
+    window.count++;
+
+    const full = window.previous * overlap + window.count >= limit;
+    if (kv && (full || now - window.syncedAt >= SYNC_SECONDS * 1000)) {
+      window.syncedAt = now;
+      waitUntil(kv.put(key, JSON.stringify({ start: window.start, count: window.count, previous: window.previous }),
+        { expirationTtl: Math.max(KV_MIN_TTL, 2 * windowSeconds) }));
+    }
+    return true;
+  }
+
+  private load(kv: KVNamespace, key: string, windowMs: number): Promise<Window> {
+    let load = this.loads.get(key);
+    if (!load) {
+      load = kv.get(key)
+        .catch(() => null) // KV trouble never blocks a request
+        .then(raw => this.windows.get(key) ?? parseStored(raw, this.now(), windowMs))
+        .finally(() => this.loads.delete(key));
+      this.loads.set(key, load);
+    }
+    return load;
+  }
+
+  private remember(key: string, window: Window) {
+    this.windows.delete(key); // re-insert so Map order is least recently used first
+    this.windows.set(key, window);
+    if (this.windows.size > MAX_KEYS) {
+      this.windows.delete(this.windows.keys().next().value as string);
+    }
+  }
+}
+
+function roll(window: Window | undefined, now: number, windowMs: number): Window {
+  const start = Math.floor(now / windowMs) * windowMs;
+  if (window && window.start === start) return window;
+  const previous = window && window.start === start - windowMs ? window.count : 0;
+  return { start, count: 0, previous, syncedAt: window?.syncedAt ?? 0 };
+}
+
+// KV values are {start, count, previous}; a bare number is the old per-key
+// counter, taken as this window's count
+function parseStored(raw: string | null, now: number, windowMs: number): Window {
+  const fresh = { ...roll(undefined, now, windowMs), syncedAt: now };
+  try {
+    const stored = raw ? JSON.parse(raw) : null;
+    if (typeof stored === 'number') return { ...fresh, count: stored };
+    if (stored) return { start: stored.start, count: stored.count, previous: stored.previous, syncedAt: now };
+  } catch {
+    // unreadable: start over
+  }
+  return fresh;
+}